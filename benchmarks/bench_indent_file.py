@@ -0,0 +1,176 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# Benchmark the writing of indented output when saving a project and when
+# generating its .sip files.  The calls made to every IndentFile during a save
+# and during a generation are recorded and then replayed into new IndentFile
+# instances so that the writer is timed without the adapters.  The overhead of
+# the replay itself is measured by replaying into a writer that does nothing.
+# Both are also timed end to end.  Run it from the root of the repository
+# with a project created by benchmarks.make_project, eg.:
+#
+#   python -m benchmarks.bench_indent_file big.msp
+#
+# Only public APIs are used so that it can also be run against earlier
+# versions of metasip for comparison.
+
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from metasip.models import Project
+from metasip.project_io import generate_sip_files, load_project, save_project
+from metasip.project_io.indent_file import IndentFile
+
+from .helpers import BenchmarkUi, best_time
+
+
+def bench_indent_file(project_name, repeat):
+    """ Run the benchmark. """
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # The project file is overwritten when saved so use a copy.
+        saved_name = os.path.join(temp_dir,
+                os.path.basename(project_name))
+        shutil.copyfile(project_name, saved_name)
+
+        output_dir = os.path.join(temp_dir, 'sip')
+        os.mkdir(output_dir)
+
+        replay_dir = os.path.join(temp_dir, 'replay')
+        os.mkdir(replay_dir)
+
+        project = Project(name=saved_name)
+        load_project(project, BenchmarkUi())
+
+        def save():
+            save_project(project, BenchmarkUi())
+
+        def generate():
+            generate_sip_files(project, output_dir, [], False)
+
+        for name, func in (('save', save), ('generate', generate)):
+            files = _record(func)
+            nr_calls = sum(len(calls) for _, _, calls in files)
+
+            def replay():
+                _replay(files, IndentFile, replay_dir)
+
+            def replay_overhead():
+                _replay(files, _NullFile, replay_dir)
+
+            print(f"replay {nr_calls} calls made by {name}: {best_time(replay, repeat):.2f}s (overhead {best_time(replay_overhead, repeat):.2f}s)")
+            print(f"{name}: {best_time(func, repeat):.2f}s")
+
+
+def _record(func):
+    """ Call a function and return the calls it makes to every IndentFile as a
+    list of (in memory, indent, calls) tuples.
+    """
+
+    files = []
+
+    saved = {name: getattr(IndentFile, name)
+            for name in ('__init__', '__iadd__', '__isub__', 'blank', 'write')}
+
+    def init(self, file_name, indent):
+        self._benchmark_calls = []
+        files.append((file_name is None, indent, self._benchmark_calls))
+        saved['__init__'](self, file_name, indent)
+
+    def recorder(name):
+        def record(self, *args, **kwargs):
+            self._benchmark_calls.append((name, args, kwargs))
+            return saved[name](self, *args, **kwargs)
+
+        return record
+
+    IndentFile.__init__ = init
+
+    for name in ('__iadd__', '__isub__', 'blank', 'write'):
+        setattr(IndentFile, name, recorder(name))
+
+    try:
+        func()
+    finally:
+        for name, method in saved.items():
+            setattr(IndentFile, name, method)
+
+    return files
+
+
+def _replay(files, factory, replay_dir):
+    """ Replay the recorded calls into new instances created by a factory. """
+
+    file_name = os.path.join(replay_dir, 'replay')
+
+    for in_memory, indent, calls in files:
+        output = factory(None if in_memory else file_name, indent)
+
+        for name, args, kwargs in calls:
+            if name == 'write':
+                output.write(*args, **kwargs)
+            elif name == 'blank':
+                output.blank()
+            elif name == '__iadd__':
+                output += args[0]
+            else:
+                output -= args[0]
+
+        if in_memory:
+            output.getvalue()
+        else:
+            output.close()
+
+
+class _NullFile:
+    """ A writer that does nothing. """
+
+    def __init__(self, file_name, indent):
+        """ Initialise the writer. """
+
+        pass
+
+    def __iadd__(self, by):
+        """ Increase the indentation. """
+
+        return self
+
+    def __isub__(self, by):
+        """ Decrease the indentation. """
+
+        return self
+
+    def blank(self):
+        """ Write a blank line. """
+
+        pass
+
+    def close(self):
+        """ Close the file. """
+
+        pass
+
+    def getvalue(self):
+        """ Return the contents of a file created in memory. """
+
+        return ''
+
+    def write(self, data, indent=True):
+        """ Write data to the file. """
+
+        pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('project', help="the name of the project file")
+    parser.add_argument('--repeat', help="the number of times to repeat",
+            type=int, default=3)
+    args = parser.parse_args()
+
+    bench_indent_file(args.project, args.repeat)
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# Benchmark the decoding of the attributes of models and the loading of a
+# project.  The attributes of every Class element of the project are decoded
+# (without loading the content of the classes) a number of times.  Run it
+# from the root of the repository with a project created by
+# benchmarks.make_project, eg.:
+#
+#   python -m benchmarks.bench_load big.msp
+#
+# Only public APIs are used so that it can also be run against earlier
+# versions of metasip for comparison.
+
+
+import argparse
+from xml.etree import ElementTree
+
+from metasip.models import Class, Project
+from metasip.models.adapters import adapt
+from metasip.models.adapters.base_adapter import BaseAdapter
+from metasip.project_io import load_project
+
+from .helpers import BenchmarkUi, best_time
+
+
+def bench_load(project_name, repeat):
+    """ Run the benchmark. """
+
+    root = ElementTree.parse(project_name).getroot()
+    elements = root.findall('.//Class')
+    project = Project(name=project_name)
+
+    def decode():
+        for element in elements:
+            # Only decode the attributes of the class itself.
+            BaseAdapter.load(adapt(Class()), element, project, None)
+
+    print(f"decode attributes of {len(elements)} classes: {best_time(decode, repeat):.2f}s")
+
+    def load():
+        load_project(Project(name=project_name), BenchmarkUi())
+
+    print(f"load project: {best_time(load, repeat):.2f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('project', help="the name of the project file")
+    parser.add_argument('--repeat', help="the number of times to repeat",
+            type=int, default=3)
+    args = parser.parse_args()
+
+    bench_load(args.project, args.repeat)
@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# Benchmark the memory used by a loaded project, ie. the memory allocated
+# while the project is loaded that is still allocated afterwards.  Run it from
+# the root of the repository with a project created by
+# benchmarks.make_project, eg.:
+#
+#   python -m benchmarks.bench_memory big.msp
+
+
+import argparse
+import gc
+import tracemalloc
+
+from metasip.models import Project
+from metasip.project_io import load_project
+
+from .helpers import BenchmarkUi
+
+
+def bench_memory(project_name):
+    """ Run the benchmark. """
+
+    project = Project(name=project_name)
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    load_project(project, BenchmarkUi())
+
+    gc.collect()
+    end, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"memory retained after load: {(end - start) / (1024 * 1024):.0f} MB (peak {(peak - start) / (1024 * 1024):.0f} MB)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('project', help="the name of the project file")
+    args = parser.parse_args()
+
+    bench_memory(args.project)
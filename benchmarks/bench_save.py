@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# Benchmark the saving of a project.  The first save of a loaded project is
+# timed, followed by a save after a class has been edited.  The project file
+# written by the latter is checked to be identical to that written by the
+# first save of a project that has been loaded and had the same edit made.
+# Run it from the root of the repository with a project created by
+# benchmarks.make_project, eg.:
+#
+#   python -m benchmarks.bench_save big.msp
+#
+# Only public APIs are used so that it can also be run against earlier
+# versions of metasip for comparison.
+
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from metasip.models import Class, Project
+from metasip.project_io import load_project, save_project
+
+from .helpers import BenchmarkUi
+
+
+def bench_save(project_name, repeat):
+    """ Run the benchmark. """
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # The project file is overwritten when saved so use copies.
+        saved_name = os.path.join(temp_dir, 'saved.msp')
+        expected_name = os.path.join(temp_dir, 'expected.msp')
+
+        first = None
+        edited = None
+
+        for _ in range(repeat):
+            shutil.copyfile(project_name, saved_name)
+            project = _load(saved_name)
+
+            first = _min(first, _timed_save(project))
+
+            _edit(project)
+
+            edited = _min(edited, _timed_save(project))
+
+        print(f"first save: {first:.2f}s")
+        print(f"save after editing a class: {edited:.2f}s")
+
+        shutil.copyfile(project_name, expected_name)
+        project = _load(expected_name)
+        _edit(project)
+        save_project(project, BenchmarkUi())
+
+        with open(saved_name, 'rb') as saved_f:
+            with open(expected_name, 'rb') as expected_f:
+                if saved_f.read() != expected_f.read():
+                    raise SystemExit(
+                            "the project saved after the edit is different")
+
+
+def _edit(project):
+    """ Edit the first class of the last .sip file of the first module. """
+
+    for api in project.modules[0].content[-1].content:
+        if isinstance(api, Class):
+            api.name += 'Edited'
+            break
+    else:
+        raise SystemExit("the project doesn't have a class to edit")
+
+
+def _load(project_name):
+    """ Return a loaded project. """
+
+    project = Project(name=project_name)
+    load_project(project, BenchmarkUi())
+
+    return project
+
+
+def _min(best, elapsed):
+    """ Return the smaller of the best time so far and an elapsed time. """
+
+    return elapsed if best is None else min(best, elapsed)
+
+
+def _timed_save(project):
+    """ Save a project and return the time taken. """
+
+    start = time.perf_counter()
+    save_project(project, BenchmarkUi())
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('project', help="the name of the project file")
+    parser.add_argument('--repeat', help="the number of times to repeat",
+            type=int, default=3)
+    args = parser.parse_args()
+
+    bench_save(args.project, args.repeat)
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import time
+
+from metasip.project_io import AbstractProjectUi
+
+
+class BenchmarkUi(AbstractProjectUi):
+    """ The user interface used by the benchmarks.  It reports errors and
+    ignores progress.
+    """
+
+    def error_creating_file(self, title, text, detail):
+        """ Called when there was an error when creating a file. """
+
+        raise SystemExit(f"{text}: {detail}")
+
+    def load_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to loading the project. """
+
+        pass
+
+    def load_step(self):
+        """ Called once the next step of loading the project has been
+        completed.
+        """
+
+        pass
+
+    def save_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to taking a snapshot of the
+        project to save.
+        """
+
+        pass
+
+    def save_step(self):
+        """ Called once the next step of taking a snapshot of the project to
+        save has been completed.
+        """
+
+        pass
+
+    def update_project_format(self, root_element, from_version, to_version):
+        """ Called to update the project from it's current major version. """
+
+        return True
+
+    def warn_minor_version_update(self, from_version, to_version):
+        """ Called to warn the user that the project will be updated. """
+
+        pass
+
+
+def best_time(func, repeat):
+    """ Return the best time, in seconds, of a number of calls of a function.
+    """
+
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
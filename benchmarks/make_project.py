@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# Create a synthetic project for the benchmarks.  The project is the same for
+# the same arguments.  With the default number of .sip files per module the
+# project file is about 37 MB.  Run it from the root of the repository, eg.:
+#
+#   python -m benchmarks.make_project big.msp
+#   python -m benchmarks.make_project --nr-sip-files 30 small.msp
+#
+# To compare different versions of metasip, copy the benchmarks directory to a
+# checkout of each version and create the project there, as earlier versions
+# can't load the project formats of later versions.
+
+
+import argparse
+import random
+
+from metasip.models import (Argument, Class, Constructor, Destructor, Enum,
+        EnumValue, Function, HeaderDirectory, HeaderFile,
+        HeaderFileVersion, ManualCode, Method, Module, Namespace, OpaqueClass,
+        OperatorCast, OperatorFunction, OperatorMethod, Platform, Project,
+        SipFile, Typedef, Variable, VersionRange)
+from metasip.project_io import save_project
+
+from .helpers import BenchmarkUi
+
+
+# The types of arguments and return values.
+_TYPES = ('const QString &', 'int', 'QList<QPair<int, QString> > *',
+        'long int', 'void (*%s)(int)', 'QMap<QString,QVariant>', 'bool')
+
+
+def make_project(project_name, nr_sip_files=600, nr_modules=3):
+    """ Create and save a synthetic project with a number of .sip files in
+    each module.
+    """
+
+    rng = random.Random(1)
+
+    project = Project(name=project_name, versions=['v1', 'v2', 'v3', 'v4'],
+            platforms=['Linux', 'WS_WIN'], features=['FA', 'FB'],
+            rootmodule='Pkg', sipcomments='// Copyright & <stuff>')
+
+    header_directory = HeaderDirectory(name='QtCore', scan=['-I.'])
+    header_directory.platforms.append(
+            Platform(name='Linux', inputdirpattern='*.h',
+                    parserargs='-std=c++17'))
+    header_file = HeaderFile(name='qobject.h', module='QtCore')
+    header_file.versions.append(
+            HeaderFileVersion(md5='abc', version='v1', parse=True))
+    header_directory.content.append(header_file)
+    project.headers.append(header_directory)
+
+    for module_nr in range(nr_modules):
+        module = Module(name=f'Mod{module_nr}',
+                callsuperinit='yes' if module_nr else 'undefined',
+                imports=[f'Mod{module_nr - 1}'] if module_nr else [],
+                directives='' if module_nr else '%DefaultEncoding "UTF-8"')
+        project.modules.append(module)
+
+        for sip_file_nr in range(nr_sip_files):
+            module.content.append(
+                    _make_sip_file(rng, module_nr, sip_file_nr))
+
+    save_project(project, BenchmarkUi())
+
+
+def _make_class(rng, name, class_nr):
+    """ Return a synthetic class. """
+
+    klass = Class(name=name, bases='public QObject' if class_nr else '',
+            struct=(class_nr == 3),
+            typecode='int x = 1 < 2;' if class_nr == 1 else '',
+            docstring='doc "q"' if class_nr == 2 else '')
+    _tag(rng, klass)
+
+    ctor = Constructor(name=name,
+            args=[Argument(type='QObject *', name='parent',
+                    default='nullptr')])
+    _tag(rng, ctor)
+    klass.content.append(ctor)
+
+    klass.content.append(Destructor(name=name, virtual=True))
+    klass.content.append(
+            ManualCode(precis='void manual()', access='protected'))
+
+    for method_nr in range(15):
+        args = [
+                Argument(type=rng.choice(_TYPES), name=f'a{i}',
+                        annos='Transfer' if i == 0 and method_nr % 3 == 0 else '',
+                        default='0' if i == 2 else '',
+                        unnamed=bool(i % 2))
+                for i in range(rng.randint(0, 4))]
+
+        method = Method(name=f'm{method_nr}',
+                rtype=rng.choice(_TYPES + ('', )), args=args,
+                const=(method_nr % 2 == 0), virtual=(method_nr % 3 == 0),
+                static=(method_nr % 7 == 0),
+                access=rng.choice(['', 'protected', 'public slots',
+                        'signals']),
+                annos='ReleaseGIL' if method_nr % 4 == 0 else '',
+                methcode='sipRes = 0;' if method_nr % 6 == 0 else '')
+        _tag(rng, method)
+        klass.content.append(method)
+
+    enum = Enum(name=f'E{class_nr}', enumclass=(class_nr % 2 == 0),
+            basetype='int' if class_nr == 0 else '')
+
+    for value_nr in range(5):
+        enum_value = EnumValue(name=f'V{value_nr}')
+        _tag(rng, enum_value)
+        enum.content.append(enum_value)
+
+    _tag(rng, enum)
+    klass.content.append(enum)
+
+    klass.content.append(
+            Variable(name='var', type='int', static=True,
+                    getcode='get' if class_nr == 0 else ''))
+    klass.content.append(
+            OperatorMethod(name='==', rtype='bool',
+                    args=[Argument(type='const X &')], const=True))
+    klass.content.append(OperatorCast(name='int', const=True))
+
+    return klass
+
+
+def _make_sip_file(rng, module_nr, sip_file_nr):
+    """ Return a synthetic .sip file. """
+
+    sip_file = SipFile(name=f'mod{module_nr}/file{sip_file_nr}.h',
+            modulecode='// code' if sip_file_nr % 5 == 0 else '')
+
+    for class_nr in range(4):
+        sip_file.content.append(
+                _make_class(rng, f'C{module_nr}_{sip_file_nr}_{class_nr}',
+                        class_nr))
+
+    function = Function(name=f'func{sip_file_nr}', rtype='int',
+            args=[Argument(type='double', name='d')])
+    _tag(rng, function)
+    sip_file.content.append(function)
+
+    sip_file.content.append(
+            OperatorFunction(name='+', rtype='X',
+                    args=[Argument(type='const X &'),
+                            Argument(type='const X &')]))
+    sip_file.content.append(
+            Typedef(name=f'T{sip_file_nr}', type='QList<int>'))
+
+    namespace = Namespace(name=f'NS{sip_file_nr}')
+    namespace.content.append(Function(name='nf', rtype='void'))
+    sip_file.content.append(namespace)
+
+    sip_file.content.append(OpaqueClass(name='Opq'))
+
+    enum = Enum(name='')
+    enum.content.append(EnumValue(name='A'))
+    sip_file.content.append(enum)
+
+    sip_file.content.append(Variable(name='gv', type='int'))
+
+    return sip_file
+
+
+def _tag(rng, api):
+    """ Add random tags, status and comments to an API item. """
+
+    r = rng.random()
+    if r < 0.3:
+        api.versions = [VersionRange(startversion='v2', endversion='')]
+    elif r < 0.4:
+        api.versions = [VersionRange(startversion='', endversion='v3')]
+    elif r < 0.5:
+        api.versions = [VersionRange(startversion='v2', endversion='v4')]
+
+    r = rng.random()
+    if r < 0.1:
+        api.platforms = ['Linux']
+    elif r < 0.15:
+        api.platforms = ['Linux', 'WS_WIN']
+
+    r = rng.random()
+    if r < 0.1:
+        api.features = ['FA']
+    elif r < 0.15:
+        api.features = ['!FB']
+    elif r < 0.18:
+        api.features = ['FA', '!FB']
+
+    if rng.random() < 0.05:
+        api.status = rng.choice(['ignored', 'todo', 'removed'])
+
+    if rng.random() < 0.05:
+        api.comments = 'A comment\n\nline 2'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('project', help="the name of the project file")
+    parser.add_argument('--nr-sip-files',
+            help="the number of .sip files in each module", type=int,
+            default=600)
+    args = parser.parse_args()
+
+    make_project(args.project, args.nr_sip_files)
@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import argparse
+
+from .exceptions import UserException
+from .main import _handle_exception
+from .models import Project
+from .project_io import convert_project, load_project
+from ._version import version
+
+
+def main():
+    """ The entry point for the msipconvert console script. """
+
+    # Parse the command line.
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('-V', '--version', action='version', version=version)
+    parser.add_argument('project', help="the project to convert", nargs='?')
+    parser.add_argument('--sip-files-dir',
+            help="save each .sip file in a separate file in DIR",
+            metavar='DIR', default='')
+
+    args = parser.parse_args()
+
+    try:
+        _convert(args.project, args.sip_files_dir)
+    except Exception as e:
+        _handle_exception(e)
+
+
+def _convert(project_name, sip_files_dir):
+    """ Convert a project to the layout determined by the name of the directory
+    containing the .sip files.
+    """
+
+    if not project_name:
+        raise UserException("Specify the name of an existing project file")
+
+    project = Project(project_name)
+    load_project(project)
+
+    convert_project(project, sip_files_dir)
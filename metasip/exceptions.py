@@ -15,3 +15,10 @@ class UserException(Exception):
 
         self.text = text
         self.detail = detail
+
+    def __reduce__(self):
+        """ Reimplemented so that the exception can be pickled, eg. when it is
+        raised in a different process.
+        """
+
+        return (type(self), (self.text, ), {'detail': self.detail})
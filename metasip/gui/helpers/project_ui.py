@@ -3,6 +3,7 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication, QProgressDialog
 
 from ...project_io import AbstractProjectUi
@@ -12,7 +13,7 @@ from .warning import warning
 
 class ProjectUi(AbstractProjectUi):
     """ This class encapsulates the UI-related methods supporting the loading
-    of a project.
+    and saving of a project.
     """
 
     def error_creating_file(self, title, text, detail):
@@ -38,6 +39,27 @@ class ProjectUi(AbstractProjectUi):
         self._progress.setValue(self._progress.value() + 1)
         QApplication.processEvents()
 
+    def save_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to taking a snapshot of the
+        project to save that will take a specific number of steps.
+        """
+
+        self._progress = QProgressDialog("Saving the project...", None, 0,
+                nr_steps)
+        self._progress.setWindowTitle(project.name)
+
+        # The project mustn't be modified while the snapshot is being taken.
+        self._progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        self._progress.setValue(0)
+
+    def save_step(self):
+        """ Called to update the UI once the next step of taking a snapshot of
+        the project to save has been completed.
+        """
+
+        self._progress.setValue(self._progress.value() + 1)
+        QApplication.processEvents()
+
     def update_project_format(self, root_element, from_version, to_version):
         """ Called to update the project from it's current major version before
         it is parsed.  Return True if the user didn't cancel.
@@ -41,7 +41,7 @@ def main():
     # Load any project.
     if project_name:
         project = Project(project_name)
-        if not load_project(project, ui=ProjectUi()):
+        if not load_project(project, ui=ProjectUi(), lazy=True):
             return 0
     else:
         project = Project('Untitled.msp')
@@ -4,13 +4,17 @@
 
 
 from enum import auto, Enum
+import os
 
-from PyQt6.QtCore import QSettings, Qt
+from PyQt6.QtCore import QSettings, Qt, QThread, QTimer
 from PyQt6.QtWidgets import (QDockWidget, QMainWindow, QMenuBar, QMessageBox,
         QWhatsThis)
 
 from .._version import version
+from ..exceptions import UserException
+from ..project_io import ProjectJournal, replay_journal
 
+from .helpers import warning
 from .shell_tool import ShellTool, ShellToolLocation
 
 
@@ -75,6 +79,10 @@ class EventType(Enum):
     # A project has been renamed.  There is no event argument.
     PROJECT_RENAME = auto()
 
+    # A project has been saved in the background.  There is no event
+    # argument.
+    PROJECT_SAVED = auto()
+
     # The project's root module has been renamed.  There is no event argument.
     PROJECT_ROOT_MODULE_RENAME = auto()
 
@@ -90,9 +98,26 @@ class EventType(Enum):
     VERSION_RENAME = auto()
 
 
+# The events that are the result of a project being modified.
+_MODIFYING_EVENTS = frozenset((EventType.API_STATUS, EventType.API_VERSIONS,
+        EventType.CONTAINER_API_ADD, EventType.CONTAINER_API_DELETE,
+        EventType.FEATURE_ADD, EventType.FEATURE_DELETE,
+        EventType.FEATURE_RENAME, EventType.MODULE_ADD,
+        EventType.MODULE_DELETE, EventType.MODULE_RENAME,
+        EventType.PLATFORM_ADD, EventType.PLATFORM_DELETE,
+        EventType.PLATFORM_RENAME, EventType.PROJECT_ROOT_MODULE_RENAME,
+        EventType.VERSION_ADD, EventType.VERSION_DELETE,
+        EventType.VERSION_RENAME))
+
+
 class Shell:
     """ This class encapsulates a collection of tools. """
 
+    # The delay in milliseconds between a project being modified and the
+    # changes being recorded in its journal.  This means that a sequence of
+    # modifications is recorded together without slowing down the GUI.
+    _JOURNAL_DELAY = 1000
+
     # Map tool locations to Qt dock areas.
     _LOCATION_MAP = {
         ShellToolLocation.LEFT: Qt.DockWidgetArea.LeftDockWidgetArea,
@@ -105,6 +130,12 @@ class Shell:
         """ Initialise the shell. """
 
         self._project = None
+        self._journal = None
+        self._save_thread = None
+
+        # Changes are only recorded in the journal when the GUI is idle.
+        self._journal_timer = QTimer(singleShot=True,
+                interval=self._JOURNAL_DELAY, timeout=self._record_journal)
 
         # Create the widget that implements the shell.
         self.widget = _ShellWidget(self._handle_close_event)
@@ -211,6 +242,9 @@ class Shell:
         self._project.dirty = state
         self.widget.setWindowModified(state)
 
+        if state:
+            self._schedule_journal()
+
     def handle_project_dialog(self, title, dialog_factory):
         """ Handle a dialog that will update some aspect of a project. """
 
@@ -227,6 +261,9 @@ class Shell:
     def notify(self, event_type, event_arg=None):
         """ Notify all tools about a project-specific event. """
 
+        if event_type in _MODIFYING_EVENTS:
+            self._schedule_journal()
+
         for tool in self._tools:
             tool.event(event_type, event_arg)
 
@@ -240,33 +277,79 @@ class Shell:
     def project(self, project):
         """ Set the current project. """
 
+        if self._journal is not None:
+            self._journal_timer.stop()
+            self._journal.close()
+            self._journal = None
+
         self._project = project
+
+        # Recover any changes that weren't saved from the project's journal.
+        if os.path.isfile(project.name):
+            self._open_journal(replay=True)
+
         self.notify(EventType.PROJECT_NEW)
         self.dirty = project.dirty
 
+    def save_in_background(self, snapshot):
+        """ Write a snapshot of the current project in a background thread.
+        The project is no longer dirty unless the snapshot can't be written.
+        """
+
+        # Make sure snapshots are written in the order they were taken.
+        self.wait_for_save()
+
+        # Make sure the journal contains all the changes in the snapshot so
+        # that it can be compacted once the snapshot has been written.
+        if self._journal is None:
+            self._open_journal()
+
+        if self._journal is None:
+            journal_size = None
+        else:
+            self._journal_timer.stop()
+            journal_size = self._record_journal()
+
+        self.dirty = False
+        self.log(f"Saving {snapshot.name}")
+
+        save_thread = _SaveThread(self._project, snapshot, journal_size)
+        save_thread.finished.connect(
+                lambda: self._handle_save_finished(save_thread))
+        self._save_thread = save_thread
+        save_thread.start()
+
     def save_project(self):
         """ Return True if any current project was saved. """
 
+        # Make sure any save in the background has finished as, if it failed,
+        # the project will be dirty again.
+        self.wait_for_save()
+
         # Ask the user unless the project hasn't been modified.
-        if not self._project.dirty:
-            return True
+        if self._project.dirty:
+            button = QMessageBox.question(self.widget, "Quit",
+                    "The project has been modified. Do you want to save or discard the changes?",
+                    QMessageBox.StandardButton.Cancel | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Save)
 
-        button = QMessageBox.question(self.widget, "Quit",
-                "The project has been modified. Do you want to save or discard the changes?",
-                QMessageBox.StandardButton.Cancel | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Save)
+            if button is QMessageBox.StandardButton.Cancel:
+                return False
 
-        if button is QMessageBox.StandardButton.Cancel:
-            return False
+            if button is QMessageBox.StandardButton.Save:
+                save_unsuccessful = False
 
-        if button is QMessageBox.StandardButton.Save:
-            save_unsuccessful = False
+                for tool in self._tools:
+                    if not tool.save_data():
+                        save_unsuccessful = True
 
-            for tool in self._tools:
-                if not tool.save_data():
-                    save_unsuccessful = True
+                if save_unsuccessful:
+                    return False
 
-            if save_unsuccessful:
-                return False
+        # The journal is no longer needed as the project has either been saved
+        # or its changes are to be discarded.
+        if self._journal is not None:
+            self._journal_timer.stop()
+            self._journal.discard()
 
         return True
 
@@ -275,6 +358,15 @@ class Shell:
 
         self.widget.show()
 
+    def wait_for_save(self):
+        """ Wait for any save in the background to finish. """
+
+        save_thread = self._save_thread
+
+        if save_thread is not None:
+            save_thread.wait()
+            self._handle_save_finished(save_thread)
+
     def _about(self):
         """ Tell the user about the application. """
 
@@ -284,6 +376,38 @@ f"""This is msip v{version}, part of MetaSIP.
 msip is a tool for creating .sip files from C/C++ header files.
 """)
 
+    def _handle_save_finished(self, save_thread):
+        """ Handle the completion of a save in the background. """
+
+        # Ignore the notification of a save that has already been handled.
+        if save_thread is not self._save_thread:
+            return
+
+        self._save_thread = None
+
+        error = save_thread.error
+
+        if error is None:
+            # Remove the changes that have now been saved from the journal.
+            if save_thread.project is self._project and self._journal is not None and save_thread.journal_size is not None:
+                self._journal.saved(save_thread.journal_size)
+
+            self.log(f"Saved {save_thread.snapshot.name}")
+            self.notify(EventType.PROJECT_SAVED)
+            return
+
+        if not isinstance(error, UserException):
+            # An internal error.
+            raise error
+
+        self.log(f"Failed to save {save_thread.snapshot.name}")
+
+        # The project still needs saving unless it has been replaced.
+        if save_thread.project is self._project:
+            self.dirty = True
+
+        warning("Save", error.text, detail=error.detail, parent=self.widget)
+
     def _handle_close_event(self):
         """ Handle a close event and return True if the event should be
         accepted.
@@ -307,6 +431,82 @@ msip is a tool for creating .sip files from C/C++ header files.
 
         return False
 
+    def _open_journal(self, replay=False):
+        """ Open the journal of the current project after optionally replaying
+        it.
+        """
+
+        project = self._project
+        discard = False
+
+        if replay:
+            try:
+                if replay_journal(project):
+                    project.dirty = True
+                    self.log(f"Recovered unsaved changes to {project.name}")
+            except UserException as e:
+                warning("Recover",
+                        e.text + ". Any unsaved changes will be discarded.",
+                        detail=e.detail, parent=self.widget)
+                discard = True
+
+        try:
+            self._journal = ProjectJournal(project)
+        except UserException as e:
+            warning("Journal", e.text, detail=e.detail, parent=self.widget)
+            return
+
+        if discard:
+            self._journal.discard()
+
+    def _record_journal(self):
+        """ Record any changes to the current project in its journal.  Return
+        the size of the journal or None if there was an error.
+        """
+
+        try:
+            return self._journal.record()
+        except UserException as e:
+            # Stop using the journal rather than repeatedly report the error.
+            self._journal.close()
+            self._journal = None
+
+            warning("Journal", e.text, detail=e.detail, parent=self.widget)
+
+        return None
+
+    def _schedule_journal(self):
+        """ Schedule the recording of any changes to the current project in its
+        journal.  This is called whenever the project is modified and so must
+        be fast.
+        """
+
+        if self._journal is not None:
+            self._journal_timer.start()
+
+
+class _SaveThread(QThread):
+    """ The thread that writes a snapshot of a project. """
+
+    def __init__(self, project, snapshot, journal_size):
+        """ Initialise the thread. """
+
+        super().__init__()
+
+        self.project = project
+        self.snapshot = snapshot
+        self.journal_size = journal_size
+        self.error = None
+
+    def run(self):
+        """ Write the snapshot. """
+
+        try:
+            self.snapshot.write()
+        except Exception as e:
+            # The exception is handled by the GUI thread.
+            self.error = e
+
 
 class _ShellWidget(QMainWindow):
     """ The widget that implements the shell. """
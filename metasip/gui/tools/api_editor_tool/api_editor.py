@@ -53,6 +53,8 @@ class ApiEditor(QTreeWidget):
         self.setDropIndicatorShown(True)
         self.setDragDropMode(self.DragDropMode.InternalMove)
 
+        self.itemExpanded.connect(self._handle_item_expanded)
+
         self.dragged = None
 
     def api_status(self, api):
@@ -267,6 +269,12 @@ class ApiEditor(QTreeWidget):
 
         return source, target
 
+    @staticmethod
+    def _handle_item_expanded(view):
+        """ Handle the expansion of a view. """
+
+        view.expanded()
+
     def _all_views(self, container_view=None):
         """ A generator for all API views. """
 
@@ -369,6 +377,12 @@ class APIView(QTreeWidgetItem):
 
         return adapt(self.api).as_str()
 
+    def expanded(self):
+        """ Called when the view has been expanded. """
+
+        # This default implementation does nothing.
+        pass
+
     def get_child_factory(self):
         """ Return the callable that will return a child instance. """
 
@@ -543,9 +557,7 @@ class ContainerView(APIView, DropSite):
 
         super().__init__(container, shell, parent, after)
 
-        if hasattr(container, 'content'):
-            for code in container.content:
-                CodeView(code, self.shell, self)
+        self.populate()
 
     @classmethod
     def add_editor_option(cls, menu, name, handler, value, editor_id):
@@ -606,6 +618,13 @@ class ContainerView(APIView, DropSite):
 
         return CodeView
 
+    def populate(self):
+        """ Create the views of the container's content. """
+
+        if hasattr(self.api, 'content'):
+            for code in self.api.content:
+                CodeView(code, self.shell, self)
+
     def new_manual_code(self):
         """ Return a new ManualCode object appropriately configured. """
 
@@ -631,6 +650,35 @@ class SipFileView(ContainerView):
 
         self.setText(ApiEditor.NAME, sip_file.name)
 
+    def api_add(self, api):
+        """ An API has been added. """
+
+        # If the views are deferred then the new one will be created with the
+        # others.
+        if not self._deferred:
+            super().api_add(api)
+
+    def expanded(self):
+        """ Called when the view has been expanded. """
+
+        if self._deferred:
+            self._deferred = False
+            self.setChildIndicatorPolicy(
+                    QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+            super().populate()
+
+    def populate(self):
+        """ Create the views of the .sip file's content. """
+
+        # Don't load any deferred content until the view is expanded.
+        self._deferred = (self.api.content_loader is not None)
+
+        if self._deferred:
+            self.setChildIndicatorPolicy(
+                    QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        else:
+            super().populate()
+
     def droppable(self, view):
         """ Return True if a view can be dropped. """
 
@@ -940,9 +988,6 @@ class ArgumentView(APIView):
 
         self.draw_name()
 
-        # Stash this so that an argument can re-draw itself.
-        argument._view = self
-
     def draw_name(self):
         """ Draw the name column. """
 
@@ -1414,11 +1459,14 @@ class CodeView(ContainerView):
 
         updated = False
 
-        for arg in self.api.args:
-            if arg.unnamed and arg.default != '':
-                arg.unnamed = False
-                arg._view.draw_name()
-                updated = True
+        for view in self.all_child_views():
+            if isinstance(view, ArgumentView):
+                arg = view.api
+
+                if arg.unnamed and arg.default != '':
+                    arg.unnamed = False
+                    view.draw_name()
+                    updated = True
 
         if updated:
             self.draw_name()
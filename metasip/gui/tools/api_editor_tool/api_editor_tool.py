@@ -8,8 +8,9 @@ import os
 from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import QFileDialog
 
+from ....exceptions import UserException
 from ....models import Project
-from ....project_io import load_project, save_project
+from ....project_io import load_project, ProjectSnapshot, save_project
 
 from ...helpers import ProjectUi
 from ...shell import EventType
@@ -124,18 +125,18 @@ class ApiEditorTool(ShellTool):
 
             project_name, _ = QFileDialog.getOpenFileName(self._api_editor,
                     "Open project file", dir_name,
-                    "MetaSIP project files (*.msp)")
+                    "MetaSIP project files (*.msp *.msp.gz *.msp.xz)")
 
             if project_name:
                 project = Project(name=project_name)
-                if load_project(project, ui=ProjectUi()):
+                if load_project(project, ui=ProjectUi(), lazy=True):
                     self.shell.project = project
 
     def _handle_save(self):
         """ Handle the Save action. """
 
         if self.shell.project.name != '':
-            self.save_data()
+            self._save_in_background()
         else:
             self._handle_save_as()
 
@@ -145,9 +146,28 @@ class ApiEditorTool(ShellTool):
         dir_name = os.path.dirname(self.shell.project.name)
 
         project_name, _ = QFileDialog.getSaveFileName(self._api_editor,
-                "Save project file", dir_name, "MetaSIP project files (*.msp)")
+                "Save project file", dir_name,
+                "MetaSIP project files (*.msp *.msp.gz *.msp.xz)")
 
         if project_name:
             self.shell.project.name = project_name
             self.shell.notify(EventType.PROJECT_RENAME)
-            self.save_data()
+            self._save_in_background()
+
+    def _save_in_background(self):
+        """ Save the project in the background so that the GUI remains
+        responsive.
+        """
+
+        # Taking the snapshot only saves those .sip files that have changed
+        # since they were last saved (or loaded) and everything else is done
+        # in the background.  This is quick unless much of the project has
+        # changed (or it needs updating to the current format) so progress is
+        # shown.
+        try:
+            snapshot = ProjectSnapshot(self.shell.project, ui=ProjectUi())
+        except UserException as e:
+            ProjectUi().error_creating_file("Save", e.text, e.detail)
+            return
+
+        self.shell.save_in_background(snapshot)
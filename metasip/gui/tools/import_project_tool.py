@@ -42,7 +42,7 @@ class ImportProjectTool(ActionTool):
 
         import_name, _ = QFileDialog.getOpenFileName(self.shell.widget,
                 "Import project file", dir_name,
-                "MetaSIP project files (*.msp)")
+                "MetaSIP project files (*.msp *.msp.gz *.msp.xz)")
 
         if import_name:
             imported = Project(name=import_name)
@@ -87,7 +87,7 @@ class _Access(object):
         parser is the parser instance.
         attr is the entity's attribute dictionary.
         """
-        self.access = attrs.get('access', '')
+        self.access = sys.intern(attrs.get('access', ''))
         if self.access == 'public':
             self.access = ''
 
@@ -936,6 +936,10 @@ class _Argument(object):
         if self.default == 'nullptr':
             self.default = '0'
 
+        # Argument names and default values are heavily repeated.
+        self.name = sys.intern(self.name)
+        self.default = sys.intern(self.default)
+
 
 class _Ellipsis(object):
     """
@@ -1385,6 +1389,11 @@ class CastXMLParser(ParserBase):
         """
         type_str, _ = self.asInnerType(type_id, None)
 
+        # The same types are used many times so make sure each is only stored
+        # once.  This also shares them with the types of a loaded project.
+        if type_str is not None:
+            type_str = sys.intern(type_str)
+
         return type_str
 
     def asInnerType(self, type_id, prefix_ok):
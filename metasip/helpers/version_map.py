@@ -3,6 +3,14 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+# A version map is held as an integer bitmask where bit i corresponds to the
+# i'th version of the project.  A version range is then a contiguous run of
+# bits so that merging ranges, and converting the map back to ranges, are bit
+# operations rather than operations on each version.
+
+
+from functools import lru_cache
+
 from ..models import VersionRange
 
 
@@ -15,6 +23,8 @@ class VersionMap:
         """ Return a version map with each entry set to an initial value. """
 
         self._versions = project.versions
+        self._indexes = _get_indexes(tuple(self._versions))
+        self._all = (1 << len(self._versions)) - 1
         self._initialise_map(False)
 
         if version_ranges is not None:
@@ -23,17 +33,20 @@ class VersionMap:
     def __bool__(self):
         """ Return True if the version map is unconditionally True. """
 
-        return all(self._map)
+        return self._map == self._all
 
     def __getitem__(self, version):
         """ Return the map value for a version. """
 
-        return self._map[self._versions.index(version)]
+        return bool(self._map & self._get_bit(version))
 
     def __setitem__(self, version, value):
         """ Set the map value for a version. """
 
-        self._map[self._versions.index(version)] = value
+        if value:
+            self._map |= self._get_bit(version)
+        else:
+            self._map &= ~self._get_bit(version)
 
     def update_from_version_ranges(self, version_ranges):
         """ Update the version map from a list of version ranges. """
@@ -47,15 +60,16 @@ class VersionMap:
             if version_range.startversion == '':
                 start_idx = 0
             else:
-                start_idx = self._versions.index(version_range.startversion)
+                start_idx = self._get_index(version_range.startversion)
 
             if version_range.endversion == '':
                 end_idx = len(self._versions)
             else:
-                end_idx = self._versions.index(version_range.endversion)
+                end_idx = self._get_index(version_range.endversion)
 
-            for i in range(start_idx, end_idx):
-                self._map[i] = True
+            # Set the bits from start_idx up to, but excluding, end_idx.
+            if end_idx > start_idx:
+                self._map |= (1 << end_idx) - (1 << start_idx)
 
     def as_version_ranges(self):
         """ Convert a version map to a list of version ranges.  An empty list
@@ -63,40 +77,74 @@ class VersionMap:
         False.
         """
 
+        bits = self._map
+
         # See if the item is valid for all versions.
-        if all(self._map):
+        if bits == self._all:
             return []
 
         # See if the item is valid for no versions.
-        for v in self._map:
-            if v:
-                break
-        else:
+        if bits == 0:
             return None
 
-        # Construct the new list of version ranges.
+        # Construct the new list of version ranges, one for each run of set
+        # bits.
         version_ranges = []
-        vrange = None
-
-        for idx, v in enumerate(self._map):
-            if v:
-                # Start a new version range if there isn't one currently.
-                if vrange is None:
-                    vrange = VersionRange()
-
-                    if idx != 0:
-                        vrange.startversion = self._versions[idx]
-            elif vrange is not None:
-                vrange.endversion = self._versions[idx]
-                version_ranges.append(vrange)
-                vrange = None
-
-        if vrange is not None:
+
+        while bits != 0:
+            # The lowest set bit is the start of the run and adding it to the
+            # map gives the first clear bit after the run (or a bit beyond the
+            # last version).
+            start_bit = bits & -bits
+            end_bit = (bits + start_bit) & ~bits
+
+            vrange = VersionRange()
+
+            start_idx = start_bit.bit_length() - 1
+            if start_idx != 0:
+                vrange.startversion = self._versions[start_idx]
+
+            end_idx = end_bit.bit_length() - 1
+            if end_idx != len(self._versions):
+                vrange.endversion = self._versions[end_idx]
+
             version_ranges.append(vrange)
 
+            # Remove the run.
+            bits &= ~(end_bit - start_bit)
+
         return version_ranges
 
+    def _get_bit(self, version):
+        """ Return the bit corresponding to a version. """
+
+        return 1 << self._get_index(version)
+
+    def _get_index(self, version):
+        """ Return the index of a version. """
+
+        try:
+            return self._indexes[version]
+        except KeyError:
+            # Raise the same exception as the list of versions would.
+            raise ValueError(f"'{version}' is not a version") from None
+
     def _initialise_map(self, initial_state):
         """ Initialise the map. """
 
-        self._map = [initial_state for v in self._versions]
+        self._map = self._all if initial_state else 0
+
+
+@lru_cache(maxsize=16)
+def _get_indexes(versions):
+    """ Return a dict of the indexes of a tuple of versions keyed by the
+    version.
+    """
+
+    # Note that, as with list.index(), the first of any duplicates is used.
+    indexes = {}
+
+    for idx, version in enumerate(versions):
+        indexes.setdefault(version, idx)
+
+    return indexes
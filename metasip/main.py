@@ -9,7 +9,8 @@ import os
 
 from .exceptions import UserException
 from .models import Project
-from .project_io import generate_sip_files, load_project
+from .project_io import (GenerationCache, TagResolver, check_sip_files,
+        generate_sip_files, load_project, write_depfile, write_manifest)
 from ._version import version
 
 
@@ -23,23 +24,58 @@ def main():
     parser.add_argument('project',
             help="the project to generate .sip files from",
             nargs='?')
+    parser.add_argument('--cache',
+            help="use and maintain a cache of the loaded project",
+            dest='cache', default=False, action='store_true')
+    parser.add_argument('--check',
+            help="check that the .sip files in the output directory are up to date",
+            dest='check', default=False, action='store_true')
+    parser.add_argument('--depfile',
+            help="write a depfile describing the generated .sip files to FILE",
+            metavar='FILE')
+    parser.add_argument('--disable-feature',
+            help="generate .sip files with feature F disabled",
+            metavar='F', action='append', default=[])
+    parser.add_argument('--enable-feature',
+            help="generate .sip files with feature F enabled",
+            metavar='F', action='append', default=[])
+    parser.add_argument('--generation-cache',
+            help="use and maintain a cache of generated .sip files in DIR",
+            metavar='DIR')
     parser.add_argument('--ignore',
             help="do not generate .sip files for MODULE",
             metavar='MODULE', action='append')
+    parser.add_argument('--jobs',
+            help="use N processes to load the project and generate the .sip files",
+            metavar='N', type=int, default=1)
+    parser.add_argument('--manifest',
+            help="write a JSON manifest of the generated .sip files to FILE",
+            metavar='FILE')
     parser.add_argument('--output-dir', help="generate the .sip files in DIR",
             metavar='DIR', required=True)
+    parser.add_argument('--platform',
+            help="generate .sip files that are specific to platform P",
+            metavar='P')
+    parser.add_argument('--resolve-version',
+            help="generate .sip files that are specific to version V",
+            metavar='V')
     parser.add_argument('--verbose', help="display progress messages",
             dest='verbose', default=False, action='store_true')
 
     args = parser.parse_args()
 
     try:
-        _generate(args.project, args.output_dir, args.ignore, args.verbose)
+        return _generate(args.project, args.output_dir, args.ignore,
+                args.verbose, args.cache, args.jobs, args.generation_cache,
+                args.depfile, args.manifest, args.check, args.resolve_version,
+                args.platform, args.enable_feature, args.disable_feature)
     except Exception as e:
         _handle_exception(e)
 
 
-def _generate(project_name, output_dir, ignore, verbose):
+def _generate(project_name, output_dir, ignore, verbose, cache, jobs,
+        generation_cache_dir, depfile, manifest, check, resolve_version,
+        platform, enabled_features, disabled_features):
     """ Generate the .sip files for a project and return an exit code or 0 if
     there was no error.
     """
@@ -47,10 +83,69 @@ def _generate(project_name, output_dir, ignore, verbose):
     if not project_name:
         raise UserException("Specify the name of an existing project file")
 
+    if generation_cache_dir is None:
+        generation_cache = None
+    else:
+        generation_cache = GenerationCache(generation_cache_dir)
+
     project = Project(project_name)
-    load_project(project)
+    # Unless the complete project is going to be loaded anyway, only load the
+    # content of .sip files that are actually generated.  The generation cache
+    # is only used for .sip files whose content hasn't been loaded.
+    load_project(project, cache=cache, jobs=jobs,
+            lazy=(not cache and (jobs <= 1 or generation_cache is not None)))
+
+    if resolve_version is None and platform is None and not enabled_features and not disabled_features:
+        tag_resolver = None
+    else:
+        tag_resolver = TagResolver(project, version=resolve_version,
+                platform=platform, enabled_features=enabled_features,
+                disabled_features=disabled_features)
+
+    if check:
+        return _check(project, output_dir, ignore, verbose, jobs,
+                generation_cache, tag_resolver)
+
+    nr_written, nr_unchanged = generate_sip_files(project, output_dir, ignore,
+            verbose, jobs=jobs, cache=generation_cache,
+            tag_resolver=tag_resolver)
+
+    if verbose:
+        print(f"{nr_written} .sip files written, {nr_unchanged} unchanged")
+
+    # These are written after the .sip files so that they are left unchanged
+    # if there was an error generating them.
+    if depfile is not None:
+        write_depfile(project, output_dir, ignore, depfile)
+
+    if manifest is not None:
+        write_manifest(project, output_dir, ignore, manifest)
+
+    return 0
+
+
+def _check(project, output_dir, ignore, verbose, jobs, generation_cache,
+        tag_resolver):
+    """ Check that the .sip files for a project are up to date and return an
+    exit code or 0 if they are.
+    """
+
+    stale, extra = check_sip_files(project, output_dir, ignore, jobs=jobs,
+            cache=generation_cache, tag_resolver=tag_resolver)
+
+    for file_path in stale:
+        print(f"'{file_path}' is out of date")
+
+    for file_path in extra:
+        print(f"'{file_path}' is not generated from the project")
+
+    if stale or extra:
+        return 1
+
+    if verbose:
+        print("All .sip files are up to date")
 
-    generate_sip_files(project, output_dir, ignore, verbose)
+    return 0
 
 
 def _handle_exception(e):
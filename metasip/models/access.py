@@ -12,6 +12,8 @@ class Access:
     specifiers.
     """
 
+    __slots__ = ()
+
     # The access specifier.  Values are '' (meaning public), 'protected' and
     # 'private'.
     access: str = ''
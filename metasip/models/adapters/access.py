@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class AccessAdapter(BaseAdapter):
     """ This is the Access adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'access':   AttributeType.STRING,
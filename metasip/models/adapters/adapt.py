@@ -3,16 +3,48 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+# adapt() is called several times for every model whenever a project is
+# loaded, saved or generated and so the adapter class for each model type is
+# resolved (and the model type checked) once and cached.  Adapters hold no
+# state other than the model and have no instance dictionary so that creating
+# one is cheap.
+
+
+# The adapter class for each model type when adapted to its own type.
+_adapter_classes = {}
+
+# The adapter class for each 2-tuple of model type and target type when
+# adapted to a super-type.
+_target_adapter_classes = {}
+
+
 def adapt(model, target_type=None):
     """ Return an adapter for a model adapted to its type or super-type. """
 
-    from .adapter_map import ADAPTER_MAP
+    model_type = type(model)
 
     if target_type is None:
-        target_type = type(model)
+        adapter_cls = _adapter_classes.get(model_type)
+        if adapter_cls is None:
+            adapter_cls = _adapter_classes[model_type] = _get_adapter_class(
+                    model_type, model_type)
+    else:
+        key = (model_type, target_type)
 
-    assert isinstance(model, target_type)
+        adapter_cls = _target_adapter_classes.get(key)
+        if adapter_cls is None:
+            adapter_cls = _target_adapter_classes[key] = _get_adapter_class(
+                    model_type, target_type)
+
+    return adapter_cls(model)
+
+
+def _get_adapter_class(model_type, target_type):
+    """ Return the adapter class for a model type adapted to a target type. """
+
+    # This is imported here to avoid a circular import.
+    from .adapter_map import ADAPTER_MAP
 
-    adapter_factory = ADAPTER_MAP[target_type]
+    assert issubclass(model_type, target_type)
 
-    return adapter_factory(model)
+    return ADAPTER_MAP[target_type]
@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class AnnosAdapter(BaseAdapter):
     """ This is the Annos adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'annos':    AttributeType.STRING,
@@ -7,11 +7,14 @@ from ..annos import Annos
 
 from .adapt import adapt
 from .base_adapter import AttributeType, BaseApiAdapter
+from .cached_str import cached_str
 
 
 class ArgumentAdapter(BaseApiAdapter):
     """ This is the Argument adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'default':      AttributeType.STRING,
@@ -31,7 +34,7 @@ class ArgumentAdapter(BaseApiAdapter):
         if type(arg) is not type(other_arg):
             return False
 
-        if self.expand_type(arg.type) != self.expand_type(other_arg.type):
+        if self.normalise_type(arg.type) is not self.normalise_type(other_arg.type):
             return False
 
         if arg.default != other_arg.default:
@@ -39,6 +42,7 @@ class ArgumentAdapter(BaseApiAdapter):
 
         return True
 
+    @cached_str
     def as_py_str(self):
         """ Return the Python representation of the argument. """
 
@@ -56,6 +60,7 @@ class ArgumentAdapter(BaseApiAdapter):
 
         return s
 
+    @cached_str
     def as_str(self):
         """ Return the standard string representation. """
 
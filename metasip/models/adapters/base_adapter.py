@@ -5,6 +5,8 @@
 
 from abc import ABC, abstractmethod
 from enum import auto, Enum
+from functools import lru_cache
+from sys import intern
 from xml.sax.saxutils import escape
 
 from ...helpers import version_range
@@ -21,6 +23,61 @@ class AttributeType(Enum):
     STRING_LIST = auto()
 
 
+class _AttributeDecoder:
+    """ This class decodes the attributes described by an attribute type map
+    from an XML element and its literal subelements.
+    """
+
+    def __init__(self, attribute_type_map):
+        """ Initialise the decoder. """
+
+        self._bools = []
+        self._literals = []
+        self._strings = []
+        self._string_lists = []
+
+        for name, attribute_type in attribute_type_map.items():
+            if attribute_type is AttributeType.BOOL:
+                self._bools.append(name)
+            elif attribute_type is AttributeType.LITERAL:
+                self._literals.append(name)
+            elif attribute_type is AttributeType.STRING:
+                self._strings.append(name)
+            elif attribute_type is AttributeType.STRING_LIST:
+                self._string_lists.append(name)
+
+    def decode(self, element, model):
+        """ Set the attributes of a model from an XML element. """
+
+        attrib = element.attrib
+
+        for name in self._bools:
+            setattr(model, name, bool(int(attrib.get(name, '0'))))
+
+        # The same strings (eg. types and annotations) are repeated many times
+        # in a project so make sure each is only stored once.
+        for name in self._strings:
+            setattr(model, name, intern(attrib.get(name, '')))
+
+        for name in self._string_lists:
+            setattr(model, name,
+                    [intern(s) for s in attrib.get(name, '').split()])
+
+        if self._literals:
+            # Index the literal subelements in a single pass.  Note that the
+            # first literal of a particular type is used.
+            literals = {}
+
+            for subelement in element:
+                if subelement.tag == 'Literal':
+                    literals.setdefault(subelement.get('type'),
+                            subelement.text)
+
+            for name in self._literals:
+                text = literals.get(name)
+                setattr(model, name, '' if text is None else text.strip())
+
+
 class BaseAdapter(ABC):
     """ This is the base class for all adapters and provides the ability to
     load and save a model to a project file and to provide a user-friendly, one
@@ -30,11 +87,22 @@ class BaseAdapter(ABC):
     # The default attribute type map.
     ATTRIBUTE_TYPE_MAP = {}
 
+    # Adapters are created very frequently so they don't have an instance
+    # dictionary.  Sub-classes must also define __slots__.
+    __slots__ = ('model', )
+
     def __init__(self, model):
         """ Initialise the adapter. """
 
         self.model = model
 
+    def __init_subclass__(cls, **kwargs):
+        """ Precompile the decoder for the sub-class's attribute type map. """
+
+        super().__init_subclass__(**kwargs)
+
+        cls._attribute_decoder = _AttributeDecoder(cls.ATTRIBUTE_TYPE_MAP)
+
     def __eq__(self, other):
         """ Compare for C/C++ equality. """
 
@@ -62,11 +130,7 @@ class BaseAdapter(ABC):
         if type == '':
             return ''
 
-        # This is entirely cosmetic to be consistent with older versions.
-        type = cls._normalise_templates(type)
-
-        # SIP can't yet handle every C++ fundamental type.
-        s = type.replace('long int', 'long')
+        s = cls.normalise_type(type)
 
         # If there is no embedded %s then just append the name.
         if '%s' in s:
@@ -92,22 +156,20 @@ class BaseAdapter(ABC):
 
         # This default implementation loads attributes define by
         # ATTRIBUTE_TYPE_MAP.
-        for name, attribute_type in self.ATTRIBUTE_TYPE_MAP.items():
-            if attribute_type is AttributeType.BOOL:
-                value = bool(int(element.get(name, '0')))
-            elif attribute_type is AttributeType.LITERAL:
-                for subelement in element:
-                    if subelement.tag == 'Literal' and subelement.get('type') == name:
-                        value = subelement.text.strip()
-                        break
-                else:
-                    value = ''
-            elif attribute_type is AttributeType.STRING:
-                value = element.get(name, '')
-            elif attribute_type is AttributeType.STRING_LIST:
-                value = element.get(name, '').split()
+        self._attribute_decoder.decode(element, self.model)
 
-            setattr(self.model, name, value)
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def normalise_type(type):
+        """ Return the normalised form of a C/C++ type as an interned string so
+        that types that are the same are identical.
+        """
+
+        # This is entirely cosmetic to be consistent with older versions.
+        type = _normalise_templates(type)
+
+        # SIP can't yet handle every C++ fundamental type.
+        return intern(type.replace('long int', 'long'))
 
     def save(self, output):
         """ Save the model to an output file. """
@@ -177,30 +239,14 @@ class BaseAdapter(ABC):
 
         return escape(s, {'"': '&quot;'})
 
-    @classmethod
-    def _normalise_templates(cls, type):
-        """ Return the normalised form of any templates. """
-
-        t_start = type.find('<')
-        t_end = type.rfind('>')
-
-        if t_start > 0 and t_end > t_start:
-            xt = []
-
-            # Note that this doesn't handle nested template arguments properly.
-            for t_arg in type[t_start + 1:t_end].split(','):
-                xt.append(cls._normalise_templates(t_arg.strip()))
-
-            type = type[:t_start + 1] + ', '.join(xt) + type[t_end:]
-
-        return type
-
 
 class BaseApiAdapter(BaseAdapter):
     """ This is the base class for all adapters for models that are written to
     a .sip file and provide a user-friendly, one line string representation.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def generate_sip(self, sip_file, output):
         """ Generate the .sip file content. """
@@ -215,21 +261,33 @@ class BaseApiAdapter(BaseAdapter):
 
         api = self.model
 
+        # Any tags that are resolved when the .sip file is generated don't
+        # need to be tested.
+        versions = api.versions
+        platforms = api.platforms
+        features = api.features
+
+        tag_resolver = output.tag_resolver
+        if tag_resolver is not None:
+            versions = tag_resolver.resolve_versions(versions)
+            platforms = tag_resolver.resolve_any(platforms)
+            features = tag_resolver.resolve_all(features)
+
         nr_ends = 0
 
-        for vrange in api.versions:
+        for vrange in versions:
             vr = version_range(vrange)
             output.write(f'%If ({vr})\n', indent=False)
             nr_ends += 1
 
         # Multiple platforms are logically or-ed.
-        if len(api.platforms) != 0:
-            platforms = ' || '.join(api.platforms)
+        if len(platforms) != 0:
+            platforms = ' || '.join(platforms)
             output.write(f'%If ({platforms})\n', indent=False)
             nr_ends += 1
 
         # Multiple features are nested (ie. logically and-ed).
-        for feature in api.features:
+        for feature in features:
             output.write(f'%If ({feature})\n', indent=False)
             nr_ends += 1
 
@@ -252,3 +310,95 @@ class BaseApiAdapter(BaseAdapter):
 
         for _ in range(nr_ends):
             output.write('%End\n', indent=False)
+
+
+# The closing bracket corresponding to each opening bracket that may appear in
+# a type.
+_CLOSING_BRACKETS = {'<': '>', '(': ')', '[': ']'}
+
+
+def _find_closing_bracket(s, start):
+    """ Return the index of the bracket that closes the bracket at the start
+    index of a string or -1 if it is not closed.
+    """
+
+    depth = 0
+
+    for i in range(start, len(s)):
+        ch = s[i]
+
+        if ch in '<([':
+            depth += 1
+        elif ch in '>)]':
+            depth -= 1
+
+            if depth == 0:
+                return i if ch == _CLOSING_BRACKETS[s[start]] else -1
+
+    return -1
+
+
+def _normalise_brackets(s, brackets):
+    """ Return a string with the contents of any of a set of (possibly nested)
+    opening brackets normalised.
+    """
+
+    parts = []
+    start = 0
+
+    for i, ch in enumerate(s):
+        # Skip anything already handled.
+        if i < start:
+            continue
+
+        # Note that a leading '<' isn't the start of template arguments.
+        if ch in brackets and (i > 0 or ch != '<'):
+            end = _find_closing_bracket(s, i)
+            if end < 0:
+                break
+
+            parts.append(s[start:i])
+            parts.append(_normalise_list(s[i:end + 1]))
+            start = end + 1
+
+    parts.append(s[start:])
+
+    return ''.join(parts)
+
+
+def _normalise_list(s):
+    """ Return the normalised form of a bracketed, comma separated list. """
+
+    # Split the list at the commas that are not nested in other brackets.
+    items = []
+    depth = 0
+    item_start = 1
+
+    for i in range(1, len(s) - 1):
+        ch = s[i]
+
+        if ch in '<([':
+            depth += 1
+        elif ch in '>)]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            items.append(s[item_start:i])
+            item_start = i + 1
+
+    items.append(s[item_start:-1])
+
+    # Within a template argument any bracketed list is normalised.
+    items = [_normalise_brackets(item.strip(), '<([') for item in items]
+
+    return s[0] + ', '.join(items) + s[-1]
+
+
+def _normalise_templates(type):
+    """ Return a type with the arguments of any (possibly nested) templates
+    normalised.
+    """
+
+    if '<' not in type:
+        return type
+
+    return _normalise_brackets(type, '<')
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# The string representations of some models (eg. the signatures of callables)
+# are expensive to create and are repeatedly requested, particularly by the
+# GUI.  They are cached, keyed by the id of the model, in the cache of the
+# tracker of the SipFile that contains the model so that they are discarded
+# whenever that SipFile is modified.  A model can only start to use the cache
+# once it has been added to the SipFile, which modifies it, so the cache
+# doesn't need to keep a reference to each model to stop the id of the model
+# being reused while the cache is valid.  Note that the cache is structured so
+# that adding an entry doesn't create any objects that are tracked by the
+# garbage collector as, with a large project, that would trigger many
+# expensive collections.
+
+
+from functools import wraps
+
+from ..modification_tracker import get_cache
+
+
+def cached_str(method):
+    """ A decorator for an adapter method, with no arguments, that returns a
+    string representation of the model that is cached until the SipFile
+    containing the model is modified.
+    """
+
+    @wraps(method)
+    def wrapper(self):
+        model = self.model
+
+        cache = get_cache(model)
+        if cache is None:
+            return method(self)
+
+        strings = cache.get(method)
+        if strings is None:
+            strings = cache[method] = {}
+
+        model_id = id(model)
+
+        s = strings.get(model_id)
+        if s is None:
+            s = strings[model_id] = method(self)
+
+        return s
+
+    return wrapper
@@ -9,11 +9,14 @@ from ..code import Code
 
 from .adapt import adapt
 from .base_adapter import AttributeType, BaseAdapter
+from .cached_str import cached_str
 
 
 class CallableAdapter(BaseAdapter):
     """ This is the Callable adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'methcode': AttributeType.LITERAL,
@@ -34,7 +37,7 @@ class CallableAdapter(BaseAdapter):
         if callable.name != other_callable.name:
             return False
 
-        if self.expand_type(callable.rtype) != self.expand_type(other_callable.rtype):
+        if self.normalise_type(callable.rtype) is not self.normalise_type(other_callable.rtype):
             return False
 
         if len(callable.args) != len(other_callable.args):
@@ -46,6 +49,7 @@ class CallableAdapter(BaseAdapter):
 
         return True
 
+    @cached_str
     def as_str(self):
         """ Return the standard string representation. """
 
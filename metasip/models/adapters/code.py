@@ -14,6 +14,8 @@ from .base_adapter import BaseAdapter
 class CodeAdapter(BaseAdapter):
     """ This is the Code adapter. """
 
+    __slots__ = ()
+
     def load(self, element, project, ui):
         """ Load the model from the XML element.  An optional user interface
         may be available to inform the user of progress.
@@ -10,6 +10,8 @@ from .base_adapter import BaseAdapter
 class CodeContainerAdapter(BaseAdapter):
     """ This is the CodeContainer adapter. """
 
+    __slots__ = ()
+
     def load(self, tag_code_map, element, project, ui):
         """ Load the model from the XML element.  An optional user interface
         may be available to inform the user of progress.
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class ConstructorAdapter(BaseApiAdapter):
     """ This is the Constructor adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'explicit': AttributeType.BOOL,
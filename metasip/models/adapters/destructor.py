@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class DestructorAdapter(BaseApiAdapter):
     """ This is the Destructor adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'methcode': AttributeType.LITERAL,
@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class DocstringAdapter(BaseAdapter):
     """ This is the Docstring adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'docstring':    AttributeType.LITERAL,
@@ -15,6 +15,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class EnumAdapter(BaseApiAdapter):
     """ This is the Enum adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'basetype':     AttributeType.STRING,
@@ -78,7 +80,7 @@ class EnumAdapter(BaseApiAdapter):
         output += 1
 
         for enum_value in enum.content:
-            if enum_value.status == '':
+            if enum_value.status == '' and output.is_enabled(enum_value):
                 adapt(enum_value).generate_sip(sip_file, output)
 
         output -= 1
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class EnumValueAdapter(BaseApiAdapter):
     """ This is the EnumValue adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'name': AttributeType.STRING,
@@ -14,6 +14,8 @@ from .base_adapter import BaseApiAdapter
 class FunctionAdapter(BaseApiAdapter):
     """ This is the Function adapter. """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         """ Compare for C/C++ equality. """
 
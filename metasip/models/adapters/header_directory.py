@@ -18,6 +18,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class HeaderDirectoryAdapter(BaseAdapter):
     """ This is the HeaderDirectory adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'name':             AttributeType.STRING,
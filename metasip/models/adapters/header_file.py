@@ -12,6 +12,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class HeaderFileAdapter(BaseAdapter):
     """ This is the HeaderFile adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'ignored':  AttributeType.BOOL,
@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class HeaderFileVersionAdapter(BaseAdapter):
     """ This is the HeaderFileVersion adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'md5':      AttributeType.STRING,
@@ -29,6 +29,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class ClassAdapter(BaseApiAdapter):
     """ This is the Class adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'bases':            AttributeType.STRING,
@@ -181,7 +183,7 @@ class ClassAdapter(BaseApiAdapter):
         access = '' if klass.struct else 'private'
 
         for api in klass.content:
-            if api.status != '':
+            if api.status != '' or not output.is_enabled(api):
                 continue
 
             if isinstance(api, (Access, ExtendedAccess)):
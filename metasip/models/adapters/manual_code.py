@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class ManualCodeAdapter(BaseApiAdapter):
     """ This is the ManualCode adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'body':     AttributeType.LITERAL,
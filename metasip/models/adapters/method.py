@@ -10,11 +10,14 @@ from ..extended_access import ExtendedAccess
 
 from .adapt import adapt
 from .base_adapter import AttributeType, BaseApiAdapter
+from .cached_str import cached_str
 
 
 class MethodAdapter(BaseApiAdapter):
     """ This is the Method adapter. """
 
+    __slots__ = ()
+
     ATTRIBUTE_TYPE_MAP = {
         'abstract': AttributeType.BOOL,
         'const':    AttributeType.BOOL,
@@ -63,6 +66,7 @@ class MethodAdapter(BaseApiAdapter):
 
         return True
 
+    @cached_str
     def as_str(self):
         """ Return the standard string representation. """
 
@@ -12,6 +12,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class ModuleAdapter(BaseAdapter):
     """ This is the Module adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'directives':           AttributeType.LITERAL,
@@ -57,8 +59,10 @@ class ModuleAdapter(BaseAdapter):
                 adapt(sip_file).load(subelement, project, ui)
                 module.content.append(sip_file)
 
-    def save(self, output):
-        """ Save the model to an output file. """
+    def save(self, output, sip_file_references=False):
+        """ Save the model to an output file.  If sip_file_references is set
+        then only references to the .sip files are saved and not their content.
+        """
 
         module = self.model
 
@@ -79,7 +83,10 @@ class ModuleAdapter(BaseAdapter):
         self.save_literal('directives', output)
 
         for sip_file in module.content:
-            adapt(sip_file).save(output)
+            if sip_file_references:
+                adapt(sip_file).save_reference(output)
+            else:
+                adapt(sip_file).save(output)
 
         output -= 1
         output.write('</Module>\n')
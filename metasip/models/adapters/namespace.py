@@ -23,6 +23,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class NamespaceAdapter(BaseApiAdapter):
     """ This is the Namespace adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'name': AttributeType.STRING,
@@ -88,7 +90,7 @@ class NamespaceAdapter(BaseApiAdapter):
         output += 1
 
         for api in namespace.content:
-            if api.status == '':
+            if api.status == '' and output.is_enabled(api):
                 adapt(api).generate_sip(sip_file, output)
 
         output -= 1
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class OpaqueClassAdapter(BaseApiAdapter):
     """ This is the OpaqueClass adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'name': AttributeType.STRING,
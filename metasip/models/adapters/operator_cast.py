@@ -13,6 +13,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class OperatorCastAdapter(BaseApiAdapter):
     """ This is the OperatorCast adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'const':    AttributeType.BOOL,
@@ -13,6 +13,8 @@ from .base_adapter import BaseApiAdapter
 class OperatorFunctionAdapter(BaseApiAdapter):
     """ This is the OperatorFunction adapter. """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         """ Compare for C/C++ equality. """
 
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class OperatorMethodAdapter(BaseApiAdapter):
     """ This is the OperatorMethod adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'abstract': AttributeType.BOOL,
@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class PlatformAdapter(BaseAdapter):
     """ This is the Platform adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'inputdirpattern':  AttributeType.STRING,
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class ProjectAdapter(BaseAdapter):
     """ This is the Project adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'externalfeatures':     AttributeType.STRING_LIST,
@@ -22,6 +24,7 @@ class ProjectAdapter(BaseAdapter):
         'platforms':            AttributeType.STRING_LIST,
         'rootmodule':           AttributeType.STRING,
         'sipcomments':          AttributeType.LITERAL,
+        'sipfilesdir':          AttributeType.STRING,
         'versions':             AttributeType.STRING_LIST,
     }
 
@@ -52,8 +55,10 @@ class ProjectAdapter(BaseAdapter):
                 adapt(module).load(subelement, project, ui)
                 self.model.modules.append(module)
 
-    def save(self, output):
-        """ Save the model to an output file. """
+    def save(self, output, sip_file_references=False):
+        """ Save the model to an output file.  If sip_file_references is set
+        then only references to the .sip files are saved and not their content.
+        """
 
         project = self.model
 
@@ -72,6 +77,7 @@ class ProjectAdapter(BaseAdapter):
         self.save_str_list('features', output)
         self.save_str_list('externalmodules', output)
         self.save_str_list('externalfeatures', output)
+        self.save_str('sipfilesdir', output)
         output.write('>\n')
         output += 1
 
@@ -80,8 +86,13 @@ class ProjectAdapter(BaseAdapter):
         for header_directory in project.headers:
             adapt(header_directory).save(output)
 
+        # If the .sip files are saved separately then the project file only
+        # refers to them.
+        if project.sipfilesdir != '':
+            sip_file_references = True
+
         for module in project.modules:
-            adapt(module).save(output)
+            adapt(module).save(output, sip_file_references=sip_file_references)
 
         output -= 1
         output.write('</Project>\n')
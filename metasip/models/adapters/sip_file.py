@@ -8,6 +8,7 @@ from ..enum import Enum
 from ..function import Function
 from ..klass import Class
 from ..manual_code import ManualCode
+from ..modification_tracker import get_saved_xml, set_saved_xml
 from ..namespace import Namespace
 from ..opaque_class import OpaqueClass
 from ..operator_function import OperatorFunction
@@ -21,6 +22,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class SipFileAdapter(BaseAdapter):
     """ This is the SipFile adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'exportedheadercode':   AttributeType.LITERAL,
@@ -67,9 +70,29 @@ class SipFileAdapter(BaseAdapter):
             ui.load_step()
 
     def save(self, output):
-        """ Save the model to an output file. """
+        """ Save the model to an output file.  The XML saved previously, or
+        the XML that any deferred content would be loaded from, is reused if
+        the model hasn't been modified since.
+        """
 
         sip_file = self.model
+        indentation = output.indentation
+
+        xml = get_saved_xml(sip_file, indentation)
+
+        if xml is None:
+            # Content that hasn't been loaded can't have been modified and so
+            # the XML it would be loaded from may be reused.
+            get_loader_xml = getattr(sip_file.content_loader, 'get_saved_xml',
+                    None)
+            if get_loader_xml is not None:
+                xml = get_loader_xml(indentation)
+
+        if xml is not None:
+            output.write(xml, indent=False)
+            return
+
+        output.begin_capture()
 
         output.write(f'<SipFile name="{sip_file.name}"')
         adapt(sip_file, CodeContainer).save_attributes(output)
@@ -88,3 +111,12 @@ class SipFileAdapter(BaseAdapter):
         output -= 1
 
         output.write('</SipFile>\n')
+
+        set_saved_xml(sip_file, output.end_capture(), indentation)
+
+    def save_reference(self, output):
+        """ Save a reference to the model, and not its content, to an output
+        file.
+        """
+
+        output.write(f'<SipFile name="{self.model.name}"/>\n')
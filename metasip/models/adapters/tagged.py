@@ -3,6 +3,8 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from sys import intern
+
 from ...helpers import version_range
 
 from ..version_range import VersionRange
@@ -13,6 +15,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class TaggedAdapter(BaseAdapter):
     """ This is the Tagged adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'features':     AttributeType.STRING_LIST,
@@ -31,8 +35,9 @@ class TaggedAdapter(BaseAdapter):
 
         if versions is not None:
             for version in versions.split():
-                version_range = VersionRange()
-                version_range.startversion, version_range.endversion = version.split('-')
+                startversion, endversion = version.split('-')
+                version_range = VersionRange(startversion=intern(startversion),
+                        endversion=intern(endversion))
                 self.model.versions.append(version_range)
 
     def save_attributes(self, output):
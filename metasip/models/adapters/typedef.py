@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class TypedefAdapter(BaseApiAdapter):
     """ This is the Typedef adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'name': AttributeType.STRING,
@@ -32,7 +34,7 @@ class TypedefAdapter(BaseApiAdapter):
         if typedef.name != other_typedef.name:
             return False
 
-        if self.expand_type(typedef.type) != self.expand_type(other_typedef.type):
+        if self.normalise_type(typedef.type) is not self.normalise_type(other_typedef.type):
             return False
 
         return True
@@ -14,6 +14,8 @@ from .base_adapter import AttributeType, BaseApiAdapter
 class VariableAdapter(BaseApiAdapter):
     """ This is the Variable adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'accesscode':   AttributeType.LITERAL,
@@ -39,7 +41,7 @@ class VariableAdapter(BaseApiAdapter):
         if variable.name != other_variable.name:
             return False
 
-        if self.expand_type(variable.type) != self.expand_type(other_variable.type):
+        if self.normalise_type(variable.type) is not self.normalise_type(other_variable.type):
             return False
 
         if variable.static != other_variable.static:
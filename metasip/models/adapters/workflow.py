@@ -9,6 +9,8 @@ from .base_adapter import AttributeType, BaseAdapter
 class WorkflowAdapter(BaseAdapter):
     """ This is the Workflow adapter. """
 
+    __slots__ = ()
+
     # The map of attribute names and types.
     ATTRIBUTE_TYPE_MAP = {
         'comments': AttributeType.LITERAL,
@@ -10,5 +10,7 @@ from dataclasses import dataclass
 class Annos:
     """ This class is a mixin for API models that may have SIP annotations. """
 
+    __slots__ = ()
+
     # The annotations.
     annos: str = ''
@@ -16,6 +16,8 @@ class Callable(Code):
     everything except destructors).
     """
 
+    __slots__ = ()
+
     # The C/C++ arguments.
     args: List[Argument] = field(default_factory=list)
 
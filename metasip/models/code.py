@@ -15,3 +15,5 @@ class Code(Annos, Tagged, Workflow):
     """ This class implements APIs that can be annotated, are subject to
     version control and a workflow.
     """
+
+    __slots__ = ()
@@ -14,5 +14,7 @@ if TYPE_CHECKING:
 class CodeContainer:
     """ This class is a mixin for APIs that can contain other APIs. """
 
+    __slots__ = ()
+
     # The list of contained API items.
     content: List['Code'] = field(default_factory=list)
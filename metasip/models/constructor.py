@@ -3,14 +3,13 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .access import Access
 from .callable import Callable
 from .docstring import Docstring
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Constructor(Callable, Docstring, Access):
     """ This class implements a C++ constructor. """
 
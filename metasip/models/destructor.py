@@ -3,13 +3,12 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .access import Access
 from .code import Code
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Destructor(Code, Access):
     """ This class implements a C++ destructor. """
 
@@ -10,5 +10,7 @@ from dataclasses import dataclass
 class Docstring:
     """ This class is a mixin for APIs that can have a docstring. """
 
+    __slots__ = ()
+
     # The optional doc string.
     docstring: str = ''
@@ -3,15 +3,16 @@
 # Copyright (c) 2025 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List
 
 from .access import Access
 from .code import Code
 from .enum_value import EnumValue
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Enum(Code, Access):
     """ This class implements an enum. """
 
@@ -12,6 +12,8 @@ class ExtendedAccess:
     specific) C++ access specifiers.
     """
 
+    __slots__ = ()
+
     # The access specifier.  Values are '' (meaning public), 'protected',
     # 'protected slots', 'private', 'public slots', 'signals'.
     access: str = ''
@@ -3,14 +3,15 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List
 
 from .header_file import HeaderFile
 from .platform import Platform
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class HeaderDirectory:
     """ This class implements a directory containing C/C++ .h files. """
 
@@ -3,13 +3,14 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List
 
 from .header_file_version import HeaderFileVersion
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class HeaderFile:
     """ This class implements a C/C++ .h file. """
 
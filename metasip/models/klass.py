@@ -3,15 +3,14 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .access import Access
 from .code import Code
 from .code_container import CodeContainer
 from .docstring import Docstring
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Class(Code, CodeContainer, Docstring, Access):
     """ This class implements a class. """
 
@@ -3,14 +3,13 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .code import Code
 from .docstring import Docstring
 from .extended_access import ExtendedAccess
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class ManualCode(Code, Docstring, ExtendedAccess):
     """ This class implements an explicitly written API. """
 
@@ -3,14 +3,13 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .callable import Callable
 from .docstring import Docstring
 from .extended_access import ExtendedAccess
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Method(Callable, Docstring, ExtendedAccess):
     """ This class implements a C++ class method. """
 
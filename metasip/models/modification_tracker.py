@@ -0,0 +1,383 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# The modification of the models contained in a SipFile is tracked so that the
+# XML of a SipFile that hasn't been modified since it was last saved can be
+# reused.  Every model, and every list that is the value of an attribute of a
+# model, refers to the tracker of the SipFile that contains it.  The tracker is
+# notified whenever the attribute of a model is set or a list is modified.
+# Tracking only starts when a SipFile is first saved (or, if the project has a
+# journal, when its content is loaded) so that it has no impact on the creation
+# of models while a project is being loaded.  The tracker also records if the
+# current state of the SipFile has been recorded in the project's journal.
+# Finally the tracker holds a cache of anything derived from the models it
+# tracks (eg. their string representations) which is discarded whenever the
+# SipFile is modified.
+
+
+from dataclasses import fields
+
+
+# The model classes whose modification may be tracked.
+_model_classes = []
+
+# The names of the list attributes of each model class.
+_list_names_map = {}
+
+# Set once the modification of models is being tracked.
+_tracking = False
+
+# Set if the modification of a SipFile is tracked as soon as its content is
+# loaded.
+_tracking_loaded_content = False
+
+
+class ModificationTracker:
+    """ This class tracks the modification of a SipFile and the models it
+    contains since the XML of the SipFile was saved.
+    """
+
+    __slots__ = ('cache', 'indentation', 'journaled', 'xml')
+
+    def __init__(self):
+        """ Initialise the tracker. """
+
+        self.cache = None
+        self.indentation = 0
+        self.journaled = False
+        self.xml = None
+
+    def __getstate__(self):
+        """ Reimplemented so that a copy doesn't include the cache (which is
+        keyed by the ids of the models).
+        """
+
+        return (self.indentation, self.journaled, self.xml)
+
+    def __setstate__(self, state):
+        """ Reimplemented so that a copy doesn't include the cache. """
+
+        self.cache = None
+        self.indentation, self.journaled, self.xml = state
+
+    def modified(self):
+        """ Called when the SipFile or one of its models has been modified. """
+
+        self.cache = None
+        self.journaled = False
+        self.xml = None
+
+
+class ModelList(list):
+    """ This class implements a list that is the value of an attribute of a
+    model and notifies its tracker when modified.
+    """
+
+    __slots__ = ('_owner', )
+
+    def __reduce__(self):
+        """ Reimplemented so that a copy is an ordinary list. """
+
+        return (list, (list(self), ))
+
+    def __delitem__(self, key):
+        """ Reimplemented to notify the tracker. """
+
+        super().__delitem__(key)
+        self._owner.modified()
+
+    def __iadd__(self, values):
+        """ Reimplemented to notify the tracker. """
+
+        result = super().__iadd__(values)
+        self._owner.modified()
+
+        return result
+
+    def __imul__(self, value):
+        """ Reimplemented to notify the tracker. """
+
+        result = super().__imul__(value)
+        self._owner.modified()
+
+        return result
+
+    def __setitem__(self, key, value):
+        """ Reimplemented to notify the tracker. """
+
+        super().__setitem__(key, value)
+        self._owner.modified()
+
+    def append(self, value):
+        """ Reimplemented to notify the tracker. """
+
+        super().append(value)
+        self._owner.modified()
+
+    def clear(self):
+        """ Reimplemented to notify the tracker. """
+
+        super().clear()
+        self._owner.modified()
+
+    def extend(self, values):
+        """ Reimplemented to notify the tracker. """
+
+        super().extend(values)
+        self._owner.modified()
+
+    def insert(self, index, value):
+        """ Reimplemented to notify the tracker. """
+
+        super().insert(index, value)
+        self._owner.modified()
+
+    def pop(self, *args):
+        """ Reimplemented to notify the tracker. """
+
+        value = super().pop(*args)
+        self._owner.modified()
+
+        return value
+
+    def remove(self, value):
+        """ Reimplemented to notify the tracker. """
+
+        super().remove(value)
+        self._owner.modified()
+
+    def reverse(self):
+        """ Reimplemented to notify the tracker. """
+
+        super().reverse()
+        self._owner.modified()
+
+    def sort(self, **kwargs):
+        """ Reimplemented to notify the tracker. """
+
+        super().sort(**kwargs)
+        self._owner.modified()
+
+
+def content_loaded(sip_file):
+    """ Called when the deferred content of a SipFile has been loaded. """
+
+    if _tracking_loaded_content:
+        set_journaled(sip_file)
+
+
+def get_saved_xml(sip_file, indentation):
+    """ Return the XML of a SipFile saved at a particular indentation or None
+    if the SipFile has been modified since.
+    """
+
+    tracker = getattr(sip_file, '_owner', None)
+
+    if isinstance(tracker, ModificationTracker) and tracker.indentation == indentation:
+        return tracker.xml
+
+    return None
+
+
+def get_cache(model):
+    """ Return a dict that may be used to cache anything derived from a model,
+    and any model it contains, that is discarded when the SipFile containing
+    them is modified or None if such modifications are not being tracked.
+    """
+
+    tracker = getattr(model, '_owner', None)
+
+    # Note that a model that is contained in more than one SipFile isn't
+    # cached.
+    if type(tracker) is not ModificationTracker:
+        return None
+
+    # A model isn't tracked by the SipFile that contains it until that SipFile
+    # is next saved or journaled.
+    if not _is_tracked_by(model, tracker):
+        return None
+
+    cache = tracker.cache
+    if cache is None:
+        cache = tracker.cache = {}
+
+    return cache
+
+
+def is_journaled(sip_file):
+    """ Return True if the current state of a SipFile has been recorded in a
+    journal.
+    """
+
+    tracker = getattr(sip_file, '_owner', None)
+
+    return isinstance(tracker, ModificationTracker) and tracker.journaled
+
+
+def model_setattr(model, name, value):
+    """ Set an attribute of a model and notify any tracker. """
+
+    object.__setattr__(model, name, value)
+
+    if _tracking:
+        owner = getattr(model, '_owner', None)
+        if owner is not None:
+            owner.modified()
+
+
+def register_model_class(cls):
+    """ Register a model class whose modification may be tracked. """
+
+    _model_classes.append(cls)
+    _list_names_map[cls] = tuple(
+            f.name for f in fields(cls) if f.default_factory is list)
+
+    if _tracking:
+        _track_class(cls)
+
+
+def set_journaled(sip_file):
+    """ Note that the current state of a SipFile has been recorded in a
+    journal and track any subsequent modifications.
+    """
+
+    _get_tracker(sip_file).journaled = True
+
+
+def set_saved_xml(sip_file, xml, indentation):
+    """ Set the XML of a SipFile saved at a particular indentation and track
+    any subsequent modifications.
+    """
+
+    tracker = _get_tracker(sip_file)
+
+    tracker.indentation = indentation
+    tracker.xml = xml
+
+
+def track_loaded_content():
+    """ Track the modification of the content of every SipFile as soon as it
+    is loaded.
+    """
+
+    global _tracking_loaded_content
+
+    _tracking_loaded_content = True
+
+
+class _SharedTracker:
+    """ This class notifies the trackers of each of a number of SipFiles that
+    contain the same model.
+    """
+
+    __slots__ = ('trackers', )
+
+    def __init__(self, trackers):
+        """ Initialise the tracker. """
+
+        self.trackers = trackers
+
+    def modified(self):
+        """ Called when the model has been modified. """
+
+        for tracker in self.trackers:
+            tracker.modified()
+
+
+def _get_owner(owner, tracker):
+    """ Return the owner of an object that is contained in the SipFile with a
+    tracker given its current owner.
+    """
+
+    if owner is None or owner is tracker:
+        return tracker
+
+    # The object is (or was) also contained in another SipFile.  Note that,
+    # if it is no longer contained in the other SipFile, then modifying the
+    # object will unnecessarily (but harmlessly) mark the other SipFile as
+    # modified.
+    if isinstance(owner, _SharedTracker):
+        if tracker not in owner.trackers:
+            owner.trackers.append(tracker)
+
+        return owner
+
+    return _SharedTracker([owner, tracker])
+
+
+def _get_tracker(sip_file):
+    """ Return the tracker of a SipFile after making sure that it and
+    everything it contains refer to it.
+    """
+
+    global _tracking
+
+    if not _tracking:
+        _tracking = True
+
+        for cls in _model_classes:
+            _track_class(cls)
+
+    tracker = getattr(sip_file, '_owner', None)
+    if not isinstance(tracker, ModificationTracker):
+        tracker = ModificationTracker()
+
+    _set_owner(sip_file, tracker)
+
+    return tracker
+
+
+def _is_tracked_by(model, tracker):
+    """ Return True if a model, and everything it contains, is tracked by a
+    particular tracker.
+    """
+
+    if getattr(model, '_owner', None) is not tracker:
+        return False
+
+    for name in _list_names_map[type(model)]:
+        value = getattr(model, name)
+
+        if type(value) is not ModelList or value._owner is not tracker:
+            return False
+
+        for element in value:
+            if type(element) in _list_names_map and not _is_tracked_by(element, tracker):
+                return False
+
+    return True
+
+
+def _set_owner(model, tracker):
+    """ Set the owner of a model and everything it contains. """
+
+    owner = getattr(model, '_owner', None)
+    if owner is not tracker:
+        object.__setattr__(model, '_owner', _get_owner(owner, tracker))
+
+    # Note that the only attributes that may contain other models are lists.
+    for name in _list_names_map[type(model)]:
+        value = getattr(model, name)
+
+        if type(value) is ModelList:
+            if value._owner is not tracker:
+                value._owner = _get_owner(value._owner, tracker)
+        else:
+            model_list = ModelList(value)
+            model_list._owner = tracker
+            object.__setattr__(model, name, model_list)
+
+        for element in value:
+            if type(element) in _list_names_map:
+                _set_owner(element, tracker)
+
+
+def _track_class(cls):
+    """ Track the modification of instances of a model class. """
+
+    # A class that implements its own __setattr__() is responsible for calling
+    # model_setattr().
+    if '__setattr__' not in cls.__dict__:
+        cls.__setattr__ = model_setattr
@@ -3,13 +3,14 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List
 
 from .sip_file import SipFile
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Module:
     """ This class implements a Python module. """
 
@@ -3,11 +3,10 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
-
 from .callable import Callable
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class OperatorFunction(Callable):
     """ This class implements a global C++ operator. """
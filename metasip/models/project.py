@@ -3,15 +3,16 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List, Tuple
 
 from .header_directory import HeaderDirectory
 from .module import Module
 from .project_version import ProjectVersion
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Project:
     """ This class implements a project. """
 
@@ -47,6 +48,11 @@ class Project:
     # The comments placed at the start of every generated .sip file.
     sipcomments: str = ''
 
+    # The name of the directory, relative to the project file, containing a
+    # separate file for each .sip file.  If it is empty then the .sip files are
+    # contained in the project file itself.
+    sipfilesdir: str = ''
+
     # The version number of the project format.
     version: Tuple[int] = ProjectVersion
 
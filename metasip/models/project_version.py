@@ -25,6 +25,9 @@
 
 # Project format version history:
 #
+#  0.20 Implemented by metasip v2.17.
+#       - Added 'sipfilesdir' to the 'Project' element.
+#
 #  0.19 Implemented by metasip v2.15.
 #       - Added 'typederivedcode' to the 'Class' element.
 #
@@ -55,4 +58,4 @@
 MinimumProjectVersion = (0, 15)
 
 # The latest supported project format.
-ProjectVersion = (0, 19)
+ProjectVersion = (0, 20)
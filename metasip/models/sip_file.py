@@ -3,12 +3,21 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
-from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
 
 from .code_container import CodeContainer
+from .modification_tracker import content_loaded, model_setattr
+from .slotted_dataclass import slotted_dataclass
 
 
-@dataclass
+# The attributes whose values may be loaded on demand.
+_DEFERRED_ATTRIBUTES = frozenset(('content', 'exportedheadercode',
+        'exportedtypehintcode', 'initcode', 'modulecode', 'moduleheadercode',
+        'postinitcode', 'preinitcode', 'typehintcode'))
+
+
+@slotted_dataclass
 class SipFile(CodeContainer):
     """ This class implements a .sip file. """
 
@@ -41,3 +50,60 @@ class SipFile(CodeContainer):
 
     # The optional %TypeHintCode.
     typehintcode: str = ''
+
+    # The optional object that will load the deferred content of the .sip
+    # file when it is first accessed.  It must implement a load() method that
+    # takes a new SipFile as its argument.  Only the deferred attributes of the
+    # new SipFile are then used so that the loader cannot undo changes made to
+    # any other attribute.  It may also implement a get_xml() method that
+    # returns the XML (as bytes) that the content will be loaded from and a
+    # get_saved_xml() method that takes an indentation and returns that XML
+    # as it would be saved at that indentation (or None if it would be
+    # different).  Note that this isn't part of the project file itself.
+    content_loader: Any = field(default=None, repr=False, compare=False)
+
+    def __getattribute__(self, name):
+        """ Reimplemented to load any deferred content when it is first read.
+        """
+
+        if name in _DEFERRED_ATTRIBUTES:
+            if object.__getattribute__(self, 'content_loader') is not None:
+                object.__getattribute__(self, 'load_content')()
+
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        """ Reimplemented to load any deferred content before any attribute is
+        written and to track modifications.
+        """
+
+        # Any write is a modification that must be made to the loaded content
+        # as, otherwise, the XML the content is loaded from (eg. when the .sip
+        # file is saved or journaled) will no longer describe the .sip file.
+        # Note that the loader will not have been set when called from
+        # __init__().
+        if name != 'content_loader' and getattr(self, 'content_loader', None) is not None:
+            self.load_content()
+
+        model_setattr(self, name, value)
+
+    def load_content(self):
+        """ Load any deferred content. """
+
+        loader = self.content_loader
+
+        if loader is not None:
+            self.content_loader = None
+
+            loaded = SipFile()
+
+            try:
+                loader.load(loaded)
+            except:
+                self.content_loader = loader
+                raise
+
+            for name in _DEFERRED_ATTRIBUTES:
+                setattr(self, name, getattr(loaded, name))
+
+            content_loaded(self)
@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from dataclasses import dataclass, fields
+
+from .modification_tracker import register_model_class
+
+
+def slotted_dataclass(cls):
+    """ A class decorator that is equivalent to dataclass(slots=True) (which
+    requires Python v3.10) and stores the fields of instances in slots rather
+    than an instance dictionary.  Any mixin base classes must be dataclasses
+    that define an empty __slots__.  An additional slot refers to the owner
+    that tracks the modification of an instance.
+    """
+
+    cls = dataclass(cls)
+
+    cls_dict = dict(cls.__dict__)
+
+    # The defaults of the fields are already captured by __init__() and would
+    # conflict with the slots.
+    field_names = tuple(f.name for f in fields(cls))
+
+    for name in field_names:
+        cls_dict.pop(name, None)
+
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    cls_dict['__slots__'] = field_names + ('_owner', )
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+
+    register_model_class(slotted_cls)
+
+    return slotted_cls
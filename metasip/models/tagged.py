@@ -15,6 +15,8 @@ class Tagged:
     statement).
     """
 
+    __slots__ = ()
+
     # The optional list of logically or-ed features that the API item is
     # limited to.  A feature may be preceded by "!" to indicate the logical
     # inverse.
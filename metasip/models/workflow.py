@@ -10,6 +10,8 @@ from dataclasses import dataclass
 class Workflow:
     """ This class is a mixin for APIs that are subject to a workflow. """
 
+    __slots__ = ()
+
     # The multiline comments included in generated .sip files.
     comments: str = ''
 
@@ -4,6 +4,14 @@
 
 
 from .abstract_project_ui import AbstractProjectUi
-from .generate_sip_files import generate_sip_files
+from .convert_project import convert_project
+from .generate_sip_files import (check_sip_files, generate_sip_files,
+        get_sip_files, iter_sip_files)
+from .generation_cache import GenerationCache
+from .generation_manifest import write_depfile, write_manifest
 from .load_project import load_project
+from .project_journal import ProjectJournal, replay_journal
+from .project_snapshot import ProjectSnapshot
 from .save_project import save_project
+from .sip_files_archive import write_sip_files_archive
+from .tag_resolver import TagResolver
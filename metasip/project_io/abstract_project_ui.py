@@ -8,7 +8,7 @@ from abc import ABC, abstractmethod
 
 class AbstractProjectUi(ABC):
     """ This class encapsulates the UI-related methods supporting the loading
-    of a project.
+    and saving of a project.
     """
 
     @abstractmethod
@@ -33,6 +33,22 @@ class AbstractProjectUi(ABC):
 
         ...
 
+    def save_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to taking a snapshot of the
+        project to save that will take a specific number of steps.  The
+        default implementation does nothing.
+        """
+
+        pass
+
+    def save_step(self):
+        """ Called to update the UI once the next step of taking a snapshot of
+        the project to save has been completed.  The default implementation
+        does nothing.
+        """
+
+        pass
+
     @abstractmethod
     def update_project_format(self, root_element, from_version, to_version):
         """ Called to update the project from it's current major version before
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# A project file may be compressed, in which case the name of the file has an
+# additional extension that identifies the compression format (eg. '.msp.gz').
+# A compressed file is decompressed as it is read and compressed as it is
+# written so that neither the compressed nor the decompressed contents of the
+# complete file are held in memory.
+
+
+import gzip
+import lzma
+import os
+
+
+def _gzip_reader(f):
+    """ Return a file object that decompresses gzip data from a file object.
+    """
+
+    return gzip.GzipFile(fileobj=f, mode='rb')
+
+
+def _gzip_writer(f):
+    """ Return a file object that compresses data as gzip to a file object. """
+
+    # The modification time and file name are omitted from the header so that
+    # the same project is always compressed to the same file.
+    return gzip.GzipFile(filename='', fileobj=f, mode='wb', mtime=0)
+
+
+def _xz_reader(f):
+    """ Return a file object that decompresses xz data from a file object. """
+
+    return lzma.LZMAFile(f, mode='rb', format=lzma.FORMAT_XZ)
+
+
+def _xz_writer(f):
+    """ Return a file object that compresses data as xz to a file object. """
+
+    return lzma.LZMAFile(f, mode='wb', format=lzma.FORMAT_XZ)
+
+
+# The functions that open a compressed file for reading, that create a
+# compressing file object for writing and that create a decompressing file
+# object for reading keyed by the extension.
+_COMPRESSION_FORMATS = {
+    '.gz':  (gzip.open, _gzip_writer, _gzip_reader),
+    '.xz':  (lzma.open, _xz_writer, _xz_reader),
+}
+
+
+def compressing_writer(f, file_name):
+    """ Return a file object that compresses the data written to it to a binary
+    file object according to the compression format implied by a file name, or
+    None if the file name doesn't imply compression.  Closing the returned file
+    object does not close the original.
+    """
+
+    compression_format = _get_compression_format(file_name)
+    if compression_format is None:
+        return None
+
+    return compression_format[1](f)
+
+
+def decompressing_reader(f, file_name):
+    """ Return a file object that decompresses the data read from a binary file
+    object according to the compression format implied by a file name, or None
+    if the file name doesn't imply compression.  Closing the returned file
+    object does not close the original.
+    """
+
+    compression_format = _get_compression_format(file_name)
+    if compression_format is None:
+        return None
+
+    return compression_format[2](f)
+
+
+def is_compressed(file_name):
+    """ Return True if a file name implies that the file is compressed. """
+
+    return _get_compression_format(file_name) is not None
+
+
+def open_project_file(file_name):
+    """ Return a binary file object, opened for reading, that decompresses the
+    contents of a project file if necessary.
+    """
+
+    compression_format = _get_compression_format(file_name)
+    if compression_format is None:
+        return open(file_name, 'rb')
+
+    return compression_format[0](file_name, 'rb')
+
+
+def _get_compression_format(file_name):
+    """ Return the reader and writer of the compression format implied by a
+    file name or None if the file isn't compressed.
+    """
+
+    return _COMPRESSION_FORMATS.get(os.path.splitext(file_name)[1])
+
@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from .save_project import save_project
+from .split_project import get_sip_files_dir_path, remove_sip_files
+
+
+def convert_project(project, sip_files_dir):
+    """ Convert a loaded project to a different layout and save it.  If
+    sip_files_dir is an empty string then the project file will contain the
+    .sip files.  Otherwise it is the name of the directory, relative to the
+    project file, that will contain a separate file for each .sip file.  An
+    exception is raised if there was an error.
+    """
+
+    # Make sure all content has been loaded using the current layout.
+    for module in project.modules:
+        for sip_file in module.content:
+            sip_file.load_content()
+
+    if project.sipfilesdir != '':
+        old_sip_files_dir_path = get_sip_files_dir_path(project.name,
+                project.sipfilesdir)
+    else:
+        old_sip_files_dir_path = None
+
+    project.sipfilesdir = sip_files_dir
+    save_project(project)
+
+    # Remove the files of the old layout unless they have been reused.
+    if old_sip_files_dir_path is not None:
+        if sip_files_dir == '' or get_sip_files_dir_path(project.name, sip_files_dir) != old_sip_files_dir_path:
+            remove_sip_files(old_sip_files_dir_path)
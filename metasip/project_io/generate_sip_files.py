@@ -3,138 +3,242 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
 
 from ..exceptions import UserException
 from ..helpers import VersionMap, version_range
-from ..models import Enum, Function, Variable
+from ..models import Enum, Function, Project, Variable
 from ..models.adapters import adapt
 
 from .indent_file import IndentFile
 
 
-def generate_sip_files(project, output_dir, ignored_modules, verbose):
-    """ Generate the .sip files for a project. """
+# The number of bytes of an existing .sip file that are read at a time when
+# checking that it is up to date.
+_CHUNK_SIZE = 64 * 1024
 
-    if ignored_modules is None:
-        ignored_modules = []
+# The project whose .sip files are being generated by forked processes.  Each
+# process inherits the project rather than it being passed to the process.
+_forked_project = None
 
-    for module in project.modules:
-        # See if the module should be ignored.
-        if module.name in ignored_modules:
-            if verbose:
-                print(f"Ignoring {module.name}")
 
-            continue
+def check_sip_files(project, output_dir, ignored_modules, jobs=1,
+        cache=None, tag_resolver=None):
+    """ Check that the .sip files previously generated for a project are up
+    to date without writing anything.  The .sip files are generated in memory
+    and compared with the existing files.  The remaining arguments are as for
+    iter_sip_files().  Return a 2-tuple of the sorted lists of the path names
+    of the .sip files that are missing or out of date and of the existing .sip
+    files in the module-specific output directories that would not be
+    generated.
+    """
 
-        # Create the module-specific output directory.
-        if project.version >= (0, 17):
-            module_output_dir = os.path.join(output_dir, module.name)
-        else:
-            if module.outputdirsuffix != '':
-                module_output_dir = os.path.join(output_dir, module.outputdirsuffix)
-            else:
-                module_output_dir = output_dir
+    stale = []
+    generated = set()
+
+    for file_path, text in iter_sip_files(project, ignored_modules, jobs=jobs,
+            cache=cache, tag_resolver=tag_resolver):
+        file_path = os.path.join(output_dir, file_path)
+        generated.add(file_path)
+
+        if not _file_contains(file_path, text.encode('UTF-8')):
+            stale.append(file_path)
+
+    extra = []
 
-        # Make sure the output directory exists.
+    for module_output_dir in {os.path.dirname(f) for f in generated}:
         try:
-            os.makedirs(module_output_dir)
-        except:
-            pass
+            file_names = os.listdir(module_output_dir)
+        except OSError:
+            continue
 
-        # Generate .sip files for the module contents.
-        sip_file_names = []
+        for file_name in file_names:
+            if file_name.endswith('.sip'):
+                file_path = os.path.join(module_output_dir, file_name)
+                if file_path not in generated:
+                    extra.append(file_path)
+
+    return sorted(stale), sorted(extra)
+
+
+def generate_sip_files(project, output_dir, ignored_modules, verbose, jobs=1,
+        cache=None, tag_resolver=None):
+    """ Generate the .sip files for a project.  A .sip file is only written if
+    its contents have changed so that its modification time is preserved.  If
+    jobs is greater than 1 then the .sip files are generated in parallel by
+    that number of processes.  If a GenerationCache is given then the contents
+    of .sip files are taken from it whenever possible and it is updated with
+    the contents of any .sip files that are generated.  If a TagResolver is
+    given then the tags it resolves are evaluated when the .sip files are
+    generated.  Return a 2-tuple of the number of .sip files written and the
+    number that were unchanged.
+    """
 
-        for sip_file in module.content:
-            (file_name, _) = os.path.splitext(os.path.basename(sip_file.name))
-            file_name += '.sip'
-            sip_file_names.append(file_name)
+    if verbose and ignored_modules:
+        for module in project.modules:
+            if module.name in ignored_modules:
+                print(f"Ignoring {module.name}")
 
-            output = _create_sip_file(project, module, module_output_dir,
-                    file_name, verbose)
-            _generate_sip(sip_file, project, output)
-            output.close()
+    nr_written = nr_unchanged = 0
+    output_dirs = set()
 
-        # Generate the .sip file defining the module itself.
-        output = _create_sip_file(project, module, module_output_dir,
-                module.name + 'mod.sip', verbose)
+    for file_path, text in iter_sip_files(project, ignored_modules, jobs=jobs,
+            cache=cache, tag_resolver=tag_resolver):
+        file_name = os.path.basename(file_path)
+        file_path = os.path.join(output_dir, file_path)
 
-        root_name = project.rootmodule
+        # Make sure the module-specific output directory exists.
+        module_output_dir = os.path.dirname(file_path)
+        if module_output_dir not in output_dirs:
+            try:
+                os.makedirs(module_output_dir)
+            except:
+                pass
 
-        if root_name != '':
-            root_name += "."
+            output_dirs.add(module_output_dir)
 
-        output.write('%Module(name=' + root_name + module.name)
+        if write_file_if_changed(file_path, text):
+            nr_written += 1
 
-        if module.callsuperinit != 'undefined':
-            output.write(', call_super_init=' + ('True' if module.callsuperinit == 'yes' else 'False'))
+            if verbose:
+                print(f"Generated '{file_name}'")
+        else:
+            nr_unchanged += 1
 
-        if module.virtualerrorhandler != '':
-            output.write(', default_VirtualErrorHandler=' + module.virtualerrorhandler)
+            if verbose:
+                print(f"'{file_name}' is unchanged")
 
-        if module.keywordarguments != '':
-            output.write(f', keyword_arguments="{module.keywordarguments}"')
+    return nr_written, nr_unchanged
 
-        if module.uselimitedapi:
-            output.write(', use_limited_api=True')
 
-        if module.pyssizetclean:
-            output.write(', py_ssize_t_clean=True')
+def get_generated_modules(project, ignored_modules):
+    """ Return the list of the modules of a project whose .sip files are
+    generated.
+    """
 
-        output.write(')\n\n')
+    if ignored_modules is None:
+        ignored_modules = []
 
-        top_level_module = True
+    return [module for module in project.modules
+            if module.name not in ignored_modules]
 
-        if module.imports:
-            for imported in module.imports:
-                output.write(f'%Import {imported}/{imported}mod.sip\n')
 
-                if imported not in project.externalmodules:
-                    top_level_module = False
+def get_module_output_dir(project, module, output_dir):
+    """ Return the name of the directory containing the .sip files generated
+    for a module.
+    """
 
-            output.write('\n')
+    if project.version >= (0, 17):
+        return os.path.join(output_dir, module.name)
 
-        if top_level_module:
-            # Add any version, platform and feature information to all top
-            # level modules (ie. those that don't import anything).
+    if module.outputdirsuffix != '':
+        return os.path.join(output_dir, module.outputdirsuffix)
 
-            if project.versions:
-                versions = ' '.join(project.versions)
-                output.write(f'%Timeline {{{versions}}}\n\n')
+    return output_dir
 
-            if project.platforms:
-                platforms = ' '.join(project.platforms)
-                output.write(f'%Platforms {{{platforms}}}\n\n')
 
-            if project.features:
-                for feature in project.features:
-                    output.write(f'%Feature {feature}\n')
+def get_sip_file_name(sip_file):
+    """ Return the name of the .sip file generated for a SipFile. """
 
-                output.write('\n')
+    (file_name, _) = os.path.splitext(os.path.basename(sip_file.name))
 
-        if module.directives != '':
-            output.write(module.directives)
-            output.write('\n\n')
+    return file_name + '.sip'
 
-        for file_name in sip_file_names:
-            output.write(f'%Include {file_name}\n')
 
-        output.close()
+def get_sip_files(project, ignored_modules=None, jobs=1, cache=None,
+        tag_resolver=None):
+    """ Generate the .sip files for a project in memory and return a dict of
+    their contents keyed by their path names relative to the output directory.
+    The remaining arguments are as for iter_sip_files().
+    """
 
+    return dict(iter_sip_files(project, ignored_modules, jobs=jobs,
+            cache=cache, tag_resolver=tag_resolver))
+
+
+def iter_sip_files(project, ignored_modules=None, jobs=1, cache=None,
+        tag_resolver=None):
+    """ A generator of 2-tuples of the path name, relative to the output
+    directory, and contents of each .sip file generated in memory for a
+    project.  The .sip files of each module are generated in turn and the main
+    .sip file of a module follows the .sip files it includes.  If jobs is
+    greater than 1 then the .sip files are generated in parallel by that
+    number of processes.  If a GenerationCache is given then the contents of
+    .sip files are taken from it whenever possible and it is updated with the
+    contents of any .sip files that are generated.  If a TagResolver is given
+    then the tags it resolves are evaluated when the .sip files are generated.
+    """
 
-def _create_sip_file(project, module, module_output_dir, file_name, verbose):
-    """ Create and return a boilerplate .sip file. """
+    modules = get_generated_modules(project, ignored_modules)
 
-    if verbose:
-        print(f"Generating '{file_name}'")
+    if jobs > 1:
+        global _forked_project
 
-    output = _IndentSipFile.create(os.path.join(module_output_dir, file_name))
+        # Forked processes inherit the models of the project, which is much
+        # faster than passing them to each process.
+        if 'fork' in multiprocessing.get_all_start_methods():
+            _forked_project = project
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+
+        try:
+            with ProcessPoolExecutor(max_workers=jobs,
+                    mp_context=mp_context) as executor:
+                # Submit every .sip file before handling the results of any of
+                # them so that the processes are kept busy.
+                generated = [
+                        _generate_module(project, module, tag_resolver, cache,
+                                executor, jobs)
+                        for module in modules]
+
+                yield from _iter_module_files(project, modules, generated)
+        finally:
+            _forked_project = None
+    else:
+        generated = (_generate_module(project, module, tag_resolver, cache)
+                for module in modules)
+
+        yield from _iter_module_files(project, modules, generated)
+
+    if cache is not None:
+        cache.trim()
+
+
+def write_file_if_changed(file_path, text):
+    """ Write some text to a file unless the file already contains it so that
+    its modification time is preserved.  Return True if the file was written.
+    """
+
+    # The encoded text is compared and written so that newlines are not
+    # translated and a file is only unchanged if check_sip_files() would agree.
+    data = text.encode('UTF-8')
+
+    if _file_contains(file_path, data):
+        return False
+
+    try:
+        with open(file_path, 'wb') as f:
+            f.write(data)
+    except OSError as e:
+        raise UserException(f"There was an error creating '{file_path}'",
+                detail=str(e)) from e
+
+    return True
+
+
+def _create_sip_file(project, module_name, file_name):
+    """ Create and return a boilerplate .sip file in memory. """
+
+    output = _IndentSipFile.create(None)
 
     # Add the standard header.
     output.write(
 f'''// {file_name} generated by MetaSIP
 //
-// This file is part of the {module.name} Python extension module.
+// This file is part of the {module_name} Python extension module.
 ''')
 
     if project.sipcomments:
@@ -146,6 +250,190 @@ f'''// {file_name} generated by MetaSIP
     return output
 
 
+def _file_contains(file_path, data):
+    """ Return True if a file exists and contains some data.  The comparison
+    stops at the first difference.
+    """
+
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != len(data):
+                return False
+
+            for start in range(0, len(data), _CHUNK_SIZE):
+                if f.read(_CHUNK_SIZE) != data[start:start + _CHUNK_SIZE]:
+                    return False
+    except OSError:
+        return False
+
+    return True
+
+
+def _generate_module(project, module, tag_resolver=None, cache=None,
+        executor=None, jobs=1):
+    """ Return an iterator over 2-tuples of the name and contents of each .sip
+    file of a module.  If a tag resolver is given then the tags it resolves are
+    evaluated.  If a cache is given then the contents of the .sip files
+    for the module contents are taken from it whenever possible.  If an
+    executor is given then the .sip files for the module contents that aren't
+    in the cache are generated by it using (up to) jobs processes.
+    """
+
+    sip_files = module.content
+
+    # Get the contents of any .sip files from the cache.
+    if cache is None:
+        fingerprints = cached = [None] * len(sip_files)
+    else:
+        fingerprints = [
+                cache.get_fingerprint(project, module, sip_file,
+                        tag_resolver)
+                for sip_file in sip_files]
+        cached = [None if fingerprint is None else cache.get(fingerprint)
+                for fingerprint in fingerprints]
+
+    # The indexes of the .sip files that must be generated.
+    indexes = [i for i, text in enumerate(cached) if text is None]
+
+    if executor is None:
+        generated = (
+                _generate_sip_file(project, module.name, sip_files[i],
+                        tag_resolver)
+                for i in indexes)
+    else:
+        # Note that map() submits every .sip file immediately and returns the
+        # results in the order they were submitted.
+        nr_sip_files = len(indexes)
+        chunksize = max(1, nr_sip_files // (jobs * 4))
+
+        if _forked_project is project:
+            generated = executor.map(_generate_forked_sip_file,
+                    [project.modules.index(module)] * nr_sip_files, indexes,
+                    [tag_resolver] * nr_sip_files, chunksize=chunksize)
+        else:
+            # Only pass the parts of the project that the generation of a .sip
+            # file depends on.
+            generation_project = Project(sipcomments=project.sipcomments,
+                    versions=project.versions)
+
+            generated = executor.map(_generate_sip_file,
+                    [generation_project] * nr_sip_files,
+                    [module.name] * nr_sip_files,
+                    [sip_files[i] for i in indexes],
+                    [tag_resolver] * nr_sip_files, chunksize=chunksize)
+
+    if cache is not None:
+        generated = _merge_cached(cache, sip_files, fingerprints, cached,
+                generated)
+
+    return _generate_module_files(project, module, generated)
+
+
+def _generate_forked_sip_file(module_index, sip_file_index, tag_resolver):
+    """ Return a 2-tuple of the name and contents of the .sip file for the
+    contents of a module of the project inherited by a forked process.
+    """
+
+    module = _forked_project.modules[module_index]
+
+    return _generate_sip_file(_forked_project, module.name,
+            module.content[sip_file_index], tag_resolver)
+
+
+def _generate_module_files(project, module, generated):
+    """ A generator of 2-tuples of the name and contents of each .sip file of
+    a module given an iterator over the .sip files for the module contents.
+    """
+
+    # Generate .sip files for the module contents.
+    sip_file_names = []
+
+    for file_name, text in generated:
+        sip_file_names.append(file_name)
+
+        yield file_name, text
+
+    # Generate the .sip file defining the module itself.
+    mod_file_name = module.name + 'mod.sip'
+    output = _create_sip_file(project, module.name, mod_file_name)
+
+    root_name = project.rootmodule
+
+    if root_name != '':
+        root_name += "."
+
+    output.write('%Module(name=' + root_name + module.name)
+
+    if module.callsuperinit != 'undefined':
+        output.write(', call_super_init=' + ('True' if module.callsuperinit == 'yes' else 'False'))
+
+    if module.virtualerrorhandler != '':
+        output.write(', default_VirtualErrorHandler=' + module.virtualerrorhandler)
+
+    if module.keywordarguments != '':
+        output.write(f', keyword_arguments="{module.keywordarguments}"')
+
+    if module.uselimitedapi:
+        output.write(', use_limited_api=True')
+
+    if module.pyssizetclean:
+        output.write(', py_ssize_t_clean=True')
+
+    output.write(')\n\n')
+
+    top_level_module = True
+
+    if module.imports:
+        for imported in module.imports:
+            output.write(f'%Import {imported}/{imported}mod.sip\n')
+
+            if imported not in project.externalmodules:
+                top_level_module = False
+
+        output.write('\n')
+
+    if top_level_module:
+        # Add any version, platform and feature information to all top level
+        # modules (ie. those that don't import anything).
+
+        if project.versions:
+            versions = ' '.join(project.versions)
+            output.write(f'%Timeline {{{versions}}}\n\n')
+
+        if project.platforms:
+            platforms = ' '.join(project.platforms)
+            output.write(f'%Platforms {{{platforms}}}\n\n')
+
+        if project.features:
+            for feature in project.features:
+                output.write(f'%Feature {feature}\n')
+
+            output.write('\n')
+
+    if module.directives != '':
+        output.write(module.directives)
+        output.write('\n\n')
+
+    for file_name in sip_file_names:
+        output.write(f'%Include {file_name}\n')
+
+    yield mod_file_name, output.getvalue()
+
+
+def _generate_sip_file(project, module_name, sip_file, tag_resolver=None):
+    """ Return a 2-tuple of the name and contents of the .sip file for the
+    contents of a module.  This may be run in a separate process.
+    """
+
+    file_name = get_sip_file_name(sip_file)
+
+    output = _create_sip_file(project, module_name, file_name)
+    output.tag_resolver = tag_resolver
+    _generate_sip(sip_file, project, output)
+
+    return file_name, output.getvalue()
+
+
 def _generate_sip(sip_file, project, output):
     """ Generate the contents of a .sip file. """
 
@@ -158,7 +446,7 @@ def _generate_sip(sip_file, project, output):
     need_header = False
 
     for api in sip_file.content:
-        if api.status != '':
+        if api.status != '' or not output.is_enabled(api):
             continue
 
         # Note that OperatorFunctions are handled within the class even if they
@@ -181,7 +469,7 @@ def _generate_sip(sip_file, project, output):
                 features = None
 
     if need_header:
-        vranges_str = [version_range(vr) for vr in vmap.as_version_ranges()]
+        vranges = vmap.as_version_ranges()
 
         plat_feat = []
 
@@ -191,6 +479,12 @@ def _generate_sip(sip_file, project, output):
         if features is not None:
             plat_feat.extend(features)
 
+        if output.tag_resolver is not None:
+            vranges = output.tag_resolver.resolve_versions(vranges)
+            plat_feat = output.tag_resolver.resolve_any(plat_feat)
+
+        vranges_str = [version_range(vr) for vr in vranges]
+
         for vr_str in vranges_str:
             output.write(f'%If ({vr_str})\n', indent=False)
 
@@ -213,7 +507,7 @@ f'''%ModuleCode
         output.blank()
 
     for api in sip_file.content:
-        if api.status == '':
+        if api.status == '' and output.is_enabled(api):
             adapt(api).generate_sip(sip_file, output)
 
     output.blank()
@@ -236,10 +530,50 @@ f'''%ModuleCode
             indent=False)
 
 
+def _merge_cached(cache, sip_files, fingerprints, cached, generated):
+    """ A generator of 2-tuples of the name and contents of each .sip file for
+    the contents of a module given the contents taken from a cache (or None if
+    they must be generated) and an iterator over those that were generated.
+    The cache is updated with the generated contents.
+    """
+
+    for sip_file, fingerprint, text in zip(sip_files, fingerprints, cached):
+        if text is None:
+            file_name, text = next(generated)
+
+            if fingerprint is not None:
+                cache.put(fingerprint, text)
+        else:
+            file_name = get_sip_file_name(sip_file)
+
+        yield file_name, text
+
+
+def _iter_module_files(project, modules, generated):
+    """ A generator of 2-tuples of the path name, relative to the output
+    directory, and contents of each .sip file generated for a sequence of
+    modules.
+    """
+
+    for module, module_generated in zip(modules, generated):
+        module_output_dir = get_module_output_dir(project, module, '')
+
+        for file_name, text in module_generated:
+            yield os.path.join(module_output_dir, file_name), text
+
+
 class _IndentSipFile(IndentFile):
     """ An indentation file with extra functionality for writing .sip files.
     """
 
+    # The optional resolver of the tags of the API items being written.
+    tag_resolver = None
+
+    def is_enabled(self, api):
+        """ Return True if an API item is enabled and should be written. """
+
+        return self.tag_resolver is None or self.tag_resolver.is_enabled(api)
+
     def write_code_directive(self, directive, code, indent=True):
         """ Write a code directive. """
 
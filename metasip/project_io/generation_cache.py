@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# The generation cache is a directory of files each containing the generated
+# contents of a .sip file.  The name of each file is a fingerprint of
+# everything that the contents depend on, ie. the XML of the SipFile in the
+# project file, the name of its module and the relevant project settings.  The
+# fingerprint is computed from the XML without creating the models and so the
+# contents of an unchanged .sip file are obtained without loading or
+# generating it.  This is only possible for a SipFile whose content hasn't
+# been loaded, so a project should be loaded lazily to benefit from the cache.
+# The size of the cache is bounded by removing the least recently used files.
+# The modification time of a file is used to record when it was last used.
+# The fingerprint also depends on the version of metasip and a hash of its
+# source code (so that a cache isn't reused by a different, possibly
+# uninstalled, version).
+
+
+from functools import lru_cache
+import hashlib
+import os
+
+from ..models.modification_tracker import get_saved_xml
+
+
+# The version of the cache format.  This must be incremented whenever the
+# contents of the cache are changed in an incompatible way.
+_CACHE_FORMAT_VERSION = 1
+
+# The default maximum size of the cache in bytes.
+_DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class GenerationCache:
+    """ This class implements a cache of generated .sip files. """
+
+    def __init__(self, cache_dir, max_size=_DEFAULT_MAX_SIZE):
+        """ Initialise the cache.  The cache directory is created when needed.
+        """
+
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+        self._salt = f'{_CACHE_FORMAT_VERSION}\n{_get_generator_fingerprint()}\n'.encode()
+
+        # Set once the cache has grown and so may need trimming.
+        self._grown = False
+
+    def get(self, fingerprint):
+        """ Return the cached contents of a .sip file or None if there are no
+        contents with the fingerprint.
+        """
+
+        file_name = self._get_file_name(fingerprint)
+
+        try:
+            # Newlines are not translated so that the contents are exactly as
+            # they were generated.
+            with open(file_name, encoding='UTF-8', newline='') as f:
+                text = f.read()
+
+            # Record that the file has been used.
+            os.utime(file_name)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        return text
+
+    def get_fingerprint(self, project, module, sip_file, tag_resolver=None):
+        """ Return the fingerprint of the contents of the .sip file generated
+        for a SipFile, using an optional TagResolver, or None if it can't be
+        determined without generating it.
+        """
+
+        # Get the XML of the SipFile if it is still as it was when it was
+        # loaded or saved.
+        xml = None
+
+        loader = sip_file.content_loader
+        if loader is not None:
+            get_xml = getattr(loader, 'get_xml', None)
+            if get_xml is not None:
+                xml = get_xml()
+        else:
+            for indentation in (0, 4):
+                xml = get_saved_xml(sip_file, indentation)
+                if xml is not None:
+                    xml = xml.encode('UTF-8')
+                    break
+
+        if xml is None:
+            return None
+
+        digest = hashlib.sha256(self._get_project_fingerprint(project))
+        digest.update(module.name.encode('UTF-8') + b'\n')
+
+        if tag_resolver is not None:
+            digest.update(repr(tag_resolver.settings).encode('UTF-8') + b'\n')
+
+        digest.update(xml)
+
+        return digest.hexdigest()
+
+    def put(self, fingerprint, text):
+        """ Add the contents of a .sip file with a fingerprint.  Any errors are
+        ignored.
+        """
+
+        file_name = self._get_file_name(fingerprint)
+        tmp_name = file_name + '.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+
+            with open(tmp_name, 'w', encoding='UTF-8', newline='') as f:
+                f.write(text)
+
+            os.replace(tmp_name, file_name)
+            self._grown = True
+        except OSError:
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+
+    def trim(self):
+        """ Remove the least recently used files until the size of the cache is
+        no larger than its maximum size.  Nothing is done if nothing has been
+        added to the cache.  Any errors are ignored.
+        """
+
+        if not self._grown:
+            return
+
+        self._grown = False
+
+        entries = []
+        size = 0
+
+        for dir_path, _, file_names in os.walk(self._cache_dir):
+            for file_name in file_names:
+                file_name = os.path.join(dir_path, file_name)
+
+                try:
+                    st = os.stat(file_name)
+                except OSError:
+                    continue
+
+                entries.append((st.st_mtime_ns, st.st_size, file_name))
+                size += st.st_size
+
+        if size <= self._max_size:
+            return
+
+        entries.sort()
+
+        for _, file_size, file_name in entries:
+            try:
+                os.remove(file_name)
+            except OSError:
+                continue
+
+            size -= file_size
+            if size <= self._max_size:
+                break
+
+    def _get_file_name(self, fingerprint):
+        """ Return the name of the file containing the contents of a .sip file
+        with a fingerprint.
+        """
+
+        # Spread the files over a number of sub-directories.
+        return os.path.join(self._cache_dir, fingerprint[:2], fingerprint)
+
+    def _get_project_fingerprint(self, project):
+        """ Return the part of a fingerprint that depends on the project
+        settings.
+        """
+
+        settings = (project.version, project.rootmodule, project.sipcomments,
+                project.versions, project.platforms, project.features)
+
+        return self._salt + repr(settings).encode('UTF-8') + b'\n'
+
+
+@lru_cache(maxsize=1)
+def _get_generator_fingerprint():
+    """ Return a fingerprint of the version and source code of metasip that
+    generated contents depend on.
+    """
+
+    # The version module is created when metasip is built.
+    try:
+        from .._version import version
+    except ImportError:
+        version = ''
+
+    digest = hashlib.sha256(version.encode('UTF-8') + b'\n')
+
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for dir_path, dir_names, file_names in os.walk(package_dir):
+        # The GUI doesn't affect the generated contents.  Note that the
+        # directories are sorted so that the order they are walked is fixed.
+        dir_names[:] = sorted(
+                d for d in dir_names if d not in ('__pycache__', 'gui'))
+
+        for file_name in sorted(file_names):
+            if not file_name.endswith('.py'):
+                continue
+
+            file_path = os.path.join(dir_path, file_name)
+
+            try:
+                with open(file_path, 'rb') as f:
+                    source = f.read()
+            except OSError:
+                continue
+
+            digest.update(os.path.relpath(file_path, package_dir).encode('UTF-8') + b'\n')
+            digest.update(source)
+
+    return digest.hexdigest()
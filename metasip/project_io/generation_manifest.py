@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# A build system that runs msipgen needs to know which files it reads and
+# which .sip files it generates so that it can decide if msipgen needs to be
+# run at all and what needs rebuilding afterwards.  This is described either
+# by a depfile, ie. a Makefile rule as understood by make, ninja and CMake, or
+# by a more detailed JSON manifest that also describes the %Include and
+# %Import graph of each module.  The names of the generated .sip files only
+# depend on the structure of the project and so neither requires the content
+# of any .sip file to be loaded.  Like the .sip files themselves, they are
+# only written if their contents have changed.
+
+
+import json
+import os
+
+from .generate_sip_files import (get_generated_modules, get_module_output_dir,
+        get_sip_file_name, write_file_if_changed)
+from .split_project import get_sip_file_path
+
+
+def write_depfile(project, output_dir, ignored_modules, depfile):
+    """ Write a depfile that makes every .sip file generated for a project
+    depend on the files the project is loaded from.  Return True if the
+    depfile was written.
+    """
+
+    outputs = []
+
+    for module in get_generated_modules(project, ignored_modules):
+        outputs.extend(_get_module_outputs(project, module, output_dir))
+
+    targets = ' '.join([_escape_make(o) for o in outputs])
+    prerequisites = ' \\\n    '.join(
+            [_escape_make(i) for i in _get_inputs(project)])
+
+    return write_file_if_changed(depfile,
+            f'{targets}: \\\n    {prerequisites}\n')
+
+
+def write_manifest(project, output_dir, ignored_modules, manifest):
+    """ Write a JSON manifest of the files read and generated for a project
+    and of the %Include and %Import graph of each module.  Return True if the
+    manifest was written.
+    """
+
+    modules = get_generated_modules(project, ignored_modules)
+
+    module_outputs = [_get_module_outputs(project, module, output_dir)
+            for module in modules]
+
+    # The names of the main .sip files of the modules being generated so that
+    # imports of them can be resolved.
+    mod_files = {module.name: outputs[-1]
+            for module, outputs in zip(modules, module_outputs)}
+
+    module_manifests = []
+    all_outputs = []
+
+    for module, outputs in zip(modules, module_outputs):
+        all_outputs.extend(outputs)
+
+        imports = []
+        for imported in module.imports:
+            # An import of a module that isn't generated (eg. an external
+            # module) can't be resolved to a file.
+            imports.append({
+                'module': imported,
+                'file': mod_files.get(imported)})
+
+        module_manifests.append({
+            'name': module.name,
+            'output_dir': get_module_output_dir(project, module,
+                    output_dir),
+            'mod_file': outputs[-1],
+            'includes': outputs[:-1],
+            'imports': imports})
+
+    text = json.dumps({
+            'project': project.name,
+            'inputs': _get_inputs(project),
+            'output_dir': output_dir,
+            'modules': module_manifests,
+            'outputs': all_outputs}, indent=2)
+
+    return write_file_if_changed(manifest, text + '\n')
+
+
+def _escape_make(file_name):
+    """ Return a file name escaped for use in a Makefile rule. """
+
+    return file_name.replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
+
+
+def _get_inputs(project):
+    """ Return the list of the names of the files a project is loaded from.
+    """
+
+    inputs = [project.name]
+
+    if project.sipfilesdir != '':
+        for module in project.modules:
+            for sip_file in module.content:
+                inputs.append(get_sip_file_path(project, module, sip_file))
+
+    return inputs
+
+
+def _get_module_outputs(project, module, output_dir):
+    """ Return the list of the names of the .sip files generated for a module.
+    The main .sip file of the module is last and %Includes the others in
+    order.
+    """
+
+    module_output_dir = get_module_output_dir(project, module, output_dir)
+
+    outputs = [os.path.join(module_output_dir, get_sip_file_name(sip_file))
+            for sip_file in module.content]
+    outputs.append(os.path.join(module_output_dir, module.name + 'mod.sip'))
+
+    return outputs
@@ -8,14 +8,31 @@ from ..exceptions import UserException
 
 class IndentFile:
     """ This is a thin wrapper around a file object that supports indentation.
+    Output is accumulated in memory and written to the file in large blocks.
     """
 
+    # The number of pieces of output accumulated before they are written to the
+    # file as a single block.
+    _BLOCK_SIZE = 8192
+
     def __init__(self, file_name, indent):
-        """ Create a file for writing. """
+        """ Create a file for writing.  If the file name is None then the file
+        is created in memory.
+        """
+
+        if file_name is None:
+            self._f = None
+        else:
+            self._f = open(file_name, 'w', encoding='UTF-8')
+
+        self._blocks = []
+        self._capture_start = None
 
-        self._f = open(file_name, 'w', encoding='UTF-8')
         self._indent = indent
         self._nr_indents = 0
+        self._prefixes = ['']
+        self._prefix = ''
+        self._newline_prefix = '\n'
         self._indent_next = True
         self._blank = False
         self._suppress_blank = False
@@ -26,6 +43,7 @@ class IndentFile:
         """ Increase the indentation. """
 
         self._nr_indents += by
+        self._update_prefix()
         self._suppress_blank = True
 
         return self
@@ -34,11 +52,19 @@ class IndentFile:
         """ Decrease the indentation. """
 
         self._nr_indents -= by
+        self._update_prefix()
         self._blank = False
         self._suppress_blank = False
 
         return self
 
+    def begin_capture(self):
+        """ Start capturing the output so that it can be written again later
+        at the same indentation.  The output must be at the start of a line.
+        """
+
+        self._capture_start = len(self._blocks)
+
     def blank(self):
         """ Write a blank line. """
 
@@ -48,7 +74,9 @@ class IndentFile:
     def close(self):
         """ Close the file. """
 
-        self._f.close()
+        if self._f is not None:
+            self._flush()
+            self._f.close()
 
     @classmethod
     def create(cls, file_name, indent=4):
@@ -61,33 +89,78 @@ class IndentFile:
             raise UserException(f"There was an error creating '{file_name}'",
                     detail=str(e)) from e
 
+    def end_capture(self):
+        """ Stop capturing the output and return it. """
+
+        start = self._capture_start
+        self._capture_start = None
+
+        captured = ''.join(self._blocks[start:])
+        self._blocks[start:] = [captured]
+
+        return captured
+
+    def getvalue(self):
+        """ Return the contents of a file created in memory. """
+
+        return ''.join(self._blocks)
+
+    @property
+    def indentation(self):
+        """ The current indentation as a number of spaces. """
+
+        return len(self._prefix)
+
     def write(self, data, indent=True):
         """ Write data to the file with optional automatic indentation. """
 
         if data:
+            blocks = self._blocks
+
             if self._blank:
-                self._f.write('\n')
+                blocks.append('\n')
                 self._blank = False
 
-            lines = data.split('\n')
+            if indent and self._prefix:
+                prefix = self._prefix
 
-            for l in lines[:-1]:
-                if indent and self._indent_next:
-                    self._f.write(' ' * (self._indent * self._nr_indents))
+                # Indent the start of every line, including any empty lines,
+                # but not the start of the line that follows a trailing
+                # newline.
+                if '\n' in data:
+                    ends_line = (data[-1] == '\n')
 
-                self._f.write(l + '\n')
-                self._indent_next = True
+                    data = data.replace('\n', self._newline_prefix)
 
-            # Handle the last line.
-            l = lines[-1]
+                    if ends_line:
+                        data = data[:-len(prefix)]
 
-            if l:
-                if indent and self._indent_next:
-                    self._f.write(' ' * (self._indent * self._nr_indents))
-
-                self._f.write(l)
-                self._indent_next = False
-            else:
-                self._indent_next = True
+                if self._indent_next:
+                    data = prefix + data
 
+            # A trailing newline means the next data starts a new line.
+            self._indent_next = (data[-1] == '\n')
             self._suppress_blank = False
+
+            blocks.append(data)
+
+            if len(blocks) >= self._BLOCK_SIZE and self._f is not None and self._capture_start is None:
+                self._flush()
+
+    def _flush(self):
+        """ Write any accumulated output to the file. """
+
+        self._f.write(''.join(self._blocks))
+        self._blocks = []
+
+    def _update_prefix(self):
+        """ Update the indentation prefix from the table of prefixes. """
+
+        nr_indents = self._nr_indents
+        prefixes = self._prefixes
+
+        while len(prefixes) <= nr_indents:
+            prefixes.append(' ' * (self._indent * len(prefixes)))
+
+        self._prefix = prefixes[nr_indents] if nr_indents >= 0 else ''
+        self._newline_prefix = '\n' + self._prefix
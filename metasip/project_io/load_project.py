@@ -3,24 +3,123 @@
 # Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
 
 
+from concurrent.futures import ProcessPoolExecutor
+import os
 from xml.etree import ElementTree
 
 from ..exceptions import UserException
-from ..models import MinimumProjectVersion, ProjectVersion
+from ..models import (HeaderDirectory, MinimumProjectVersion, Module, Project,
+        SipFile, ProjectVersion)
 from ..models.adapters import adapt
 
+from .compression import (decompressing_reader, is_compressed,
+        open_project_file)
+from .project_cache import (project_file_signature, read_project_cache,
+        write_project_cache)
+from .split_project import get_sip_files_dir, load_sip_files
 
-def load_project(project, ui=None):
+
+def load_project(project, ui=None, streaming=True, cache=False, jobs=1,
+        lazy=False):
     """ Populate a project from its project file.  Return True if the user
-    didn't cancel.
+    didn't cancel.  If streaming is set then the models are created as the
+    project file is parsed so that the complete element tree is never held in
+    memory.  If cache is set then the project is populated from a cache file
+    alongside the project file if it is up to date, otherwise the cache file
+    is created once the project file has been loaded.  If jobs is greater than
+    1 then the modules are loaded in parallel by that number of processes.  If
+    lazy is set then the content of each .sip file is only loaded when it is
+    first accessed.  A project with a split layout (where the content of each
+    .sip file is in a separate file) is always loaded from a complete element
+    tree and its modules are not loaded in parallel.
     """
 
+    if cache:
+        signature = project_file_signature(project)
+
+        if read_project_cache(project, signature):
+            if project.version != ProjectVersion and ui is not None:
+                ui.warn_minor_version_update(project.version, ProjectVersion)
+
+            return True
+
+        loaded = load_project(project, ui=ui, streaming=streaming, jobs=jobs,
+                lazy=lazy)
+
+        # Only cache a project that hasn't been changed by the load or that
+        # was changed while being loaded.
+        if loaded and not project.dirty and project_file_signature(project) == signature:
+            write_project_cache(project, signature)
+
+        return loaded
+
+    if get_sip_files_dir(project.name) != '':
+        # The project file of a project with a split layout is small and the
+        # .sip files are loaded once it has been loaded.
+        loaded = None
+    elif lazy and not is_compressed(project.name):
+        # The content of a .sip file can't be read from a compressed project
+        # file without decompressing everything before it.
+        loaded = _load_lazy(project, ui)
+    elif jobs > 1:
+        loaded = _load_parallel(project, ui, jobs)
+    elif streaming:
+        loaded = _load_streaming(project, ui)
+    else:
+        loaded = None
+
+    if loaded is not None:
+        return loaded
+
     # Load the file.
-    tree = ElementTree.parse(project.name)
+    with open_project_file(project.name) as f:
+        tree = ElementTree.parse(f)
 
     # Do some basic sanity checks.
     root = tree.getroot()
 
+    version = _check_version(project, root)
+
+    # See if user input is required.
+    if version[0] != ProjectVersion[0]:
+        if ui is None:
+            raise UserException(
+                    f"{project.name} was created with an earlier version of metasip and must be updated using the GUI")
+
+        if not ui.update_project_format(root, version, ProjectVersion):
+            return False
+
+        project.dirty = True
+
+    elif version[1] != ProjectVersion[1]:
+        if ui is not None:
+            ui.warn_minor_version_update(version, ProjectVersion)
+
+        project.version = version
+
+    # Populate the project.
+    adapt(project).load(root, project, ui)
+
+    if project.sipfilesdir != '':
+        load_sip_files(project, lazy)
+
+    return True
+
+
+def _as_int(s):
+    """ Return an int from a string or -1 if the string is invalid. """
+
+    try:
+        return int(s)
+    except ValueError:
+        return -1
+
+
+def _check_version(project, root):
+    """ Check that the root element of a project is valid and return the
+    version of the project format.
+    """
+
     major_version = root.get('majorversion')
     minor_version = root.get('minorversion')
 
@@ -46,33 +145,380 @@ def load_project(project, ui=None):
         raise UserException(
                 f"{project.name} was created with a later version of metasip")
 
-    # See if user input is required.
-    if version[0] != ProjectVersion[0]:
-        if ui is None:
-            raise UserException(
-                    f"{project.name} was created with an earlier version of metasip and must be updated using the GUI")
+    return version
 
-        if not ui.update_project_format(root, version, ProjectVersion):
-            return False
 
-        project.dirty = True
+def _check_format(project, root, ui):
+    """ Check the format of a project and handle any update of the minor
+    version.  Return False if the major version must be updated, which needs
+    the complete element tree.
+    """
 
-    elif version[1] != ProjectVersion[1]:
+    version = _check_version(project, root)
+
+    if version[0] != ProjectVersion[0]:
+        return False
+
+    if version[1] != ProjectVersion[1]:
         if ui is not None:
             ui.warn_minor_version_update(version, ProjectVersion)
 
         project.version = version
 
-    # Populate the project.
-    adapt(project).load(root, project, ui)
+    return True
+
+
+def _load_streaming(project, ui):
+    """ Populate a project by parsing its project file incrementally.  Each
+    SipFile, Module and HeaderDirectory model is created as its element is
+    closed and the element is then discarded.  Return True if the user didn't
+    cancel or None if the project must be loaded from a complete element tree.
+    """
+
+    root = None
+    module = None
+    module_element = None
+    depth = 0
+
+    with _ProgressFile(project.name) as f:
+        for event, element in ElementTree.iterparse(f,
+                events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+
+                if depth == 1:
+                    root = element
+
+                    if not _check_format(project, root, ui):
+                        return None
+
+                    # Each block of the project file is a step of the load
+                    # (rather than each .sip file) so that the file doesn't
+                    # have to be read, and possibly decompressed, twice.
+                    if ui is not None:
+                        ui.load_starting(project, f.nr_steps)
+                        f.ui = ui
+
+                elif depth == 2 and element.tag == 'Module':
+                    module = Module()
+                    module_element = element
+
+                continue
+
+            depth -= 1
+
+            if depth == 2 and element.tag == 'SipFile' and module is not None:
+                # The UI isn't passed as the progress is reported as the file
+                # is read.
+                sip_file = SipFile()
+                adapt(sip_file).load(element, project, None)
+                module.content.append(sip_file)
+
+                module_element.remove(element)
+
+            elif depth == 1 and element.tag == 'Module':
+                # The remaining subelements are the Module's own literals.
+                adapt(module).load(element, project, ui)
+                project.modules.append(module)
+
+                module = None
+                module_element = None
+                root.remove(element)
+
+            elif depth == 1 and element.tag == 'HeaderDirectory':
+                header_directory = HeaderDirectory()
+                adapt(header_directory).load(element, project, ui)
+                project.headers.append(header_directory)
+
+                root.remove(element)
+
+    # The remaining subelements are the Project's own literals.  The UI isn't
+    # passed as the load has already been started.
+    adapt(project).load(root, project, None)
 
     return True
 
 
-def _as_int(s):
-    """ Return an int from a string or -1 if the string is invalid. """
+def _load_module(module_xml, project_version):
+    """ Return a Module model loaded from the XML of its element.  This is run
+    in a separate process.
+    """
 
-    try:
-        return int(s)
-    except ValueError:
-        return -1
+    # Loading a module only depends on the version of the project format.
+    project = Project(version=project_version)
+
+    module = Module()
+    adapt(module).load(ElementTree.fromstring(module_xml), project, None)
+
+    return module
+
+
+def _load_parallel(project, ui, jobs):
+    """ Populate a project by loading each of its modules in a separate
+    process.  Return True if the user didn't cancel or None if the project
+    must be loaded from a complete element tree.
+    """
+
+    with open_project_file(project.name) as f:
+        project_xml = f.read()
+
+    # Split the project file at the module boundaries.  Note that a '<' in
+    # literal text is always escaped so the tags can be found without parsing.
+    module_spans = []
+    skeleton_parts = []
+    skeleton_start = 0
+
+    start = project_xml.find(b'<Module ')
+
+    while start >= 0:
+        end = project_xml.index(b'</Module>', start) + len(b'</Module>')
+        module_spans.append((start, end))
+        skeleton_parts.append(project_xml[skeleton_start:start])
+        skeleton_start = end
+
+        start = project_xml.find(b'<Module ', end)
+
+    skeleton_parts.append(project_xml[skeleton_start:])
+
+    # Load everything except the modules.
+    root = ElementTree.fromstring(b''.join(skeleton_parts))
+
+    if not _check_format(project, root, ui):
+        return None
+
+    # Each .sip file is a step of the load.
+    if ui is not None:
+        ui.load_starting(project, project_xml.count(b'<SipFile '))
+
+    # The UI isn't passed as the load has already been started.
+    adapt(project).load(root, project, None)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+                executor.submit(_load_module, project_xml[start:end],
+                        project.version)
+                for start, end in module_spans]
+
+        # Add the modules in the order they appear in the project file.
+        for future, (start, _) in zip(futures, module_spans):
+            try:
+                module = future.result()
+            except ElementTree.ParseError as e:
+                raise _relocate_parse_error(e, project_xml, start) from None
+
+            project.modules.append(module)
+
+            if ui is not None:
+                for _ in module.content:
+                    ui.load_step()
+
+    return True
+
+
+def _relocate_parse_error(e, xml, offset):
+    """ Return a copy of an exception raised when parsing the part of some XML
+    at a given offset with its position relative to the start of the XML.
+    """
+
+    line, column = e.position
+
+    if line == 1:
+        column += offset - (xml.rfind(b'\n', 0, offset) + 1)
+
+    line += xml.count(b'\n', 0, offset)
+
+    # Replace the position at the end of the message.
+    message = str(e).rsplit(': line ', maxsplit=1)[0]
+
+    relocated = ElementTree.ParseError(
+            f'{message}: line {line}, column {column}')
+    relocated.code = e.code
+    relocated.position = (line, column)
+
+    return relocated
+
+
+class _ProgressFile:
+    """ This class is a binary file object that reads a project file,
+    decompressing it if necessary, and reports the progress of reading the
+    file to any user interface a block at a time.
+    """
+
+    # The size of a block of the project file.  Note that, for a compressed
+    # file, this is the size of the compressed data.
+    _BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, file_name):
+        """ Open the project file. """
+
+        self._f = open(file_name, 'rb')
+        self._reader = decompressing_reader(self._f, file_name)
+        if self._reader is None:
+            self._reader = self._f
+
+        file_size = os.fstat(self._f.fileno()).st_size
+        self.nr_steps = file_size // self._BLOCK_SIZE + 1
+        self._nr_steps_done = 0
+
+        # Progress is only reported once a user interface is set.
+        self.ui = None
+
+    def __enter__(self):
+        """ Enter a context. """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Exit a context and close the file. """
+
+        if self._reader is not self._f:
+            self._reader.close()
+
+        self._f.close()
+
+    def read(self, size=-1):
+        """ Read and return data from the project file. """
+
+        data = self._reader.read(size)
+
+        if self.ui is not None:
+            if data:
+                nr_steps_done = self._f.tell() // self._BLOCK_SIZE
+            else:
+                nr_steps_done = self.nr_steps
+
+            while self._nr_steps_done < nr_steps_done:
+                self.ui.load_step()
+                self._nr_steps_done += 1
+
+        return data
+
+
+class _SipFileLoader:
+    """ This class loads the deferred content of a SipFile from the project
+    file.
+    """
+
+    def __init__(self, project, project_stat, start, end, indentation):
+        """ Initialise the loader with the location of the SipFile element in
+        the project file and its indentation (or None if it isn't at the start
+        of a line).
+        """
+
+        self._project_name = project.name
+        self._project_version = project.version
+        self._project_stat = project_stat
+        self._start = start
+        self._end = end
+        self._indentation = indentation
+
+        # The XML once it has to be kept.
+        self._xml = None
+
+    def get_saved_xml(self, indentation):
+        """ Return the XML of the SipFile element as it would be saved at a
+        particular indentation or None if it would be different.  The XML is
+        then kept so that the project file may be overwritten.
+        """
+
+        if self._project_version != ProjectVersion or self._indentation != indentation:
+            return None
+
+        self._xml = self.get_xml()
+
+        return ' ' * indentation + self._xml.decode('UTF-8') + '\n'
+
+    def get_xml(self):
+        """ Return the XML of the SipFile element. """
+
+        if self._xml is not None:
+            return self._xml
+
+        with open(self._project_name, 'rb') as f:
+            if _file_stat(f) != self._project_stat:
+                raise UserException(
+                        f"{self._project_name} has been changed since it was loaded")
+
+            f.seek(self._start)
+
+            return f.read(self._end - self._start)
+
+    def load(self, sip_file):
+        """ Load the content of a SipFile. """
+
+        element = ElementTree.fromstring(self.get_xml())
+
+        # Loading a .sip file only depends on the version of the project
+        # format.
+        project = Project(name=self._project_name,
+                version=self._project_version)
+
+        adapt(sip_file).load(element, project, None)
+
+
+def _file_stat(f):
+    """ Return the size and modification time of an open file. """
+
+    st = os.fstat(f.fileno())
+
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _load_lazy(project, ui):
+    """ Populate a project without loading the content of any .sip files.
+    Return True if the user didn't cancel or None if the project must be loaded
+    from a complete element tree.
+    """
+
+    with open(project.name, 'rb') as f:
+        project_stat = _file_stat(f)
+        project_xml = f.read()
+
+    # Replace the subtree of each SipFile with an empty element.  Note that a
+    # '<' in literal text is always escaped so the tags can be found without
+    # parsing.
+    sip_file_spans = []
+    skeleton_parts = []
+    skeleton_start = 0
+
+    start = project_xml.find(b'<SipFile ')
+
+    while start >= 0:
+        end = project_xml.index(b'</SipFile>', start) + len(b'</SipFile>')
+
+        line_start = project_xml.rfind(b'\n', 0, start) + 1
+        if project_xml[line_start:start].strip(b' ') == b'':
+            indentation = start - line_start
+        else:
+            indentation = None
+
+        sip_file_spans.append((start, end, indentation))
+
+        start_tag_end = project_xml.index(b'>', start) + 1
+        skeleton_parts.append(project_xml[skeleton_start:start_tag_end])
+        skeleton_parts.append(b'</SipFile>')
+        skeleton_start = end
+
+        start = project_xml.find(b'<SipFile ', end)
+
+    skeleton_parts.append(project_xml[skeleton_start:])
+
+    del project_xml
+
+    root = ElementTree.fromstring(b''.join(skeleton_parts))
+
+    if not _check_format(project, root, ui):
+        return None
+
+    adapt(project).load(root, project, ui)
+
+    # The SipFile models are in the same order as the elements.
+    sip_file_spans = iter(sip_file_spans)
+
+    for module in project.modules:
+        for sip_file in module.content:
+            start, end, indentation = next(sip_file_spans)
+            sip_file.content_loader = _SipFileLoader(project, project_stat,
+                    start, end, indentation)
+
+    return True
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from dataclasses import fields
+import hashlib
+import os
+import pickle
+
+from ..models import ProjectVersion
+
+from .split_project import get_sip_files_dir, get_sip_files_dir_path
+
+
+# The version of the cache format.  This must be incremented whenever a model
+# is changed in a way that affects pickling.
+_CACHE_FORMAT_VERSION = 3
+
+# The magic bytes at the start of every cache file.
+_CACHE_MAGIC = b'metasip-cache\n'
+
+# The project fields that are not part of the project file.
+_TRANSIENT_FIELDS = ('name', 'dirty')
+
+
+def project_cache_name(project):
+    """ Return the name of the cache file of a project. """
+
+    return project.name + '.cache'
+
+
+def project_file_signature(project):
+    """ Return an object that identifies the current contents of a project
+    file and, for a project with a split layout, the files containing its .sip
+    files.
+    """
+
+    st = os.stat(project.name)
+
+    digest = hashlib.sha256()
+
+    with open(project.name, 'rb') as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+
+            digest.update(chunk)
+
+    sip_files = []
+
+    sip_files_dir = get_sip_files_dir(project.name)
+    if sip_files_dir != '':
+        sip_files_dir_path = get_sip_files_dir_path(project.name,
+                sip_files_dir)
+
+        for dir_path, _, file_names in os.walk(sip_files_dir_path):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                sip_file_st = os.stat(file_path)
+                sip_files.append((file_path, sip_file_st.st_size,
+                        sip_file_st.st_mtime_ns))
+
+        sip_files.sort()
+
+    return (st.st_size, st.st_mtime_ns, digest.hexdigest(), sip_files)
+
+
+def read_project_cache(project, signature):
+    """ Populate a project from its cache file and return True if the cache was
+    valid for the project file with the given signature.
+    """
+
+    try:
+        with open(project_cache_name(project), 'rb') as f:
+            if f.read(len(_CACHE_MAGIC)) != _CACHE_MAGIC:
+                return False
+
+            # Check the header before unpickling the (much larger) state.
+            if pickle.load(f) != _cache_header(signature):
+                return False
+
+            state = pickle.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception:
+        # Any other problem means the cache is corrupt and will be replaced.
+        return False
+
+    for name, value in state.items():
+        setattr(project, name, value)
+
+    return True
+
+
+def write_project_cache(project, signature):
+    """ Write the cache file of a project loaded from a project file with the
+    given signature.  Any errors are ignored.
+    """
+
+    state = {f.name: getattr(project, f.name)
+            for f in fields(project) if f.name not in _TRANSIENT_FIELDS}
+
+    cache_name = project_cache_name(project)
+    tmp_name = cache_name + '.tmp'
+
+    try:
+        with open(tmp_name, 'wb') as f:
+            f.write(_CACHE_MAGIC)
+            pickle.dump(_cache_header(signature), f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_name, cache_name)
+    except OSError:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+
+
+def _cache_header(signature):
+    """ Return the header of a cache file that must match exactly for the
+    cache to be valid.
+    """
+
+    return (_CACHE_FORMAT_VERSION, ProjectVersion, signature)
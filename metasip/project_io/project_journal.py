@@ -0,0 +1,439 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# The journal of a project is a file, next to the project file, that records
+# the changes made to the project since it was last saved so that they can be
+# recovered after a crash.  The journal is only ever appended to.  Each record
+# is the complete XML of either a .sip file that has been modified or, if the
+# project's own attributes, header directories or modules have been modified,
+# the project with references to its .sip files.  A .sip file is identified by
+# the names of its module and itself.  Whenever either of those names changes
+# the .sip file is recorded again so that, when the journal is replayed, a .sip
+# file is either recorded in the journal or is unchanged in the saved project.
+# Because each record is a complete state rather than a change, replaying a
+# journal more than once, or over a project that was saved after some of the
+# records were made, has the same result.
+
+
+import os
+from dataclasses import fields
+from xml.etree import ElementTree
+
+from ..exceptions import UserException
+from ..models import Project, SipFile
+from ..models.adapters import adapt
+from ..models.modification_tracker import (is_journaled, set_journaled,
+        track_loaded_content)
+
+from .indent_file import IndentFile
+
+
+# The first line of a journal.
+_JOURNAL_HEADER = b'metasip-journal 1\n'
+
+# The extension of a journal added to the name of the project file.
+_JOURNAL_EXTENSION = '.journal'
+
+# The kinds of record.
+_PROJECT_RECORD = b'Project'
+_SIP_FILE_RECORD = b'SipFile'
+
+# The attributes of a project that are not part of a project record.
+_UNRECORDED_ATTRIBUTES = ('dirty', 'name', 'version')
+
+
+def get_journal_name(project_name):
+    """ Return the name of the journal of a project. """
+
+    return project_name + _JOURNAL_EXTENSION
+
+
+def replay_journal(project):
+    """ Replay any journal of a project over the project as it was last saved.
+    Return True if the project was changed.  An exception is raised if there
+    was an error.
+    """
+
+    journal_name = get_journal_name(project.name)
+
+    journal = _read_journal(journal_name)
+    if journal is None:
+        return False
+
+    records, _ = journal
+    if len(records) == 0:
+        return False
+
+    # Only the latest record of the project and of each .sip file is needed.
+    project_element = None
+    sip_file_elements = {}
+
+    for kind, payload in records:
+        if kind == _PROJECT_RECORD:
+            project_element = _parse_record(payload, journal_name)
+        else:
+            module_name, _, xml = payload.partition(b'\n')
+            element = _parse_record(xml, journal_name)
+            sip_file_elements[(module_name.decode('UTF-8'), element.get('name', ''))] = element
+
+    # The .sip files of the project as it was last saved.
+    saved_sip_files = {}
+    for module in project.modules:
+        for sip_file in module.content:
+            saved_sip_files[(module.name, sip_file.name)] = sip_file
+
+    if project_element is None:
+        # Only the content of .sip files has changed.  The replacements are
+        # made once all of them have been loaded so that the project is
+        # unchanged if there is an error.
+        replacements = []
+
+        for module in project.modules:
+            for i, sip_file in enumerate(module.content):
+                element = sip_file_elements.get((module.name, sip_file.name))
+                if element is not None:
+                    replacements.append(
+                            (module.content, i, _load_sip_file(element)))
+
+        for content, i, sip_file in replacements:
+            content[i] = sip_file
+
+        return True
+
+    # The journal is applied to a new project so that the existing project is
+    # unchanged if there is an error.  Note that records are always made using
+    # the current project format.
+    replayed = Project(name=project.name)
+    adapt(replayed).load(project_element, replayed, None)
+
+    for module in replayed.modules:
+        for i, sip_file in enumerate(module.content):
+            key = (module.name, sip_file.name)
+
+            element = sip_file_elements.get(key)
+            if element is not None:
+                sip_file = _load_sip_file(element)
+            else:
+                sip_file = saved_sip_files.get(key)
+                if sip_file is None:
+                    raise UserException(
+                            f"The journal '{journal_name}' is invalid",
+                            detail=f"There is no content for '{key[1]}' in the '{key[0]}' module.")
+
+            module.content[i] = sip_file
+
+    for f in fields(Project):
+        if f.name not in _UNRECORDED_ATTRIBUTES:
+            setattr(project, f.name, getattr(replayed, f.name))
+
+    return True
+
+
+class ProjectJournal:
+    """ This class implements the journal of a project.  It is assumed that any
+    existing journal has already been replayed.
+    """
+
+    def __init__(self, project):
+        """ Initialise the journal. """
+
+        self._project = project
+        self._journal_name = get_journal_name(project.name)
+        self._file = None
+        self._size = 0
+
+        # Make sure that the content of .sip files loaded from now on is
+        # tracked so that it is known when it has been modified.
+        track_loaded_content()
+
+        # Continue any existing journal.
+        if os.path.isfile(self._journal_name):
+            self._open()
+
+        self._reset()
+
+    def close(self):
+        """ Close the journal.  Any journal file is left so that it may be
+        replayed.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """ Discard the journal because the current state of the project has
+        been saved or its changes are not wanted.
+        """
+
+        self.close()
+        _remove_file(self._journal_name)
+
+        self._journal_name = get_journal_name(self._project.name)
+        self._size = 0
+        self._reset()
+
+    def record(self):
+        """ Record any changes made to the project since they were last
+        recorded.  Return the size of the journal which will include the
+        changes.  An exception is raised if there was an error.
+        """
+
+        project = self._project
+
+        project_xml = self._render_project()
+        if project_xml != self._project_xml:
+            keys = self._get_keys()
+        else:
+            keys = self._keys
+
+        modified = []
+
+        for module in project.modules:
+            for sip_file in module.content:
+                if keys is not self._keys and self._keys.get(id(sip_file)) != keys[id(sip_file)]:
+                    # The .sip file is new, or it or its module has been
+                    # renamed, so its content must be recorded with its new
+                    # name even if it hasn't been loaded.
+                    modified.append((module, sip_file))
+                elif sip_file.content_loader is None and not is_journaled(sip_file):
+                    modified.append((module, sip_file))
+
+        records = []
+
+        for module, sip_file in modified:
+            payload = module.name + '\n' + self._render_sip_file(sip_file)
+            records.append((_SIP_FILE_RECORD, payload.encode('UTF-8')))
+
+        if keys is not self._keys:
+            records.append((_PROJECT_RECORD, project_xml.encode('UTF-8')))
+
+        if len(records) != 0:
+            self._append(records)
+
+            for _, sip_file in modified:
+                set_journaled(sip_file)
+
+            self._project_xml = project_xml
+            self._keys = keys
+
+        return self._size
+
+    def saved(self, size):
+        """ Called when a snapshot of the project, taken when the journal was a
+        particular size, has been saved.  The journal is compacted so that it
+        only contains those changes made after the snapshot was taken.  Any
+        error is ignored as the uncompacted journal is still valid.
+        """
+
+        journal_name = get_journal_name(self._project.name)
+
+        if self._file is None:
+            tail = b''
+        else:
+            self._file.seek(size)
+            tail = self._file.read()
+            self.close()
+
+        old_journal_name = self._journal_name
+        self._journal_name = journal_name
+        self._size = 0
+
+        if len(tail) != 0:
+            tmp_name = journal_name + '.tmp'
+
+            try:
+                with open(tmp_name, 'wb') as f:
+                    f.write(_JOURNAL_HEADER)
+                    f.write(tail)
+
+                os.replace(tmp_name, journal_name)
+            except OSError:
+                # Leave the old journal in place and continue it.
+                _remove_file(tmp_name)
+                self._journal_name = old_journal_name
+                self._open()
+                return
+
+            self._open()
+
+        if old_journal_name != journal_name or len(tail) == 0:
+            _remove_file(old_journal_name)
+
+    def _append(self, records):
+        """ Append a sequence of records to the journal. """
+
+        if self._file is None:
+            self._open()
+
+        data = b''.join(
+                [b'%s %d\n' % (kind, len(payload)) + payload
+                        for kind, payload in records])
+
+        try:
+            # Note that the journal is flushed so that it survives a crash of
+            # the application but, for speed, it is not synced to disk.
+            self._file.write(data)
+            self._file.flush()
+        except OSError as e:
+            # Remove any partial record.
+            try:
+                self._file.truncate(self._size)
+            except OSError:
+                pass
+
+            raise UserException(
+                    f"There was an error writing '{self._journal_name}'",
+                    detail=str(e)) from e
+
+        self._size += len(data)
+
+    def _get_keys(self):
+        """ Return a dict of the keys of the current .sip files of the project
+        keyed by the id of the .sip file.
+        """
+
+        keys = {}
+
+        for module in self._project.modules:
+            for sip_file in module.content:
+                keys[id(sip_file)] = (module.name, sip_file.name)
+
+        return keys
+
+    def _open(self):
+        """ Open the journal file positioned after its last complete record. """
+
+        journal = _read_journal(self._journal_name)
+
+        try:
+            if journal is None or journal[1] == 0:
+                self._file = open(self._journal_name, 'w+b')
+                self._file.write(_JOURNAL_HEADER)
+                self._size = len(_JOURNAL_HEADER)
+            else:
+                # Discard any incomplete record at the end.
+                _, self._size = journal
+                self._file = open(self._journal_name, 'r+b')
+                self._file.truncate(self._size)
+                self._file.seek(self._size)
+        except OSError as e:
+            raise UserException(
+                    f"There was an error opening '{self._journal_name}'",
+                    detail=str(e)) from e
+
+    def _render_project(self):
+        """ Return the XML of the project with references to its .sip files.
+        """
+
+        output = IndentFile.create(None, indent=2)
+        adapt(self._project).save(output, sip_file_references=True)
+
+        return output.getvalue()
+
+    def _render_sip_file(self, sip_file):
+        """ Return the XML of a .sip file. """
+
+        output = IndentFile.create(None, indent=2)
+
+        # Use the same indentation as when the project is saved so that the
+        # XML can be reused by the next save.
+        if self._project.sipfilesdir == '':
+            output += 2
+
+        adapt(sip_file).save(output)
+
+        return output.getvalue()
+
+    def _reset(self):
+        """ Make the current state of the project the state that subsequent
+        records are relative to.
+        """
+
+        self._project_xml = self._render_project()
+        self._keys = self._get_keys()
+
+        for module in self._project.modules:
+            for sip_file in module.content:
+                if sip_file.content_loader is None:
+                    set_journaled(sip_file)
+
+
+def _load_sip_file(element):
+    """ Return a new SipFile loaded from the XML element of a record. """
+
+    sip_file = SipFile()
+
+    # Loading a .sip file only depends on the version of the project format.
+    adapt(sip_file).load(element, Project(), None)
+
+    return sip_file
+
+
+def _parse_record(xml, journal_name):
+    """ Return the root element of the XML of a record. """
+
+    try:
+        return ElementTree.fromstring(xml)
+    except ElementTree.ParseError as e:
+        raise UserException(f"The journal '{journal_name}' is invalid",
+                detail=str(e)) from e
+
+
+def _read_journal(journal_name):
+    """ Return a 2-tuple of the list of complete records of a journal and its
+    size up to the end of the last complete record or None if there is no
+    journal.
+    """
+
+    try:
+        with open(journal_name, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise UserException(f"There was an error reading '{journal_name}'",
+                detail=str(e)) from e
+
+    records = []
+
+    if not data.startswith(_JOURNAL_HEADER):
+        return records, 0
+
+    start = len(_JOURNAL_HEADER)
+
+    # A record that is incomplete (because of a crash while it was being
+    # appended) marks the end of the journal.
+    while True:
+        header_end = data.find(b'\n', start)
+        if header_end < 0:
+            break
+
+        try:
+            kind, size = data[start:header_end].split()
+            size = int(size)
+        except ValueError:
+            break
+
+        if kind not in (_PROJECT_RECORD, _SIP_FILE_RECORD) or size < 0:
+            break
+
+        end = header_end + 1 + size
+        if end > len(data):
+            break
+
+        records.append((kind, data[header_end + 1:end]))
+        start = end
+
+    return records, start
+
+
+def _remove_file(file_name):
+    """ Remove a file ignoring any errors. """
+
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass
@@ -0,0 +1,256 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+import stat
+import tempfile
+
+from ..exceptions import UserException
+from ..models.adapters import adapt
+from ..models.modification_tracker import get_saved_xml
+
+from .compression import compressing_writer
+from .indent_file import IndentFile
+from .split_project import (get_referenced_sip_file_paths,
+        get_sip_files_dir_path, remove_sip_files, render_sip_files)
+
+
+def _get_default_mode():
+    """ Return the mode of a newly created file. """
+
+    # Note that the umask can only be read by changing it.
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+# The number of characters of text that are encoded (and, if necessary,
+# compressed) and written at a time.
+_CHUNK_SIZE = 1024 * 1024
+
+# The mode of a newly created file.  This is determined when the module is
+# imported as changing the umask from a thread isn't safe.
+_DEFAULT_MODE = _get_default_mode()
+
+
+class ProjectSnapshot:
+    """ This class is a snapshot of a project as the contents of the files it
+    is saved to.  The snapshot is taken from the current state of the project
+    and may then be written by a different thread while the project continues
+    to be modified.
+    """
+
+    def __init__(self, project, ui=None):
+        """ Take a snapshot of a project.  An optional user interface may be
+        available to inform the user of progress.
+        """
+
+        self.name = project.name
+
+        if project.sipfilesdir != '':
+            # Loading and saving each .sip file are separate steps.
+            if ui is not None:
+                ui.save_starting(project,
+                        2 * sum(len(module.content)
+                                for module in project.modules))
+
+            self._sip_files, self._all_sip_file_names = render_sip_files(
+                    project, ui)
+            self._sip_files_dir_path = get_sip_files_dir_path(project.name,
+                    project.sipfilesdir)
+        else:
+            indentation = _create_sip_file_output().indentation
+
+            # Deferred content that can be saved as the XML it would be loaded
+            # from is left alone.  Any other deferred content must be loaded
+            # from the project file before it is overwritten and is then saved
+            # along with any .sip files modified since they were last saved.
+            unloaded = []
+            modified = []
+
+            for module in project.modules:
+                for sip_file in module.content:
+                    loader = sip_file.content_loader
+
+                    if loader is None:
+                        if get_saved_xml(sip_file, indentation) is None:
+                            modified.append(sip_file)
+                    else:
+                        get_loader_xml = getattr(loader, 'get_saved_xml',
+                                None)
+
+                        if get_loader_xml is None or get_loader_xml(indentation) is None:
+                            unloaded.append(sip_file)
+
+            # Loading and saving each .sip file are separate steps.
+            if ui is not None:
+                ui.save_starting(project, 2 * len(unloaded) + len(modified))
+
+            # Note that loading is done before anything is saved (which starts
+            # the tracking of modifications) as loading content is then
+            # slower.
+            for sip_file in unloaded:
+                sip_file.load_content()
+
+                if ui is not None:
+                    ui.save_step()
+
+            # Save each .sip file, at the indentation it has in the project
+            # file, so that progress can be shown.  Saving the project then
+            # reuses the XML.
+            if ui is not None:
+                for sip_file in unloaded + modified:
+                    adapt(sip_file).save(_create_sip_file_output())
+
+                    ui.save_step()
+
+            self._sip_files = None
+
+        # The XML is only joined when it is written.
+        self._project_output = IndentFile.create(None, indent=2)
+        adapt(project).save(self._project_output)
+
+    def write(self):
+        """ Write the snapshot and raise an exception if there was an error.
+        """
+
+        if self._sip_files is not None:
+            # The content of each .sip file is written before the project file
+            # that refers to it.  Only those files that have changed are
+            # written.
+            for file_name, text in self._sip_files:
+                if not _file_contains(file_name, text):
+                    _write_file(file_name, text)
+
+        _write_file(self.name, self._project_output.getvalue())
+
+        if self._sip_files is not None:
+            # Remove the files of any .sip files that have been removed from
+            # the project (or renamed), but only once it is known that the
+            # project file that has been written refers to the files that have
+            # been kept.
+            referenced = get_referenced_sip_file_paths(self.name)
+
+            if referenced != self._all_sip_file_names:
+                raise UserException(
+                        f"'{self.name}' doesn't refer to the expected .sip files")
+
+            missing = [file_name for file_name in referenced
+                    if not os.path.isfile(file_name)]
+
+            if len(missing) != 0:
+                raise UserException(
+                        f"'{self.name}' refers to .sip files that don't exist",
+                        detail='\n'.join(sorted(missing)))
+
+            remove_sip_files(self._sip_files_dir_path,
+                    keep=self._all_sip_file_names)
+
+
+def set_replacement_mode(tmp_name, file_name):
+    """ Set the mode of a temporary file that will replace a file.  A
+    temporary file is only readable by its owner so the mode of any existing
+    file or, failing that, the mode of a newly created file is used.
+    """
+
+    try:
+        mode = stat.S_IMODE(os.stat(file_name).st_mode)
+    except FileNotFoundError:
+        mode = _DEFAULT_MODE
+
+    os.chmod(tmp_name, mode)
+
+
+def _create_sip_file_output():
+    """ Return an output for the XML of a .sip file at the indentation it has
+    in a project file that doesn't have a split layout.
+    """
+
+    output = IndentFile.create(None, indent=2)
+    output += 2
+
+    return output
+
+
+def _file_contains(file_name, text):
+    """ Return True if a file exists and contains some text. """
+
+    try:
+        with open(file_name, encoding='UTF-8') as f:
+            return f.read() == text
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def _write_file(file_name, text):
+    """ Write some text to a file so that, if there is an error or a crash,
+    either the original file or the complete new file exists.
+    """
+
+    dir_name = os.path.dirname(file_name)
+
+    try:
+        if dir_name != '':
+            os.makedirs(dir_name, exist_ok=True)
+
+        # Create the temporary file in the same directory so that it can be
+        # atomically renamed.
+        fd, tmp_name = tempfile.mkstemp(dir=dir_name if dir_name else None,
+                prefix=os.path.basename(file_name) + '.', suffix='.tmp')
+    except OSError as e:
+        raise UserException(f"There was an error creating '{file_name}'",
+                detail=str(e)) from e
+
+    try:
+        with open(fd, 'wb') as f:
+            # Compress the text, if the file name implies it, as it is
+            # written.
+            compressor = compressing_writer(f, file_name)
+
+            if compressor is None:
+                _write_text(f, text)
+            else:
+                with compressor:
+                    _write_text(compressor, text)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        set_replacement_mode(tmp_name, file_name)
+
+        os.replace(tmp_name, file_name)
+    except OSError as e:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+
+        raise UserException(f"There was an error writing '{file_name}'",
+                detail=str(e)) from e
+
+    # Make sure the rename itself is durable where the platform supports it.
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(dir_name if dir_name else os.curdir,
+                    os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+def _write_text(f, text):
+    """ Write some text to a binary file object a chunk at a time so that the
+    complete text is never encoded in memory.
+    """
+
+    for start in range(0, len(text), _CHUNK_SIZE):
+        f.write(text[start:start + _CHUNK_SIZE].encode('UTF-8'))
@@ -4,23 +4,24 @@
 
 
 from ..exceptions import UserException
-from ..models.adapters import adapt
 
-from .indent_file import IndentFile
+from .project_snapshot import ProjectSnapshot
 
 
-def save_project(project, ui):
+def save_project(project, ui=None):
     """ Save a project to its project file.  Return True if there was no error.
+    If there is no user interface then an exception is raised if there was an
+    error.  If there is an error, or a crash, while the project is being saved
+    then the original project file is left unchanged.
     """
 
     try:
-        output = IndentFile.create(project.name, indent=2)
+        ProjectSnapshot(project, ui=ui).write()
     except UserException as e:
+        if ui is None:
+            raise
+
         ui.error_creating_file("Save", e.text, e.detail)
         return False
 
-    adapt(project).save(output)
-
-    output.close()
-
     return True
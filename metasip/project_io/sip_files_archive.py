@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# The generated .sip files may be bundled in a single zip or tar archive
+# rather than being written to an output directory.  The archive is written
+# sequentially as the .sip files are generated so that their contents are not
+# all held in memory.  The archive doesn't contain any timestamps so that the
+# same .sip files are always bundled in the same archive.
+
+
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+
+from ..exceptions import UserException
+
+from .compression import compressing_writer, is_compressed
+from .project_snapshot import set_replacement_mode
+
+
+# The timestamp of each member of a zip archive.  This is the earliest that
+# the format supports.
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def write_sip_files_archive(archive_name, sip_files):
+    """ Write an archive of .sip files given an iterable of 2-tuples of the
+    path name and contents of each .sip file (as returned by
+    iter_sip_files()).  The format of the archive is implied by its name which
+    must end with '.zip', '.tar', '.tar.gz' or '.tar.xz'.  Either the complete
+    archive is written or an exception is raised.
+    """
+
+    # Ignore any compression extension.
+    base_name = archive_name
+    if is_compressed(base_name):
+        base_name = os.path.splitext(base_name)[0]
+
+    extension = os.path.splitext(base_name)[1]
+
+    if extension == '.zip' and base_name == archive_name:
+        write_members = _write_zip
+    elif extension == '.tar':
+        write_members = _write_tar
+    else:
+        raise UserException(
+                f"'{archive_name}' does not have a supported archive extension",
+                detail="Use .zip, .tar, .tar.gz or .tar.xz.")
+
+    dir_name = os.path.dirname(archive_name)
+
+    try:
+        # Create the temporary file in the same directory so that it can be
+        # atomically renamed.
+        fd, tmp_name = tempfile.mkstemp(dir=dir_name if dir_name else None,
+                prefix=os.path.basename(archive_name) + '.', suffix='.tmp')
+    except OSError as e:
+        raise UserException(f"There was an error creating '{archive_name}'",
+                detail=str(e)) from e
+
+    try:
+        with open(fd, 'wb') as f:
+            write_members(f, archive_name, sip_files)
+
+        set_replacement_mode(tmp_name, archive_name)
+
+        os.replace(tmp_name, archive_name)
+    except OSError as e:
+        _remove_file(tmp_name)
+
+        raise UserException(f"There was an error writing '{archive_name}'",
+                detail=str(e)) from e
+    except:
+        # Generating the .sip files failed.
+        _remove_file(tmp_name)
+        raise
+
+
+def _get_member_name(file_path):
+    """ Return the name of the archive member for a .sip file. """
+
+    return file_path.replace(os.sep, '/')
+
+
+def _remove_file(file_name):
+    """ Remove a file ignoring any errors. """
+
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass
+
+
+def _write_tar(f, archive_name, sip_files):
+    """ Write a tar archive, compressed if the name implies it, of .sip files
+    to a binary file object.
+    """
+
+    compressor = compressing_writer(f, archive_name)
+
+    with tarfile.open(fileobj=f if compressor is None else compressor,
+            mode='w', format=tarfile.PAX_FORMAT) as tf:
+        for file_path, text in sip_files:
+            data = text.encode('UTF-8')
+
+            info = tarfile.TarInfo(_get_member_name(file_path))
+            info.size = len(data)
+            info.mode = 0o644
+
+            tf.addfile(info, io.BytesIO(data))
+
+    if compressor is not None:
+        compressor.close()
+
+
+def _write_zip(f, archive_name, sip_files):
+    """ Write a zip archive of .sip files to a binary file object. """
+
+    with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for file_path, text in sip_files:
+            info = zipfile.ZipInfo(_get_member_name(file_path),
+                    date_time=_ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+
+            zf.writestr(info, text.encode('UTF-8'))
@@ -0,0 +1,226 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# A project with a split layout has a project file containing the project's
+# own attributes, its header directories and its modules.  The project file
+# only contains a reference to each .sip file.  The content of each .sip file
+# is contained in a separate file in a directory named after its module.  The
+# module directories are in the directory named by the project's 'sipfilesdir'
+# attribute.
+
+
+import os
+from xml.etree import ElementTree
+
+from ..exceptions import UserException
+from ..models import Project
+from ..models.adapters import adapt
+
+from .compression import open_project_file
+from .indent_file import IndentFile
+
+
+# The extension of the file containing the content of a .sip file.
+_SIP_FILE_EXTENSION = '.xml'
+
+
+def get_referenced_sip_file_paths(project_name):
+    """ Return the set of path names of the files containing the content of the
+    .sip files that are referred to by the project file of a project with a
+    split layout.
+    """
+
+    try:
+        with open_project_file(project_name) as f:
+            root = ElementTree.parse(f).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        raise UserException(f"There was an error reading '{project_name}'",
+                detail=str(e)) from e
+
+    sip_files_dir_path = get_sip_files_dir_path(project_name,
+            root.get('sipfilesdir', ''))
+
+    paths = set()
+
+    for module in root.iterfind('Module'):
+        module_dir_path = os.path.join(sip_files_dir_path,
+                module.get('name', ''))
+
+        for sip_file in module.iterfind('SipFile'):
+            file_name = os.path.basename(sip_file.get('name', ''))
+            paths.add(
+                    os.path.join(module_dir_path,
+                            file_name + _SIP_FILE_EXTENSION))
+
+    return paths
+
+
+def get_sip_files_dir(project_name):
+    """ Return the name of the directory containing the .sip files of a
+    project with a split layout or an empty string if the project doesn't have
+    a split layout.
+    """
+
+    try:
+        with open_project_file(project_name) as f:
+            # Only the start of the root element is parsed.
+            for _, root in ElementTree.iterparse(f, events=('start', )):
+                return root.get('sipfilesdir', '')
+    except ElementTree.ParseError:
+        # Let the error be reported when the project is actually loaded.
+        pass
+
+    return ''
+
+
+def get_sip_files_dir_path(project_name, sip_files_dir):
+    """ Return the path name of the directory containing the .sip files of a
+    project with a split layout.
+    """
+
+    return os.path.join(os.path.dirname(project_name), sip_files_dir)
+
+
+def get_sip_file_path(project, module, sip_file):
+    """ Return the path name of the file containing the content of a .sip
+    file.
+    """
+
+    return os.path.join(
+            get_sip_files_dir_path(project.name, project.sipfilesdir),
+            module.name,
+            os.path.basename(sip_file.name) + _SIP_FILE_EXTENSION)
+
+
+def load_sip_files(project, lazy):
+    """ Load the content of the .sip files of a project with a split layout.
+    If lazy is set then the content of each .sip file is only loaded when it is
+    first accessed.
+    """
+
+    for module in project.modules:
+        for sip_file in module.content:
+            loader = SipFileLoader(get_sip_file_path(project, module, sip_file),
+                    project.version)
+
+            if lazy:
+                sip_file.content_loader = loader
+            else:
+                loader.load(sip_file)
+
+
+def remove_sip_files(sip_files_dir_path, keep=()):
+    """ Remove the files containing the content of .sip files from the
+    directory of a project with a split layout, except for those to keep, and
+    any module directories that are then empty.
+    """
+
+    try:
+        module_dirs = os.listdir(sip_files_dir_path)
+    except OSError:
+        return
+
+    for module_dir in module_dirs:
+        module_dir = os.path.join(sip_files_dir_path, module_dir)
+        if not os.path.isdir(module_dir):
+            continue
+
+        for file_name in os.listdir(module_dir):
+            if file_name.endswith(_SIP_FILE_EXTENSION):
+                file_name = os.path.join(module_dir, file_name)
+
+                if file_name not in keep:
+                    try:
+                        os.remove(file_name)
+                    except OSError:
+                        pass
+
+        try:
+            os.rmdir(module_dir)
+        except OSError:
+            # It isn't empty.
+            pass
+
+    try:
+        os.rmdir(sip_files_dir_path)
+    except OSError:
+        pass
+
+
+def render_sip_files(project, ui=None):
+    """ Return a 2-tuple of the list of file names and contents of the .sip
+    files of a project with a split layout that may need writing and the set
+    of file names of all the .sip files.  An optional user interface may be
+    available to inform the user of progress.
+    """
+
+    sip_files = []
+    all_file_names = set()
+    unchanged = set()
+
+    # Loading and saving each .sip file are separate steps.  Note that all
+    # content is loaded before anything is saved (which starts the tracking of
+    # modifications) as loading content is then slower.
+    for module in project.modules:
+        for sip_file in module.content:
+            # Content that hasn't been loaded from the file can't have changed.
+            loader = sip_file.content_loader
+            if isinstance(loader, SipFileLoader) and loader.file_name == get_sip_file_path(project, module, sip_file):
+                unchanged.add(id(sip_file))
+            else:
+                # Make sure any deferred content has been loaded before the
+                # name of the file is determined.
+                sip_file.load_content()
+
+            if ui is not None:
+                ui.save_step()
+
+    for module in project.modules:
+        for sip_file in module.content:
+            file_name = get_sip_file_path(project, module, sip_file)
+            all_file_names.add(file_name)
+
+            if id(sip_file) not in unchanged:
+                output = IndentFile.create(None, indent=2)
+                output.write('<?xml version="1.0"?>\n')
+                adapt(sip_file).save(output)
+
+                sip_files.append((file_name, output.getvalue()))
+
+            if ui is not None:
+                ui.save_step()
+
+    return sip_files, all_file_names
+
+
+class SipFileLoader:
+    """ This class loads the content of a SipFile from its own file. """
+
+    def __init__(self, file_name, project_version):
+        """ Initialise the loader. """
+
+        self.file_name = file_name
+        self._project_version = project_version
+
+    def get_xml(self):
+        """ Return the XML of the file. """
+
+        try:
+            with open(self.file_name, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            raise UserException(
+                    f"There was an error reading '{self.file_name}'",
+                    detail=str(e)) from e
+
+    def load(self, sip_file):
+        """ Load the content of a SipFile. """
+
+        element = ElementTree.fromstring(self.get_xml())
+
+        # Loading a .sip file only depends on the version of the project
+        # format.
+        adapt(sip_file).load(element, Project(version=self._project_version),
+                None)
@@ -0,0 +1,176 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+# A tag resolver evaluates the %If conditions of API items when the .sip files
+# are generated rather than leaving them to be evaluated by SIP.  An API item
+# whose condition is false is omitted and the %If of an API item whose
+# condition is true is omitted.  The generated .sip files are then specific to
+# a particular set of tags.  Note that the version ranges and the features of
+# an API item are written as nested %If directives, ie. they are logically
+# and-ed, and so they are resolved in the same way.  The platforms of an API
+# item are logically or-ed.  A platform or feature tag may be inverted with a
+# leading '!'.  A tag that isn't resolved is still tested by SIP.
+
+
+from ..exceptions import UserException
+
+
+class TagResolver:
+    """ This class resolves the tags of API items when generating .sip files.
+    """
+
+    def __init__(self, project, version=None, platform=None,
+            enabled_features=(), disabled_features=()):
+        """ Initialise the resolver.  If a version is given then version
+        ranges are resolved for that version.  If a platform is given then
+        platform tags are resolved for that platform.  Any enabled or disabled
+        features are resolved accordingly.
+        """
+
+        self.version = version
+        self.platform = platform
+        self.enabled_features = sorted(set(enabled_features))
+        self.disabled_features = sorted(set(disabled_features))
+
+        if version is not None:
+            self._indexes = {v: i for i, v in enumerate(project.versions)}
+            self._nr_versions = len(project.versions)
+
+            try:
+                self._version_index = self._indexes[version]
+            except KeyError:
+                raise UserException(
+                        f"'{version}' is not a version defined by the project")
+
+        # The value of each resolved platform and feature tag.
+        self._tags = {}
+
+        if platform is not None:
+            if platform not in project.platforms:
+                raise UserException(
+                        f"'{platform}' is not a platform defined by the project")
+
+            for p in project.platforms:
+                self._tags[p] = (p == platform)
+
+        for feature in self.enabled_features + self.disabled_features:
+            if feature not in project.features:
+                raise UserException(
+                        f"'{feature}' is not a feature defined by the project")
+
+            if feature in self._tags:
+                raise UserException(
+                        f"'{feature}' cannot be both enabled and disabled")
+
+            self._tags[feature] = (feature in self.enabled_features)
+
+    def is_enabled(self, api):
+        """ Return True if an API item is enabled, ie. its condition is not
+        known to be false.
+        """
+
+        if self.version is not None:
+            for vrange in api.versions:
+                if not self._in_version_range(vrange):
+                    return False
+
+        # At least one platform must not be false.
+        if len(api.platforms) != 0:
+            for platform in api.platforms:
+                if self._evaluate(platform) is not False:
+                    break
+            else:
+                return False
+
+        # Every feature must not be false.
+        for feature in api.features:
+            if self._evaluate(feature) is False:
+                return False
+
+        return True
+
+    def resolve_all(self, tags):
+        """ Return the list of the tags of an enabled API item, all of which
+        must be true, that still need to be tested.
+        """
+
+        if len(self._tags) == 0:
+            return tags
+
+        return [tag for tag in tags if self._evaluate(tag) is None]
+
+    def resolve_any(self, tags):
+        """ Return the list of the tags of an enabled API item, any of which
+        must be true, that still need to be tested.  An empty list means that
+        the API item is unconditionally enabled.
+        """
+
+        if len(self._tags) == 0:
+            return tags
+
+        unresolved = []
+
+        for tag in tags:
+            value = self._evaluate(tag)
+
+            if value is True:
+                return []
+
+            if value is None:
+                unresolved.append(tag)
+
+        return unresolved
+
+    def resolve_versions(self, version_ranges):
+        """ Return the list of the version ranges of an enabled API item that
+        still need to be tested.
+        """
+
+        return version_ranges if self.version is None else []
+
+    @property
+    def settings(self):
+        """ The tuple of settings that determine the generated .sip files. """
+
+        return (self.version, self.platform, self.enabled_features,
+                self.disabled_features)
+
+    def _evaluate(self, tag):
+        """ Return the value of a platform or feature tag or None if it isn't
+        resolved.
+        """
+
+        if tag.startswith('!'):
+            value = self._tags.get(tag[1:])
+            if value is not None:
+                value = not value
+        else:
+            value = self._tags.get(tag)
+
+        return value
+
+    def _get_version_index(self, version):
+        """ Return the index of a version used in a version range. """
+
+        try:
+            return self._indexes[version]
+        except KeyError:
+            raise UserException(
+                    f"'{version}' is used in a version range but is not a version defined by the project") from None
+
+    def _in_version_range(self, vrange):
+        """ Return True if the resolved version is in a version range. """
+
+        if vrange.startversion == '':
+            start_idx = 0
+        else:
+            start_idx = self._get_version_index(vrange.startversion)
+
+        if vrange.endversion == '':
+            end_idx = self._nr_versions
+        else:
+            end_idx = self._get_version_index(vrange.endversion)
+
+        return start_idx <= self._version_index < end_idx
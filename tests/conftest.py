@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pytest
+
+from helpers import create_project
+
+
+@pytest.fixture
+def project_name(tmp_path):
+    """ The name of the project file of a small project. """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name)
+
+    return project_name
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from metasip.models import (Argument, Class, Constructor, Enum, EnumValue,
+        Function, Method, Module, Project, SipFile, Typedef, VersionRange)
+from metasip.project_io import (AbstractProjectUi, load_project,
+        save_project)
+
+
+class RecordingUi(AbstractProjectUi):
+    """ A user interface that records the progress of a load and a save. """
+
+    def __init__(self):
+        """ Initialise the user interface. """
+
+        self.load_nr_steps = None
+        self.load_steps = 0
+        self.save_nr_steps = None
+        self.save_steps = 0
+
+    def error_creating_file(self, title, text, detail):
+        """ Called when there was an error when creating a file. """
+
+        raise AssertionError(text)
+
+    def load_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to loading the project. """
+
+        self.load_nr_steps = nr_steps
+
+    def load_step(self):
+        """ Called once the next step of loading the project has been
+        completed.
+        """
+
+        self.load_steps += 1
+
+    def save_starting(self, project, nr_steps):
+        """ Called to initialise the UI prior to taking a snapshot of the
+        project.
+        """
+
+        self.save_nr_steps = nr_steps
+
+    def save_step(self):
+        """ Called once the next step of taking a snapshot of the project has
+        been completed.
+        """
+
+        self.save_steps += 1
+
+    def update_project_format(self, root_element, from_version, to_version):
+        """ Called to update the project from it's current major version. """
+
+        return True
+
+    def warn_minor_version_update(self, from_version, to_version):
+        """ Called to warn the user that the project will be updated. """
+
+        pass
+
+
+def create_project(project_name, nr_modules=2, nr_sip_files=3,
+        sip_files_dir=''):
+    """ Create and save a small project and return it. """
+
+    project = Project(name=project_name, rootmodule='Pkg',
+            sipcomments='// Copyright & <stuff>',
+            versions=['v1', 'v2', 'v3'], platforms=['Linux', 'Windows'],
+            features=['FA', 'FB'], sipfilesdir=sip_files_dir)
+
+    for module_nr in range(nr_modules):
+        module = Module(name=f'Mod{module_nr}')
+
+        if module_nr != 0:
+            module.imports.append(f'Mod{module_nr - 1}')
+
+        for sip_file_nr in range(nr_sip_files):
+            module.content.append(
+                    _create_sip_file(f'file{module_nr}_{sip_file_nr}.h'))
+
+        project.modules.append(module)
+
+    save_project(project)
+
+    return project
+
+
+def load(project_name, **kwargs):
+    """ Return a project loaded from a project file. """
+
+    project = Project(name=project_name)
+    assert load_project(project, **kwargs)
+
+    return project
+
+
+def _create_sip_file(name):
+    """ Return a SipFile with some representative content. """
+
+    sip_file = SipFile(name=name, modulecode='// Module code.')
+
+    klass = Class(name='Klass', bases='public QObject',
+            docstring='A "quoted" docstring.')
+    klass.content.append(
+            Constructor(name='Klass',
+                    args=[Argument(type='QObject *', name='parent',
+                            default='nullptr', unnamed=False)]))
+    klass.content.append(
+            Method(name='values', rtype='QMap<QString,QVariant>',
+                    const=True,
+                    versions=[VersionRange(startversion='v2')]))
+    klass.content.append(
+            Method(name='pairs', rtype='void',
+                    args=[Argument(type='QList<QPair<int , int > > &')],
+                    platforms=['Linux'], features=['FA']))
+
+    enum = Enum(name='Enum')
+    enum.content.append(EnumValue(name='Value'))
+    klass.content.append(enum)
+
+    sip_file.content.append(klass)
+    sip_file.content.append(
+            Function(name='function', rtype='long int',
+                    args=[Argument(type='int', name='a', default='0',
+                            unnamed=False)],
+                    features=['!FB']))
+    sip_file.content.append(Typedef(name='IntList', type='QList<int>'))
+
+    return sip_file
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pytest
+
+from metasip.models import (Access, Annos, Callable, Code, CodeContainer,
+        Docstring, ExtendedAccess, Tagged, Workflow)
+from metasip.models.adapters import adapt
+from metasip.models.adapters.adapter_map import ADAPTER_MAP
+from metasip.project_io import get_sip_files, save_project
+
+from helpers import load
+
+
+# The models that are only ever adapted to as the super-type of a model.
+_MIXINS = (Access, Annos, Callable, Code, CodeContainer, Docstring,
+        ExtendedAccess, Tagged, Workflow)
+
+# The models that are created.
+_MODEL_TYPES = [model_type for model_type in ADAPTER_MAP
+        if model_type not in _MIXINS]
+
+
+def _targets(model_type):
+    """ Return the list of the types that a model type can be adapted to. """
+
+    return [target_type for target_type in model_type.__mro__
+            if target_type in ADAPTER_MAP]
+
+
+@pytest.mark.parametrize('model_type', _MODEL_TYPES,
+        ids=lambda model_type: model_type.__name__)
+def test_adapt(model_type):
+    """ Check that a model is adapted to its own type. """
+
+    model = model_type()
+
+    for _ in range(2):
+        adapter = adapt(model)
+
+        assert type(adapter) is ADAPTER_MAP[model_type]
+        assert adapter.model is model
+
+
+@pytest.mark.parametrize('model_type', _MODEL_TYPES,
+        ids=lambda model_type: model_type.__name__)
+def test_adapt_to_target(model_type):
+    """ Check that a model is adapted to each of its super-types. """
+
+    model = model_type()
+
+    for target_type in _targets(model_type):
+        for _ in range(2):
+            adapter = adapt(model, target_type)
+
+            assert type(adapter) is ADAPTER_MAP[target_type]
+            assert adapter.model is model
+
+    # Adapting to a super-type doesn't affect adapting to its own type.
+    assert type(adapt(model)) is ADAPTER_MAP[model_type]
+
+
+@pytest.mark.parametrize('model_type', _MODEL_TYPES,
+        ids=lambda model_type: model_type.__name__)
+def test_adapters_are_slotted(model_type):
+    """ Check that adapters don't have an instance dictionary. """
+
+    model = model_type()
+
+    for target_type in _targets(model_type):
+        adapter = adapt(model, target_type)
+
+        assert not hasattr(adapter, '__dict__')
+
+        with pytest.raises(AttributeError):
+            adapter.state = None
+
+
+def test_round_trip(project_name):
+    """ Check that saving a loaded project doesn't change it and that the
+    reloaded project generates the same .sip files.
+    """
+
+    with open(project_name, 'rb') as f:
+        original = f.read()
+
+    project = load(project_name)
+    sip_files = get_sip_files(project)
+
+    # Note that the content isn't loaded lazily so every model is saved.
+    save_project(project)
+
+    with open(project_name, 'rb') as f:
+        assert f.read() == original
+
+    assert get_sip_files(load(project_name)) == sip_files
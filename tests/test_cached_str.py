@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pickle
+
+from metasip.models import Argument
+from metasip.models.adapters import adapt
+from metasip.project_io import save_project
+
+from helpers import load
+
+
+def _load_tracked(project_name):
+    """ Return a project whose modifications are tracked. """
+
+    project = load(project_name)
+
+    # Saving the project starts the tracking.
+    save_project(project)
+
+    return project
+
+
+def _get_method(project, module_nr, sip_file_nr):
+    """ Return the 'pairs' method of the class in a .sip file. """
+
+    klass = project.modules[module_nr].content[sip_file_nr].content[0]
+
+    return klass.content[2]
+
+
+def test_cached(project_name):
+    """ Check that the string representation of a tracked model is cached. """
+
+    method = _get_method(_load_tracked(project_name), 0, 0)
+
+    assert adapt(method).as_str() is adapt(method).as_str()
+    assert adapt(method.args[0]).as_str() is adapt(method.args[0]).as_str()
+
+
+def test_not_cached(project_name):
+    """ Check that the string representation of a model that isn't tracked
+    isn't cached.
+    """
+
+    method = _get_method(load(project_name), 0, 0)
+
+    assert adapt(method).as_str() is not adapt(method).as_str()
+
+
+def test_invalidated(project_name):
+    """ Check that the cached string representation of a model changes when
+    the model, or a model it contains, is modified.
+    """
+
+    method = _get_method(_load_tracked(project_name), 0, 0)
+    assert adapt(method).as_str() == 'void pairs(QList<QPair<int, int>> &)'
+
+    method.args[0].type = 'QList<int> &'
+    assert adapt(method).as_str() == 'void pairs(QList<int> &)'
+
+    method.const = True
+    assert adapt(method).as_str() == 'void pairs(QList<int> &) const'
+
+    # A new argument isn't tracked until the project is next saved.
+    arg = Argument(type='int')
+    method.args.append(arg)
+    assert adapt(method).as_str().startswith('void pairs(QList<int> &, int)')
+
+    arg.name = 'value'
+    assert adapt(method).as_str().startswith(
+            'void pairs(QList<int> &, int value)')
+
+    # Replacing a list stops the model being tracked.
+    method.args = [Argument(type='long')]
+    assert adapt(method).as_str().startswith('void pairs(long)')
+
+    method.args[0].name = 'value'
+    assert adapt(method).as_str().startswith('void pairs(long value)')
+
+
+def test_other_sip_file_modified(project_name):
+    """ Check that the cached string representation of a model isn't
+    discarded when a different .sip file is modified.
+    """
+
+    project = _load_tracked(project_name)
+    method = _get_method(project, 0, 0)
+    original = adapt(method).as_str()
+
+    _get_method(project, 1, 2).args[0].name = 'renamed'
+    assert adapt(method).as_str() is original
+
+    _get_method(project, 0, 0).args[0].name = 'renamed'
+    assert adapt(method).as_str() is not original
+
+
+def test_moved_model(project_name):
+    """ Check that the cached string representation of a model reflects a
+    contained model that has been moved from a different .sip file.
+    """
+
+    project = _load_tracked(project_name)
+    method = _get_method(project, 0, 0)
+    other_method = _get_method(project, 1, 0)
+
+    arg = other_method.args.pop()
+    method.args.append(arg)
+    moved = adapt(method).as_str()
+
+    # The argument is tracked by the .sip file it was moved from.
+    arg.name = 'moved'
+    assert adapt(method).as_str() != moved
+    assert 'moved' in adapt(method).as_str()
+
+
+def test_copy_excludes_cache(project_name):
+    """ Check that a copy of a tracked model doesn't include any cached string
+    representations.
+    """
+
+    method = _get_method(_load_tracked(project_name), 0, 0)
+    adapt(method).as_str()
+
+    copy = pickle.loads(pickle.dumps(method))
+
+    assert method._owner.cache is not None
+    assert copy._owner.cache is None
+    assert adapt(copy).as_str() == adapt(method).as_str()
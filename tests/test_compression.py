@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import gzip
+import lzma
+
+import pytest
+
+from metasip.project_io import get_sip_files, save_project
+
+from helpers import create_project, load
+
+
+# The decompressing function and the magic bytes at the start of a compressed
+# file keyed by the extension.
+_FORMATS = {
+    '.gz':  (gzip.decompress, b'\x1f\x8b'),
+    '.xz':  (lzma.decompress, b'\xfd7zXZ\x00'),
+}
+
+
+@pytest.fixture(params=sorted(_FORMATS))
+def extension(request):
+    """ The extension of a compressed project file. """
+
+    return request.param
+
+
+def _read(file_name):
+    """ Return the contents of a file. """
+
+    with open(file_name, 'rb') as f:
+        return f.read()
+
+
+def test_save(tmp_path, extension):
+    """ Check that a compressed project file contains the compressed contents
+    of the uncompressed project file.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name)
+
+    compressed_name = project_name + extension
+    create_project(compressed_name)
+
+    decompress, magic = _FORMATS[extension]
+    compressed = _read(compressed_name)
+
+    assert compressed.startswith(magic)
+    assert decompress(compressed) == _read(project_name)
+
+
+def test_save_is_deterministic(tmp_path, extension):
+    """ Check that saving the same project always creates the same compressed
+    file.
+    """
+
+    project_name = str(tmp_path / ('project.msp' + extension))
+    project = create_project(project_name)
+    compressed = _read(project_name)
+
+    # Make sure the project isn't simply reusing the same XML.
+    project.modules[0].content[0].name = 'renamed.h'
+    save_project(project)
+    project.modules[0].content[0].name = 'file0_0.h'
+    save_project(project)
+
+    assert _read(project_name) == compressed
+
+
+@pytest.mark.parametrize('kwargs',
+        [dict(), dict(streaming=False), dict(lazy=True), dict(jobs=2)],
+        ids=['streaming', 'tree', 'lazy', 'parallel'])
+def test_load(tmp_path, extension, kwargs):
+    """ Check that a project loaded from a compressed project file is the same
+    as the project loaded from the uncompressed project file.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name)
+    expected = load(project_name)
+
+    compressed_name = project_name + extension
+    create_project(compressed_name)
+    project = load(compressed_name, **kwargs)
+
+    assert project.versions == expected.versions
+    assert project.modules == expected.modules
+    assert get_sip_files(project) == get_sip_files(expected)
+
+
+def test_save_and_reload(tmp_path, extension):
+    """ Check that a change to a project loaded from a compressed project file
+    is saved.
+    """
+
+    project_name = str(tmp_path / ('project.msp' + extension))
+    create_project(project_name)
+
+    project = load(project_name, lazy=True)
+    project.modules[1].content[0].name = 'renamed.h'
+    save_project(project)
+
+    expected = get_sip_files(project)
+
+    reloaded = load(project_name)
+    assert reloaded.modules[1].content[0].name == 'renamed.h'
+    assert get_sip_files(reloaded) == expected
@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+import pickle
+
+import pytest
+
+from metasip.exceptions import UserException
+from metasip.project_io import (check_sip_files, generate_sip_files,
+        get_sip_files)
+
+from helpers import load
+
+
+def test_sip_file_names(project_name):
+    """ Check the names of the generated .sip files. """
+
+    assert list(get_sip_files(load(project_name))) == [
+            'Mod0/file0_0.sip', 'Mod0/file0_1.sip', 'Mod0/file0_2.sip',
+            'Mod0/Mod0mod.sip',
+            'Mod1/file1_0.sip', 'Mod1/file1_1.sip', 'Mod1/file1_2.sip',
+            'Mod1/Mod1mod.sip']
+
+
+def test_ignored_modules(project_name):
+    """ Check that the .sip files of ignored modules are not generated. """
+
+    sip_files = get_sip_files(load(project_name), ignored_modules=['Mod0'])
+
+    assert list(sip_files) == [
+            'Mod1/file1_0.sip', 'Mod1/file1_1.sip', 'Mod1/file1_2.sip',
+            'Mod1/Mod1mod.sip']
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_parallel(project_name, lazy):
+    """ Check that generating .sip files in parallel gives the same result. """
+
+    expected = get_sip_files(load(project_name))
+
+    assert get_sip_files(load(project_name, lazy=lazy), jobs=2) == expected
+
+
+def test_written_sip_files(project_name, tmp_path):
+    """ Check that the .sip files written to a directory are the same as those
+    generated in memory.
+    """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    expected = get_sip_files(project)
+
+    generate_sip_files(project, output_dir, None, False)
+
+    written = {}
+
+    for dir_path, _, file_names in os.walk(output_dir):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+
+            with open(file_path, encoding='UTF-8') as f:
+                written[os.path.relpath(file_path, output_dir)] = f.read()
+
+    assert written == {os.path.normpath(file_path): text
+            for file_path, text in expected.items()}
+
+
+def test_write_if_changed(project_name, tmp_path):
+    """ Check that only .sip files whose contents have changed are written. """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+
+    assert generate_sip_files(project, output_dir, None, False) == (8, 0)
+    assert generate_sip_files(project, output_dir, None, False) == (0, 8)
+
+    project.modules[1].content[0].content[0].name = 'Renamed'
+    assert generate_sip_files(project, output_dir, None, False) == (1, 7)
+
+
+def test_crlf(project_name, tmp_path):
+    """ Check that generating and checking .sip files agree that a file with
+    different newlines has changed.
+    """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    generate_sip_files(project, output_dir, None, False)
+
+    file_path = os.path.join(output_dir, 'Mod0', 'file0_0.sip')
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    assert b'\r' not in data
+
+    with open(file_path, 'wb') as f:
+        f.write(data.replace(b'\n', b'\r\n'))
+
+    assert check_sip_files(project, output_dir, None) == ([file_path], [])
+    assert generate_sip_files(project, output_dir, None, False) == (1, 7)
+    assert check_sip_files(project, output_dir, None) == ([], [])
+
+    with open(file_path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_check_up_to_date(project_name, tmp_path):
+    """ Check that checking up to date .sip files doesn't write anything. """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    generate_sip_files(project, output_dir, None, False)
+
+    file_path = os.path.join(output_dir, 'Mod0', 'file0_0.sip')
+    os.utime(file_path, ns=(0, 0))
+
+    assert check_sip_files(project, output_dir, None) == ([], [])
+    assert check_sip_files(project, output_dir, None, jobs=2) == ([], [])
+    assert os.stat(file_path).st_mtime_ns == 0
+
+
+def test_check_missing(project_name, tmp_path):
+    """ Check that missing .sip files are stale. """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+
+    stale, extra = check_sip_files(project, output_dir, None)
+
+    assert stale == sorted(os.path.join(output_dir, file_path)
+            for file_path in get_sip_files(project))
+    assert extra == []
+    assert not os.path.exists(output_dir)
+
+
+@pytest.mark.parametrize('contents', ['', '// Different.\n', None],
+        ids=['empty', 'different', 'same-size'])
+def test_check_changed(project_name, tmp_path, contents):
+    """ Check that .sip files whose contents are different are stale. """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    generate_sip_files(project, output_dir, None, False)
+
+    file_path = os.path.join(output_dir, 'Mod1', 'file1_2.sip')
+
+    if contents is None:
+        # Change a single character.
+        with open(file_path, 'r+b') as f:
+            f.seek(-2, os.SEEK_END)
+            f.write(b'X')
+    else:
+        with open(file_path, 'w') as f:
+            f.write(contents)
+
+    assert check_sip_files(project, output_dir, None) == ([file_path], [])
+
+
+def test_check_project_changed(project_name, tmp_path):
+    """ Check that a .sip file is stale if the project has changed. """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    generate_sip_files(project, output_dir, None, False)
+
+    project.modules[0].content[1].content[0].name = 'Renamed'
+
+    assert check_sip_files(project, output_dir, None) == (
+            [os.path.join(output_dir, 'Mod0', 'file0_1.sip')], [])
+
+
+def test_check_extra(project_name, tmp_path):
+    """ Check that existing .sip files that would not be generated are
+    reported.
+    """
+
+    output_dir = str(tmp_path / 'output')
+    project = load(project_name)
+    generate_sip_files(project, output_dir, None, False)
+
+    extra_path = os.path.join(output_dir, 'Mod1', 'removed.sip')
+    with open(extra_path, 'w') as f:
+        f.write('// Removed.\n')
+
+    # Only .sip files are reported.
+    with open(os.path.join(output_dir, 'Mod1', 'README'), 'w') as f:
+        f.write('Not a .sip file.\n')
+
+    assert check_sip_files(project, output_dir, None) == ([], [extra_path])
+
+    # The .sip files of ignored modules are not reported.
+    assert check_sip_files(project, output_dir, ['Mod1']) == ([], [])
+
+
+def test_user_exception_is_picklable():
+    """ Check that a UserException can be passed between processes. """
+
+    e = pickle.loads(pickle.dumps(UserException("text", detail="detail")))
+
+    assert e.text == "text"
+    assert e.detail == "detail"
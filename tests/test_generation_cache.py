@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+
+from metasip.project_io import GenerationCache, get_sip_files
+from metasip.project_io import generation_cache
+
+from helpers import load
+
+
+def _cache_files(cache_dir):
+    """ Return the sorted list of the names of the files in a cache. """
+
+    return sorted(
+            os.path.join(dir_path, file_name)
+            for dir_path, _, file_names in os.walk(cache_dir)
+            for file_name in file_names)
+
+
+def test_cache_is_used(project_name, tmp_path):
+    """ Check that the contents of unchanged .sip files are taken from the
+    cache.
+    """
+
+    cache_dir = str(tmp_path / 'cache')
+    expected = get_sip_files(load(project_name))
+
+    assert get_sip_files(load(project_name, lazy=True),
+            cache=GenerationCache(cache_dir)) == expected
+
+    # Each .sip file generated from a SipFile is cached.
+    cache_files = _cache_files(cache_dir)
+    assert len(cache_files) == 6
+
+    with open(cache_files[0], 'w', encoding='UTF-8') as f:
+        f.write('cached')
+
+    sip_files = get_sip_files(load(project_name, lazy=True),
+            cache=GenerationCache(cache_dir))
+    assert 'cached' in sip_files.values()
+
+
+def test_modified_sip_file_not_cached(project_name, tmp_path):
+    """ Check that the cache isn't used for a modified .sip file. """
+
+    cache = GenerationCache(str(tmp_path / 'cache'))
+    get_sip_files(load(project_name, lazy=True), cache=cache)
+
+    project = load(project_name, lazy=True)
+    project.modules[0].content[0].content[0].name = 'Renamed'
+
+    assert get_sip_files(project, cache=cache) == get_sip_files(project)
+
+
+def test_generator_fingerprint(project_name, tmp_path, monkeypatch):
+    """ Check that a cache created by a different version of metasip isn't
+    used.
+    """
+
+    cache_dir = str(tmp_path / 'cache')
+    get_sip_files(load(project_name, lazy=True),
+            cache=GenerationCache(cache_dir))
+    cache_files = _cache_files(cache_dir)
+
+    monkeypatch.setattr(generation_cache, '_get_generator_fingerprint',
+            lambda: 'different')
+
+    get_sip_files(load(project_name, lazy=True),
+            cache=GenerationCache(cache_dir))
+
+    # None of the existing files were used so each .sip file was cached again.
+    new_cache_files = set(_cache_files(cache_dir)) - set(cache_files)
+    assert len(new_cache_files) == len(cache_files)
+
+
+def test_trim(project_name, tmp_path):
+    """ Check that trimming the cache removes the least recently used files.
+    """
+
+    cache_dir = str(tmp_path / 'cache')
+    cache = GenerationCache(cache_dir)
+    get_sip_files(load(project_name, lazy=True), cache=cache)
+
+    cache_files = _cache_files(cache_dir)
+    for i, file_name in enumerate(cache_files):
+        os.utime(file_name, ns=(i, i))
+
+    max_size = sum(os.path.getsize(file_name) for file_name in cache_files[-2:])
+    cache = GenerationCache(cache_dir, max_size=max_size)
+
+    # The cache is only trimmed if something has been added to it.
+    cache.trim()
+    assert _cache_files(cache_dir) == cache_files
+
+    with open(cache_files[-1], encoding='UTF-8', newline='') as f:
+        cache.put(os.path.basename(cache_files[-1]), f.read())
+
+    cache.trim()
+    assert _cache_files(cache_dir) == cache_files[-2:]
+
+
+def test_newlines_preserved(tmp_path):
+    """ Check that the contents of the cache are exactly as they were added.
+    """
+
+    fingerprint = 'a' * 64
+    text = 'unix\nwindows\r\nmac\rend'
+
+    cache = GenerationCache(str(tmp_path / 'cache'))
+    cache.put(fingerprint, text)
+
+    assert cache.get(fingerprint) == text
+
+    with open(_cache_files(str(tmp_path / 'cache'))[0], 'rb') as f:
+        assert f.read() == text.encode('UTF-8')
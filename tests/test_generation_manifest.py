@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import json
+import os
+
+import pytest
+
+from metasip.project_io import write_depfile, write_manifest
+
+from helpers import create_project, load
+
+
+def _read(file_name):
+    """ Return the contents of a file. """
+
+    with open(file_name, encoding='UTF-8') as f:
+        return f.read()
+
+
+def test_depfile_escaping(tmp_path):
+    """ Check that the file names in a depfile are escaped. """
+
+    project_dir = tmp_path / 'my $dir#1'
+    project_dir.mkdir()
+    project_name = str(project_dir / 'project.msp')
+    create_project(project_name, nr_modules=1, nr_sip_files=1)
+
+    depfile = str(tmp_path / 'sip.d')
+    assert write_depfile(load(project_name, lazy=True), 'out dir', [],
+            depfile)
+
+    escaped_project_name = project_name.replace('$', '$$').replace('#',
+            '\\#').replace(' ', '\\ ')
+
+    assert _read(depfile) == (
+            'out\\ dir/Mod0/file0_0.sip out\\ dir/Mod0/Mod0mod.sip: \\\n'
+            f'    {escaped_project_name}\n')
+
+
+@pytest.mark.parametrize('sip_files_dir', ['', 'sips'])
+def test_inputs(tmp_path, sip_files_dir):
+    """ Check that the inputs include the .sip files of a split layout. """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir=sip_files_dir)
+    project = load(project_name, lazy=True)
+
+    manifest = str(tmp_path / 'manifest.json')
+    assert write_manifest(project, 'out', [], manifest)
+    inputs = json.loads(_read(manifest))['inputs']
+
+    assert inputs[0] == project_name
+
+    if sip_files_dir:
+        assert inputs[1:] == [
+                str(tmp_path / 'sips' / f'Mod{m}' / f'file{m}_{n}.h.xml')
+                for m in range(2) for n in range(3)]
+
+        for file_name in inputs:
+            assert os.path.isfile(file_name)
+    else:
+        assert len(inputs) == 1
+
+    depfile = str(tmp_path / 'sip.d')
+    assert write_depfile(project, 'out', [], depfile)
+    prerequisites = _read(depfile).split(': \\\n', maxsplit=1)[1]
+
+    assert prerequisites == ' \\\n'.join(f'    {i}' for i in inputs) + '\n'
+
+
+def test_unresolved_import(project_name, tmp_path):
+    """ Check that the import of a module that isn't generated doesn't refer
+    to a file.
+    """
+
+    manifest = str(tmp_path / 'manifest.json')
+    assert write_manifest(load(project_name, lazy=True), 'out', ['Mod0'],
+            manifest)
+    modules = json.loads(_read(manifest))['modules']
+
+    assert [module['name'] for module in modules] == ['Mod1']
+    assert modules[0]['imports'] == [{'module': 'Mod0', 'file': None}]
+
+    assert write_manifest(load(project_name, lazy=True), 'out', [],
+            manifest)
+    modules = json.loads(_read(manifest))['modules']
+
+    assert modules[1]['imports'] == [
+            {'module': 'Mod0', 'file': os.path.join('out', 'Mod0',
+                    'Mod0mod.sip')}]
+
+
+@pytest.mark.parametrize('write', [write_depfile, write_manifest])
+def test_unchanged_not_written(project_name, tmp_path, write):
+    """ Check that an unchanged file isn't written so that its modification
+    time is preserved.
+    """
+
+    file_name = str(tmp_path / 'output')
+    project = load(project_name, lazy=True)
+
+    assert write(project, 'out', [], file_name)
+    contents = _read(file_name)
+    os.utime(file_name, ns=(0, 0))
+
+    assert not write(project, 'out', [], file_name)
+    assert os.stat(file_name).st_mtime_ns == 0
+    assert _read(file_name) == contents
+
+    assert write(project, 'other', [], file_name)
+    assert os.stat(file_name).st_mtime_ns != 0
@@ -0,0 +1,253 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pytest
+
+from metasip.exceptions import UserException
+from metasip.project_io.indent_file import IndentFile
+
+
+def test_nested_indentation():
+    """ Check the indentation of nested lines. """
+
+    output = IndentFile.create(None, indent=4)
+
+    output.write('class A\n{\n')
+    output += 1
+    output.write('class B\n{\n')
+    output += 1
+    output.write('int a;\nint b;\n')
+    output -= 1
+    output.write('};\n')
+    output -= 1
+    output.write('};\n')
+
+    assert output.getvalue() == (
+            'class A\n'
+            '{\n'
+            '    class B\n'
+            '    {\n'
+            '        int a;\n'
+            '        int b;\n'
+            '    };\n'
+            '};\n')
+
+
+def test_indentation_size():
+    """ Check the size of each indentation and the current indentation. """
+
+    output = IndentFile.create(None, indent=2)
+    assert output.indentation == 0
+
+    output += 3
+    assert output.indentation == 6
+
+    output.write('a\n')
+    output -= 2
+    assert output.indentation == 2
+
+    output.write('b\n')
+
+    assert output.getvalue() == '      a\n  b\n'
+
+
+def test_partial_lines():
+    """ Check that only the start of each line is indented. """
+
+    output = IndentFile.create(None)
+    output += 1
+
+    output.write('void f(')
+    output.write('int a')
+    output.write(');\nint ')
+    output.write('b;\n')
+
+    assert output.getvalue() == '    void f(int a);\n    int b;\n'
+
+
+def test_empty_lines_are_indented():
+    """ Check that empty lines within the data are indented. """
+
+    output = IndentFile.create(None)
+    output += 1
+
+    output.write('a\n\nb\n')
+
+    assert output.getvalue() == '    a\n    \n    b\n'
+
+
+def test_no_indent():
+    """ Check that data can be written without indentation. """
+
+    output = IndentFile.create(None)
+    output += 1
+
+    output.write('%If (v2 -)\n', indent=False)
+    output.write('void f();\n')
+    output.write('%End\n', indent=False)
+
+    assert output.getvalue() == '%If (v2 -)\n    void f();\n%End\n'
+
+
+def test_negative_indentation():
+    """ Check that a negative indentation is treated as no indentation. """
+
+    output = IndentFile.create(None)
+    output -= 1
+
+    output.write('a\n')
+    output += 2
+    output.write('b\n')
+
+    assert output.getvalue() == 'a\n    b\n'
+
+
+def test_blank_collapsed():
+    """ Check that consecutive blank lines are collapsed into one. """
+
+    output = IndentFile.create(None)
+
+    output.write('a\n')
+    output.blank()
+    output.blank()
+    output.blank()
+    output.write('b\n')
+
+    assert output.getvalue() == 'a\n\nb\n'
+
+
+def test_blank_suppressed():
+    """ Check that a blank line isn't written at the start or end of an
+    indented block or at the end of the file.
+    """
+
+    output = IndentFile.create(None)
+
+    output.write('{\n')
+    output += 1
+    output.blank()
+    output.write('a;\n')
+    output.blank()
+    output -= 1
+    output.write('}\n')
+    output.blank()
+
+    assert output.getvalue() == '{\n    a;\n}\n'
+
+
+def test_blank_between_blocks():
+    """ Check that a blank line is written between indented blocks. """
+
+    output = IndentFile.create(None)
+
+    output += 1
+    output.write('a;\n')
+    output.blank()
+    output.write('b;\n')
+    output -= 1
+    output.write('c;\n')
+
+    assert output.getvalue() == '    a;\n\n    b;\nc;\n'
+
+
+def test_capture():
+    """ Check that captured output is returned and written once. """
+
+    output = IndentFile.create(None, indent=2)
+
+    output.write('<Project>\n')
+    output += 1
+    output.write('<Module>\n')
+    output += 1
+
+    output.begin_capture()
+    output.write('<SipFile')
+    output.write(' name="a.h"')
+    output.write('>\n')
+    output += 1
+    output.write('<Class/>\n')
+    output -= 1
+    output.write('</SipFile>\n')
+    captured = output.end_capture()
+
+    output -= 1
+    output.write('</Module>\n')
+    output -= 1
+    output.write('</Project>\n')
+
+    assert captured == (
+            '    <SipFile name="a.h">\n'
+            '      <Class/>\n'
+            '    </SipFile>\n')
+
+    assert output.getvalue() == (
+            '<Project>\n'
+            '  <Module>\n'
+            + captured +
+            '  </Module>\n'
+            '</Project>\n')
+
+
+def test_restore_capture():
+    """ Check that captured output written again at the same indentation is
+    the same as the original output.
+    """
+
+    def write_content(output):
+        output.write('<SipFile>\n')
+        output += 1
+        output.write('<Class/>\n')
+        output.blank()
+        output.write('<Function/>\n')
+        output -= 1
+        output.write('</SipFile>\n')
+
+    original = IndentFile.create(None, indent=2)
+    original += 2
+    original.begin_capture()
+    write_content(original)
+    captured = original.end_capture()
+
+    restored = IndentFile.create(None, indent=2)
+    restored += 2
+    restored.write(captured, indent=False)
+
+    assert restored.getvalue() == original.getvalue()
+
+
+def test_file(tmp_path):
+    """ Check that the output written to a file in blocks, including output
+    that is captured across blocks, is the same as the output created in
+    memory.
+    """
+
+    file_name = str(tmp_path / 'output.txt')
+
+    in_memory = IndentFile.create(None)
+    in_file = IndentFile.create(file_name)
+
+    for output in (in_memory, in_file):
+        for i in range(IndentFile._BLOCK_SIZE * 2):
+            if i % 1000 == 0:
+                output.begin_capture()
+
+            output += 1
+            output.write(f'line {i}\n')
+            output -= 1
+
+            if i % 1000 == 999:
+                output.end_capture()
+
+    in_file.close()
+
+    with open(file_name, encoding='UTF-8') as f:
+        assert f.read() == in_memory.getvalue()
+
+
+def test_create_error(tmp_path):
+    """ Check the error when a file can't be created. """
+
+    with pytest.raises(UserException):
+        IndentFile.create(str(tmp_path / 'missing' / 'output.txt'))
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from metasip.project_io import save_project
+
+from helpers import load
+
+
+def test_content_is_deferred(project_name):
+    """ Check that the content of a .sip file is only loaded when accessed. """
+
+    project = load(project_name, lazy=True)
+    sip_file = project.modules[0].content[1]
+
+    assert sip_file.content_loader is not None
+    assert sip_file.name == 'file0_1.h'
+    assert sip_file.content_loader is not None
+
+    assert len(sip_file.content) == 3
+    assert sip_file.modulecode == '// Module code.'
+    assert sip_file.content_loader is None
+
+
+def test_rename_then_save(project_name):
+    """ Check that renaming a .sip file whose content hasn't been loaded isn't
+    undone when the content is loaded.
+    """
+
+    project = load(project_name, lazy=True)
+    sip_file = project.modules[0].content[1]
+
+    sip_file.name = 'renamed.h'
+    assert sip_file.name == 'renamed.h'
+
+    save_project(project)
+    assert sip_file.name == 'renamed.h'
+
+    reloaded = load(project_name)
+    sip_file = reloaded.modules[0].content[1]
+    assert sip_file.name == 'renamed.h'
+    assert len(sip_file.content) == 3
+
+
+def test_rename_then_access_content(project_name):
+    """ Check that loading the content of a renamed .sip file doesn't change
+    its name.
+    """
+
+    project = load(project_name, lazy=True)
+    sip_file = project.modules[1].content[0]
+
+    sip_file.name = 'renamed.h'
+    assert len(sip_file.content) == 3
+    assert sip_file.name == 'renamed.h'
+
+
+def test_save_unloaded(project_name):
+    """ Check that saving a lazily loaded project doesn't change it. """
+
+    with open(project_name, 'rb') as f:
+        original = f.read()
+
+    project = load(project_name, lazy=True)
+    save_project(project)
+
+    with open(project_name, 'rb') as f:
+        assert f.read() == original
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import builtins
+import os
+from xml.etree import ElementTree
+
+import pytest
+
+from metasip.models import SipFile
+from metasip.project_io import get_sip_files, save_project
+
+from helpers import RecordingUi, create_project, load
+
+
+@pytest.mark.parametrize('extension', ['', '.gz', '.xz'])
+def test_streaming_progress(tmp_path, monkeypatch, extension):
+    """ Check the progress of a streaming load and that the project file is
+    only read once.
+    """
+
+    project_name = str(tmp_path / ('project.msp' + extension))
+    project = create_project(project_name)
+
+    # Make sure that even a compressed project file is several blocks.
+    project.modules[0].content.append(
+            SipFile(name='random.h', modulecode=os.urandom(200000).hex()))
+    save_project(project)
+    expected = get_sip_files(load(project_name, streaming=False))
+
+    nr_bytes_read = [0]
+    builtins_open = builtins.open
+
+    class CountingFile:
+        """ A file that counts the number of bytes read. """
+
+        def __init__(self, f):
+            self._f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            self._f.close()
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+        def read(self, size=-1):
+            data = self._f.read(size)
+            nr_bytes_read[0] += len(data)
+
+            return data
+
+    def counting_open(file, *args, **kwargs):
+        f = builtins_open(file, *args, **kwargs)
+
+        return CountingFile(f) if file == project_name else f
+
+    monkeypatch.setattr(builtins, 'open', counting_open)
+
+    ui = RecordingUi()
+    project = load(project_name, ui=ui)
+
+    # Allow for the start of the file being read to check its layout.
+    file_size = os.path.getsize(project_name)
+    assert nr_bytes_read[0] <= file_size + 65536
+
+    assert ui.load_nr_steps == file_size // 65536 + 1
+    assert ui.load_steps == ui.load_nr_steps
+
+    assert get_sip_files(project) == expected
+
+
+@pytest.mark.parametrize('sip_files_dir', ['', 'sips'])
+@pytest.mark.parametrize('jobs', [2, 3])
+def test_parallel(tmp_path, sip_files_dir, jobs):
+    """ Check that loading modules in parallel gives the same project as
+    loading them serially.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, nr_modules=5, sip_files_dir=sip_files_dir)
+
+    expected = load(project_name)
+
+    ui = RecordingUi()
+    project = load(project_name, ui=ui, jobs=jobs)
+
+    assert [module.name for module in project.modules] == [
+            'Mod0', 'Mod1', 'Mod2', 'Mod3', 'Mod4']
+    assert project.versions == expected.versions
+    assert project.modules == expected.modules
+    assert get_sip_files(project) == get_sip_files(expected)
+
+    assert ui.load_steps == ui.load_nr_steps
+
+
+@pytest.mark.parametrize('old, new', [
+        ('<Class name="Klass"', '<Class name="Klass" <'),
+        ('<Module name="Mod1"', '<Module name="Mod1" <')],
+        ids=['content', 'module'])
+def test_parallel_parse_error(tmp_path, old, new):
+    """ Check that an error loading a module in parallel is reported in the
+    same way as when loading it serially.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name)
+
+    # Break the last occurrence, which is in the last module.
+    with open(project_name) as f:
+        xml = f.read()
+
+    start = xml.rindex(old)
+
+    with open(project_name, 'w') as f:
+        f.write(xml[:start] + new + xml[start + len(old):])
+
+    with pytest.raises(ElementTree.ParseError) as expected:
+        load(project_name)
+
+    with pytest.raises(ElementTree.ParseError) as e:
+        load(project_name, jobs=2)
+
+    assert e.value.position == expected.value.position
+    assert e.value.code == expected.value.code
+    assert str(e.value) == str(expected.value)
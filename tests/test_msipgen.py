@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+import sys
+
+import pytest
+
+# The version module is created when metasip is built.
+pytest.importorskip('metasip._version')
+
+from metasip.main import main
+
+
+def _msipgen(monkeypatch, *args):
+    """ Run msipgen with some command line arguments and return the exit code.
+    """
+
+    monkeypatch.setattr(sys, 'argv', ['msipgen'] + list(args))
+
+    try:
+        return main()
+    except SystemExit as e:
+        return e.code
+
+
+def test_generation_cache(project_name, tmp_path, monkeypatch):
+    """ Check that the generation cache is used. """
+
+    cache_dir = str(tmp_path / 'cache')
+    output_dir = str(tmp_path / 'output')
+
+    assert _msipgen(monkeypatch, '--generation-cache', cache_dir,
+            '--output-dir', output_dir, project_name) == 0
+
+    assert len(os.listdir(cache_dir)) != 0
+    assert os.path.isfile(os.path.join(output_dir, 'Mod0', 'Mod0mod.sip'))
+
+
+def test_generation_cache_needs_dir(project_name, tmp_path, monkeypatch):
+    """ Check that the directory of the generation cache must be specified so
+    that the project isn't taken as the directory.
+    """
+
+    assert _msipgen(monkeypatch, '--output-dir', str(tmp_path / 'output'),
+            '--generation-cache', project_name) != 0
+    assert _msipgen(monkeypatch, '--output-dir', str(tmp_path / 'output'),
+            project_name, '--generation-cache') != 0
+
+
+def test_check(project_name, tmp_path, monkeypatch, capsys):
+    """ Check that --check reports .sip files that are out of date. """
+
+    output_dir = str(tmp_path / 'output')
+
+    assert _msipgen(monkeypatch, '--output-dir', output_dir,
+            project_name) == 0
+    assert _msipgen(monkeypatch, '--check', '--output-dir', output_dir,
+            project_name) == 0
+
+    os.remove(os.path.join(output_dir, 'Mod1', 'file1_0.sip'))
+    capsys.readouterr()
+
+    assert _msipgen(monkeypatch, '--check', '--output-dir', output_dir,
+            project_name) == 1
+    assert 'file1_0.sip' in capsys.readouterr().out
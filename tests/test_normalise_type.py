@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pytest
+
+from metasip.models import Argument, Method
+from metasip.models.adapters import adapt
+from metasip.models.adapters.base_adapter import BaseAdapter
+from metasip.project_io import get_sip_files
+
+from helpers import load
+
+
+@pytest.mark.parametrize('type, expected', [
+        ('', ''),
+        ('int', 'int'),
+        ('long int', 'long'),
+        ('unsigned long int', 'unsigned long'),
+        ('QMap<QString,QVariant>', 'QMap<QString, QVariant>'),
+        ('const QList< int > &', 'const QList<int> &'),
+        ('std::array<int, 3 >', 'std::array<int, 3>'),
+        ('QPair<int , int >', 'QPair<int, int>'),
+        ('QMap<QString, QPair<int , int > >',
+                'QMap<QString, QPair<int, int>>'),
+        ('QList<QPair<int , int > > &', 'QList<QPair<int, int>> &'),
+        ('QHash< QString , QList<int> > *', 'QHash<QString, QList<int>> *'),
+        ('A<B>::C<D,E>', 'A<B>::C<D, E>'),
+        ('QVector<QPair<int,int>>::iterator',
+                'QVector<QPair<int, int>>::iterator'),
+        ('std::function<void (int,int)>', 'std::function<void (int, int)>'),
+        ('Foo<(a,b)>', 'Foo<(a, b)>'),
+        ('void (*)(int , char)', 'void (*)(int , char)'),
+        ('Broken<int', 'Broken<int'),
+        ('Broken<int)>', 'Broken<int)>'),
+        ('<int>', '<int>'),
+    ])
+def test_normalise_type(type, expected):
+    """ Check the normalised form of a type. """
+
+    assert BaseAdapter.normalise_type(type) == expected
+
+
+def test_idempotent():
+    """ Check that a normalised type is unchanged when normalised again. """
+
+    normalised = BaseAdapter.normalise_type('QMap<QString, QPair<int , int > >')
+
+    assert BaseAdapter.normalise_type(normalised) is normalised
+
+
+def test_interned():
+    """ Check that types that are the same when normalised are identical even
+    if they are no longer cached.
+    """
+
+    # Make sure the strings are not the same object.
+    first = BaseAdapter.normalise_type(''.join(['QPair<int,', 'int >']))
+
+    BaseAdapter.normalise_type.cache_clear()
+
+    second = BaseAdapter.normalise_type(''.join(['QPair< int', ' , int>']))
+
+    assert first == 'QPair<int, int>'
+    assert second is first
+
+
+def test_argument_equality():
+    """ Check that arguments whose types are the same when normalised are
+    equal.
+    """
+
+    arg = Argument(type='QMap<QString, QPair<int , int > >')
+    same = Argument(type='QMap<QString,QPair<int,int>>')
+    different = Argument(type='QMap<QString, QPair<int, long>>')
+
+    assert adapt(arg) == adapt(same)
+    assert not adapt(arg) == adapt(different)
+
+    method = Method(name='method', args=[arg])
+    same_method = Method(name='method', args=[same])
+
+    assert adapt(method) == adapt(same_method)
+
+
+# The .sip file generated for the first .sip file of the test project.
+_GOLDEN_SIP_FILE = '''// file0_0.sip generated by MetaSIP
+//
+// This file is part of the Mod0 Python extension module.
+//
+// Copyright & <stuff>
+
+
+%ModuleCode
+#include <file0_0.h>
+%End
+
+class Klass : public QObject
+{
+%Docstring
+A "quoted" docstring.
+%End
+
+%TypeHeaderCode
+#include <file0_0.h>
+%End
+
+public:
+    Klass(QObject *parent = nullptr);
+%If (v2 -)
+    QMap<QString, QVariant> values() const;
+%End
+%If (Linux)
+%If (FA)
+    void pairs(QList<QPair<int, int>> &);
+%End
+%End
+
+    enum Enum
+    {
+        Value,
+    };
+};
+
+%If (!FB)
+long function(int a = 0);
+%End
+typedef QList<int> IntList;
+
+%ModuleCode
+// Module code.
+%End
+'''
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_generated_sip_file(project_name, jobs):
+    """ Check the types in a generated .sip file. """
+
+    sip_files = get_sip_files(load(project_name), jobs=jobs)
+
+    assert sip_files['Mod0/file0_0.sip'] == _GOLDEN_SIP_FILE
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import importlib
+import os
+
+import pytest
+
+from metasip.models import Function
+from metasip.project_io import get_sip_files, save_project
+from metasip.project_io.project_cache import project_cache_name
+
+from helpers import create_project, load
+
+
+@pytest.fixture
+def cache_reads(monkeypatch):
+    """ The list of the results of every read of a cache file. """
+
+    # Note that the module is shadowed by the function of the same name.
+    load_project_module = importlib.import_module(
+            'metasip.project_io.load_project')
+
+    reads = []
+    read_project_cache = load_project_module.read_project_cache
+
+    def recording_read_project_cache(project, signature):
+        valid = read_project_cache(project, signature)
+        reads.append(valid)
+
+        return valid
+
+    monkeypatch.setattr(load_project_module, 'read_project_cache',
+            recording_read_project_cache)
+
+    return reads
+
+
+@pytest.mark.parametrize('sip_files_dir', ['', 'sips'])
+def test_round_trip(tmp_path, cache_reads, sip_files_dir):
+    """ Check that a project loaded from its cache file is the same as the
+    project loaded from its project file.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir=sip_files_dir)
+
+    expected = load(project_name)
+
+    first = load(project_name, cache=True)
+    assert os.path.isfile(project_cache_name(first))
+
+    second = load(project_name, cache=True)
+
+    assert cache_reads == [False, True]
+
+    for project in (first, second):
+        assert project.name == project_name
+        assert not project.dirty
+        assert project.versions == expected.versions
+        assert project.modules == expected.modules
+        assert get_sip_files(project) == get_sip_files(expected)
+
+
+@pytest.mark.parametrize('sip_files_dir', ['', 'sips'])
+def test_invalidated_by_save(tmp_path, cache_reads, sip_files_dir):
+    """ Check that the cache file is replaced when the project is changed. """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir=sip_files_dir)
+
+    project = load(project_name, cache=True)
+    project.modules[1].content[2].content.append(Function(name='added'))
+    save_project(project)
+
+    expected = get_sip_files(project)
+
+    assert get_sip_files(load(project_name, cache=True)) == expected
+    assert get_sip_files(load(project_name, cache=True)) == expected
+
+    assert cache_reads == [False, False, True]
+
+
+def test_invalidated_by_touch(project_name, cache_reads):
+    """ Check that the cache file isn't used if the project file has been
+    modified even if its contents are the same.
+    """
+
+    load(project_name, cache=True)
+
+    os.utime(project_name, ns=(0, 0))
+    load(project_name, cache=True)
+
+    assert cache_reads == [False, False]
+
+
+def test_corrupt(project_name, cache_reads):
+    """ Check that a corrupt cache file is replaced. """
+
+    expected = get_sip_files(load(project_name))
+
+    load(project_name, cache=True)
+
+    cache_name = project_cache_name(load(project_name))
+    with open(cache_name, 'r+b') as f:
+        f.truncate(os.path.getsize(cache_name) // 2)
+
+    assert get_sip_files(load(project_name, cache=True)) == expected
+    assert get_sip_files(load(project_name, cache=True)) == expected
+
+    assert cache_reads == [False, False, True]
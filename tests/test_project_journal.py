@@ -0,0 +1,215 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+
+import pytest
+
+from metasip.models import Function, SipFile
+from metasip.project_io import (ProjectJournal, get_sip_files, replay_journal,
+        save_project)
+from metasip.project_io.project_journal import get_journal_name
+
+from helpers import create_project, load
+
+
+@pytest.fixture(params=['', 'sips'], ids=['monolithic', 'split'])
+def journaled_project_name(tmp_path, request):
+    """ The name of the project file of a small project with either layout.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir=request.param)
+
+    return project_name
+
+
+def _crash_and_recover(project_name):
+    """ Return the project recovered from its journal after a crash. """
+
+    project = load(project_name, lazy=True)
+    assert replay_journal(project)
+
+    return project
+
+
+def _save_and_reload(project):
+    """ Save a project and return it reloaded. """
+
+    save_project(project)
+
+    return load(project.name)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_rename(journaled_project_name, lazy):
+    """ Check that a journaled rename of a .sip file is recovered. """
+
+    project = load(journaled_project_name, lazy=lazy)
+    journal = ProjectJournal(project)
+
+    project.modules[0].content[1].name = 'renamed.h'
+    journal.record()
+
+    # Note that the journal isn't closed.
+    recovered = _crash_and_recover(journaled_project_name)
+    assert recovered.modules[0].content[1].name == 'renamed.h'
+
+    reloaded = _save_and_reload(recovered)
+    assert [sip_file.name for sip_file in reloaded.modules[0].content] == [
+            'file0_0.h', 'renamed.h', 'file0_2.h']
+    assert len(reloaded.modules[0].content[1].content) == 3
+
+
+def test_modify_content(journaled_project_name):
+    """ Check that a journaled change to the content of a .sip file is
+    recovered.
+    """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    project.modules[1].content[2].content.append(Function(name='added'))
+    journal.record()
+
+    expected = get_sip_files(project)
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert get_sip_files(recovered) == expected
+
+    reloaded = _save_and_reload(recovered)
+    assert get_sip_files(reloaded) == expected
+
+
+def test_modify_project(journaled_project_name):
+    """ Check that journaled changes to the project and its modules are
+    recovered.
+    """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    project.modules[0].name = 'Renamed'
+    project.modules[1].content.append(SipFile(name='new.h'))
+    del project.modules[1].content[0]
+    project.versions.append('v4')
+    journal.record()
+
+    expected = get_sip_files(project)
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert recovered.versions == ['v1', 'v2', 'v3', 'v4']
+    assert get_sip_files(recovered) == expected
+
+    reloaded = _save_and_reload(recovered)
+    assert get_sip_files(reloaded) == expected
+
+
+def test_several_records(journaled_project_name):
+    """ Check that only the latest of several records is recovered. """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    sip_file = project.modules[0].content[0]
+
+    sip_file.name = 'first.h'
+    journal.record()
+
+    sip_file.name = 'second.h'
+    sip_file.content.append(Function(name='added'))
+    journal.record()
+
+    expected = get_sip_files(project)
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert recovered.modules[0].content[0].name == 'second.h'
+    assert get_sip_files(recovered) == expected
+
+
+def test_no_changes(journaled_project_name):
+    """ Check that nothing is recorded if nothing has changed. """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    size = journal.record()
+
+    # Loading the content isn't a change.
+    assert len(project.modules[0].content[0].content) == 3
+    assert journal.record() == size
+
+    assert not replay_journal(load(journaled_project_name))
+
+
+def test_incomplete_record(journaled_project_name):
+    """ Check that an incomplete record at the end of a journal (because of a
+    crash while it was being written) is ignored.
+    """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    project.modules[0].content[0].name = 'complete.h'
+    size = journal.record()
+
+    project.modules[0].content[0].name = 'incomplete.h'
+    journal.record()
+    journal.close()
+
+    journal_name = get_journal_name(journaled_project_name)
+    with open(journal_name, 'r+b') as f:
+        f.truncate(size + 10)
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert recovered.modules[0].content[0].name == 'complete.h'
+
+    # A continued journal discards the incomplete record.
+    journal = ProjectJournal(recovered)
+    recovered.modules[0].content[1].name = 'continued.h'
+    journal.record()
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert [sip_file.name for sip_file in recovered.modules[0].content] == [
+            'complete.h', 'continued.h', 'file0_2.h']
+
+
+def test_saved_compacts_journal(journaled_project_name):
+    """ Check that saving a project removes the changes it contains from the
+    journal.
+    """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    project.modules[0].content[0].name = 'saved.h'
+    size = journal.record()
+    save_project(project)
+
+    project.modules[0].content[1].name = 'unsaved.h'
+    journal.record()
+
+    journal.saved(size)
+
+    recovered = _crash_and_recover(journaled_project_name)
+    assert [sip_file.name for sip_file in recovered.modules[0].content] == [
+            'saved.h', 'unsaved.h', 'file0_2.h']
+
+    journal.saved(journal.record())
+    assert not os.path.exists(get_journal_name(journaled_project_name))
+
+
+def test_discard(journaled_project_name):
+    """ Check that a discarded journal isn't replayed. """
+
+    project = load(journaled_project_name, lazy=True)
+    journal = ProjectJournal(project)
+
+    project.modules[0].content[0].name = 'discarded.h'
+    journal.record()
+    journal.discard()
+
+    assert not os.path.exists(get_journal_name(journaled_project_name))
+    assert not replay_journal(load(journaled_project_name))
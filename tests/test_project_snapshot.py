@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+
+import pytest
+
+from metasip.exceptions import UserException
+from metasip.project_io import AbstractProjectUi, ProjectSnapshot
+
+from helpers import RecordingUi, create_project, load
+
+
+@pytest.mark.parametrize('sip_files_dir', ['', 'sips'])
+@pytest.mark.parametrize('lazy', [False, True])
+def test_progress(tmp_path, sip_files_dir, lazy):
+    """ Check the progress of taking a snapshot and that it doesn't change the
+    saved project.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir=sip_files_dir)
+
+    with open(project_name, 'rb') as f:
+        original = f.read()
+
+    project = load(project_name, lazy=lazy)
+    ui = RecordingUi()
+    snapshot = ProjectSnapshot(project, ui=ui)
+
+    # Loading and saving each .sip file are separate steps, except that the
+    # .sip files of a lazily loaded project file are saved as they were loaded.
+    nr_steps = 12 if sip_files_dir else (0 if lazy else 6)
+    assert ui.save_nr_steps == nr_steps
+    assert ui.save_steps == nr_steps
+
+    snapshot.write()
+
+    with open(project_name, 'rb') as f:
+        assert f.read() == original
+
+
+def test_unloaded_content_is_reused(project_name):
+    """ Check that the content of .sip files that haven't been loaded isn't
+    loaded to take a snapshot and that it can still be loaded once the project
+    file has been overwritten.
+    """
+
+    project = load(project_name, lazy=True)
+    project.modules[0].content[1].modulecode = '// Modified.'
+
+    ui = RecordingUi()
+    snapshot = ProjectSnapshot(project, ui=ui)
+
+    # Only the modified .sip file is saved.
+    assert ui.save_nr_steps == 1
+
+    sip_files = [sip_file for module in project.modules
+            for sip_file in module.content]
+    unloaded = [sip_file for sip_file in sip_files
+            if sip_file.content_loader is not None]
+    assert len(unloaded) == len(sip_files) - 1
+
+    snapshot.write()
+
+    # Modify the project file so that any content that was reused must have
+    # been kept.
+    reloaded = load(project_name)
+    reloaded.modules[1].content[2].modulecode = '// Replaced.'
+    ProjectSnapshot(reloaded).write()
+
+    assert project.modules[1].content[2].modulecode == '// Module code.'
+
+    for sip_file, expected in zip(sip_files,
+            (sip_file for module in load(project_name).modules
+                    for sip_file in module.content)):
+        if sip_file is not project.modules[1].content[2]:
+            assert len(sip_file.content) == len(expected.content)
+            assert sip_file.modulecode == expected.modulecode
+
+
+def test_optional_progress(project_name):
+    """ Check that a user interface doesn't need to show the progress of
+    taking a snapshot.
+    """
+
+    class Ui(AbstractProjectUi):
+        def error_creating_file(self, title, text, detail):
+            raise AssertionError(text)
+
+        def load_starting(self, project, nr_steps):
+            pass
+
+        def load_step(self):
+            pass
+
+        def update_project_format(self, root_element, from_version,
+                to_version):
+            return True
+
+        def warn_minor_version_update(self, from_version, to_version):
+            pass
+
+    project = load(project_name)
+    project.modules[0].content[0].name = 'saved.h'
+    ProjectSnapshot(project, ui=Ui()).write()
+
+    assert load(project_name).modules[0].content[0].name == 'saved.h'
+
+
+def test_snapshot_is_independent(project_name):
+    """ Check that a snapshot isn't affected by subsequent changes to the
+    project.
+    """
+
+    project = load(project_name, lazy=True)
+    project.modules[0].content[0].name = 'snapshot.h'
+    snapshot = ProjectSnapshot(project)
+
+    project.modules[0].content[0].name = 'later.h'
+    snapshot.write()
+
+    reloaded = load(project_name)
+    assert reloaded.modules[0].content[0].name == 'snapshot.h'
+
+
+def test_write_is_atomic(project_name, monkeypatch):
+    """ Check that the project file is unchanged if it can't be written. """
+
+    with open(project_name, 'rb') as f:
+        original = f.read()
+
+    project = load(project_name)
+    project.modules[0].content[0].name = 'unsaved.h'
+    snapshot = ProjectSnapshot(project)
+
+    def failing_fsync(fd):
+        raise OSError("fsync failed")
+
+    monkeypatch.setattr(os, 'fsync', failing_fsync)
+
+    with pytest.raises(UserException):
+        snapshot.write()
+
+    with open(project_name, 'rb') as f:
+        assert f.read() == original
+
+    assert os.listdir(os.path.dirname(project_name)) == ['project.msp']
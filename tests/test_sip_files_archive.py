@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+import stat
+import tarfile
+import time
+import zipfile
+
+import pytest
+
+from metasip.exceptions import UserException
+from metasip.project_io import (get_sip_files, iter_sip_files,
+        write_sip_files_archive)
+
+from helpers import load
+
+
+def _read_archive(archive_name):
+    """ Return a dict of the decoded contents of the members of an archive
+    keyed by their names.
+    """
+
+    if archive_name.endswith('.zip'):
+        with zipfile.ZipFile(archive_name) as zf:
+            return {name: zf.read(name).decode('UTF-8')
+                    for name in zf.namelist()}
+
+    with tarfile.open(archive_name) as tf:
+        return {member.name: tf.extractfile(member).read().decode('UTF-8')
+                for member in tf.getmembers()}
+
+
+@pytest.mark.parametrize('extension', ['.zip', '.tar', '.tar.gz', '.tar.xz'])
+def test_round_trip(project_name, tmp_path, monkeypatch, extension):
+    """ Check that an archive contains the generated .sip files and that it is
+    the same when written again.
+    """
+
+    project = load(project_name)
+    expected = get_sip_files(project)
+
+    archive_name = str(tmp_path / ('sip' + extension))
+    write_sip_files_archive(archive_name, iter_sip_files(project))
+
+    assert _read_archive(archive_name) == expected
+
+    # The member names use '/' on all platforms.
+    assert list(_read_archive(archive_name)) == list(expected)
+
+    with open(archive_name, 'rb') as f:
+        archive = f.read()
+
+    # Make sure the archive doesn't depend on the time it is written.
+    later = time.time() + 1000000
+    monkeypatch.setattr(time, 'time', lambda: later)
+
+    again_name = str(tmp_path / ('again' + extension))
+    write_sip_files_archive(again_name, iter_sip_files(load(project_name)))
+
+    with open(again_name, 'rb') as f:
+        assert f.read() == archive
+
+
+@pytest.mark.parametrize('extension', ['.rar', '.zip.gz', '.gz', ''])
+def test_unsupported_extension(tmp_path, extension):
+    """ Check that an archive with an unsupported extension isn't written. """
+
+    archive_name = str(tmp_path / ('sip' + extension))
+
+    with pytest.raises(UserException):
+        write_sip_files_archive(archive_name, [('Mod/mod.sip', '')])
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize('extension', ['.zip', '.tar.gz'])
+def test_failed_generation(tmp_path, extension):
+    """ Check that an existing archive is left unchanged if the generation of
+    the .sip files fails.
+    """
+
+    archive_name = str(tmp_path / ('sip' + extension))
+    write_sip_files_archive(archive_name, [('Mod/mod.sip', 'original')])
+
+    def failing_sip_files():
+        yield 'Mod/mod.sip', 'replaced'
+        raise UserException("generation failed")
+
+    with pytest.raises(UserException) as e:
+        write_sip_files_archive(archive_name, failing_sip_files())
+
+    assert e.value.text == "generation failed"
+    assert _read_archive(archive_name) == {'Mod/mod.sip': 'original'}
+    assert os.listdir(tmp_path) == [os.path.basename(archive_name)]
+
+
+def test_mode(tmp_path):
+    """ Check that a new archive has the mode of a newly created file and that
+    a replaced archive keeps its mode.
+    """
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    archive_name = str(tmp_path / 'sip.zip')
+    write_sip_files_archive(archive_name, [('Mod/mod.sip', 'original')])
+
+    assert stat.S_IMODE(os.stat(archive_name).st_mode) == 0o666 & ~umask
+
+    os.chmod(archive_name, 0o640)
+    write_sip_files_archive(archive_name, [('Mod/mod.sip', 'replaced')])
+
+    assert stat.S_IMODE(os.stat(archive_name).st_mode) == 0o640
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import os
+
+import pytest
+
+from metasip.project_io import convert_project, get_sip_files, save_project
+
+from helpers import create_project, load
+
+
+@pytest.fixture
+def split_project_name(tmp_path):
+    """ The name of the project file of a small project with a split layout.
+    """
+
+    project_name = str(tmp_path / 'project.msp')
+    create_project(project_name, sip_files_dir='sips')
+
+    return project_name
+
+
+def _sip_file_names(project_name, module_name):
+    """ Return the sorted names of the files containing the content of the
+    .sip files of a module.
+    """
+
+    return sorted(
+            os.listdir(
+                    os.path.join(os.path.dirname(project_name), 'sips',
+                            module_name)))
+
+
+def test_layout(split_project_name):
+    """ Check the files of a project with a split layout. """
+
+    assert _sip_file_names(split_project_name, 'Mod0') == [
+            'file0_0.h.xml', 'file0_1.h.xml', 'file0_2.h.xml']
+
+    with open(split_project_name) as f:
+        assert '<Class ' not in f.read()
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_rename_then_save_then_reload(split_project_name, lazy):
+    """ Check that a renamed .sip file is saved with its new name and the file
+    with its old name is removed.
+    """
+
+    project = load(split_project_name, lazy=lazy)
+    project.modules[0].content[1].name = 'newname.h'
+    save_project(project)
+
+    assert _sip_file_names(split_project_name, 'Mod0') == [
+            'file0_0.h.xml', 'file0_2.h.xml', 'newname.h.xml']
+
+    for reload_lazy in (False, True):
+        reloaded = load(split_project_name, lazy=reload_lazy)
+        sip_file = reloaded.modules[0].content[1]
+
+        assert sip_file.name == 'newname.h'
+        assert len(sip_file.content) == 3
+
+
+def test_remove_then_save(split_project_name):
+    """ Check that the file of a removed .sip file is removed. """
+
+    project = load(split_project_name, lazy=True)
+    del project.modules[1].content[0]
+    save_project(project)
+
+    assert _sip_file_names(split_project_name, 'Mod1') == [
+            'file1_1.h.xml', 'file1_2.h.xml']
+
+    reloaded = load(split_project_name)
+    assert [sip_file.name for sip_file in reloaded.modules[1].content] == [
+            'file1_1.h', 'file1_2.h']
+
+
+def test_unchanged_files_not_written(split_project_name):
+    """ Check that the files of .sip files that haven't changed are not
+    written.
+    """
+
+    dir_name = os.path.join(os.path.dirname(split_project_name), 'sips',
+            'Mod0')
+    unchanged = os.path.join(dir_name, 'file0_0.h.xml')
+    changed = os.path.join(dir_name, 'file0_1.h.xml')
+
+    os.utime(unchanged, ns=(0, 0))
+    os.utime(changed, ns=(0, 0))
+
+    project = load(split_project_name, lazy=True)
+    project.modules[0].content[1].content[0].name = 'Renamed'
+    save_project(project)
+
+    assert os.stat(unchanged).st_mtime_ns == 0
+    assert os.stat(changed).st_mtime_ns != 0
+
+
+def test_convert(project_name):
+    """ Check that converting a project to a split layout and back doesn't
+    change it.
+    """
+
+    with open(project_name, 'rb') as f:
+        original = f.read()
+
+    project = load(project_name)
+    sip_files = get_sip_files(project)
+
+    convert_project(project, 'sips')
+
+    split = load(project_name, lazy=True)
+    assert get_sip_files(split) == sip_files
+
+    convert_project(split, '')
+
+    with open(project_name, 'rb') as f:
+        assert f.read() == original
+
+    assert not os.path.exists(
+            os.path.join(os.path.dirname(project_name), 'sips'))
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+import pytest
+
+from metasip.exceptions import UserException
+from metasip.models import VersionRange
+from metasip.project_io import TagResolver, get_sip_files
+
+from helpers import load
+
+
+def _get_sip_file(project, **kwargs):
+    """ Return the contents of the first .sip file generated with a tag
+    resolver.
+    """
+
+    sip_files = get_sip_files(project,
+            tag_resolver=TagResolver(project, **kwargs))
+
+    return sip_files['Mod0/file0_0.sip']
+
+
+def test_unresolved(project_name):
+    """ Check the tags of the .sip file when nothing is resolved. """
+
+    project = load(project_name)
+    sip_file = get_sip_files(project)['Mod0/file0_0.sip']
+
+    assert '%If (v2 -)' in sip_file
+    assert '%If (Linux)' in sip_file
+    assert '%If (FA)' in sip_file
+    assert '%If (!FB)' in sip_file
+
+
+def test_resolve_version(project_name):
+    """ Check resolving a version. """
+
+    project = load(project_name)
+
+    sip_file = _get_sip_file(project, version='v1')
+    assert 'values()' not in sip_file
+    assert '%If (v' not in sip_file
+
+    sip_file = _get_sip_file(project, version='v2')
+    assert 'values()' in sip_file
+    assert '%If (v' not in sip_file
+
+
+def test_resolve_platform(project_name):
+    """ Check resolving a platform. """
+
+    project = load(project_name)
+
+    assert 'pairs(' in _get_sip_file(project, platform='Linux')
+    assert '%If (Linux)' not in _get_sip_file(project, platform='Linux')
+    assert 'pairs(' not in _get_sip_file(project, platform='Windows')
+
+
+def test_resolve_features(project_name):
+    """ Check resolving features. """
+
+    project = load(project_name)
+
+    sip_file = _get_sip_file(project, enabled_features=['FB'])
+    assert 'function(' not in sip_file
+    assert '%If (FA)' in sip_file
+
+    sip_file = _get_sip_file(project, disabled_features=['FB'])
+    assert 'function(' in sip_file
+    assert '%If (!FB)' not in sip_file
+
+
+@pytest.mark.parametrize('kwargs', [
+        {'version': 'v9'},
+        {'platform': 'macOS'},
+        {'enabled_features': ['FC']},
+        {'enabled_features': ['FA'], 'disabled_features': ['FA']}])
+def test_invalid_settings(project_name, kwargs):
+    """ Check that invalid settings are rejected when the resolver is created.
+    """
+
+    project = load(project_name)
+
+    with pytest.raises(UserException):
+        TagResolver(project, **kwargs)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+@pytest.mark.parametrize('vrange', [
+        VersionRange(startversion='v9'),
+        VersionRange(endversion='v9')])
+def test_unknown_version_in_range(project_name, jobs, vrange):
+    """ Check that a version range with an unknown version is an error rather
+    than being widened.
+    """
+
+    project = load(project_name)
+    project.modules[0].content[0].content[0].versions = [vrange]
+
+    with pytest.raises(UserException) as e:
+        get_sip_files(project, jobs=jobs,
+                tag_resolver=TagResolver(project, version='v2'))
+
+    assert "'v9'" in e.value.text
@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Copyright (c) 2024 Phil Thompson <phil@riverbankcomputing.com>
+
+
+from itertools import product
+
+import pytest
+
+from metasip.helpers import VersionMap
+from metasip.models import Function, Module, Project, SipFile, VersionRange
+from metasip.project_io import get_sip_files
+
+
+_VERSIONS = ['v1', 'v2', 'v3', 'v4', 'v5']
+
+
+def _project(versions=_VERSIONS):
+    """ Return a project with a list of versions. """
+
+    return Project(versions=list(versions))
+
+
+def _ranges(*ranges):
+    """ Return a list of version ranges from (start, end) 2-tuples. """
+
+    return [VersionRange(startversion=start, endversion=end)
+            for start, end in ranges]
+
+
+def _as_tuples(version_ranges):
+    """ Return a list of version ranges as (start, end) 2-tuples. """
+
+    if version_ranges is None:
+        return None
+
+    return [(vr.startversion, vr.endversion) for vr in version_ranges]
+
+
+def _enabled(vmap):
+    """ Return the list of the versions that are enabled in a version map. """
+
+    return [version for version in _VERSIONS if vmap[version]]
+
+
+def test_empty_and_all():
+    """ Check the version ranges of an empty map and of a map of all
+    versions.
+    """
+
+    project = _project()
+
+    vmap = VersionMap(project)
+    assert not vmap
+    assert vmap.as_version_ranges() is None
+
+    # No version ranges means all versions.
+    vmap = VersionMap(project, [])
+    assert vmap
+    assert vmap.as_version_ranges() == []
+
+    vmap = VersionMap(project, _ranges(('', 'v3'), ('v3', '')))
+    assert vmap
+    assert vmap.as_version_ranges() == []
+
+
+@pytest.mark.parametrize('ranges, expected', [
+        ((('', 'v2'), ), [('', 'v2')]),
+        ((('v4', ''), ), [('v4', '')]),
+        ((('v2', 'v4'), ), [('v2', 'v4')]),
+        ((('', 'v2'), ('v2', 'v3')), [('', 'v3')]),
+        ((('v2', 'v4'), ('v3', 'v5')), [('v2', 'v5')]),
+        ((('v3', 'v5'), ('', 'v2')), [('', 'v2'), ('v3', 'v5')]),
+        ((('', 'v2'), ('v5', '')), [('', 'v2'), ('v5', '')]),
+        ((('v3', 'v3'), ), None),
+        ((('v4', 'v2'), ), None),
+    ])
+def test_merge(ranges, expected):
+    """ Check that version ranges are merged and normalised. """
+
+    vmap = VersionMap(_project(), _ranges(*ranges))
+
+    assert _as_tuples(vmap.as_version_ranges()) == expected
+
+
+def test_round_trip():
+    """ Check that every possible map is converted to the fewest version
+    ranges and back again.
+    """
+
+    project = _project()
+
+    for enabled in product((False, True), repeat=len(_VERSIONS)):
+        vmap = VersionMap(project)
+
+        for version, value in zip(_VERSIONS, enabled):
+            vmap[version] = value
+
+        assert [vmap[version] for version in _VERSIONS] == list(enabled)
+
+        version_ranges = vmap.as_version_ranges()
+
+        if not any(enabled):
+            assert version_ranges is None
+            continue
+
+        if all(enabled):
+            assert version_ranges == []
+            continue
+
+        # Each range is a run of enabled versions.
+        nr_runs = sum(1 for i, value in enumerate(enabled)
+                if value and (i == 0 or not enabled[i - 1]))
+        assert len(version_ranges) == nr_runs
+
+        assert _enabled(VersionMap(project, version_ranges)) == [
+                version for version, value in zip(_VERSIONS, enabled)
+                        if value]
+
+
+def test_set_and_clear():
+    """ Check setting and clearing individual versions. """
+
+    vmap = VersionMap(_project(), _ranges(('v2', 'v5')))
+    assert _enabled(vmap) == ['v2', 'v3', 'v4']
+
+    vmap['v3'] = False
+    vmap['v5'] = True
+    assert _enabled(vmap) == ['v2', 'v4', 'v5']
+    assert _as_tuples(vmap.as_version_ranges()) == [('v2', 'v3'), ('v4', '')]
+
+
+def test_unknown_version():
+    """ Check that an unknown version is an error. """
+
+    vmap = VersionMap(_project())
+
+    with pytest.raises(ValueError):
+        vmap['v6']
+
+    with pytest.raises(ValueError):
+        vmap['v6'] = True
+
+    with pytest.raises(ValueError):
+        vmap.update_from_version_ranges(_ranges(('v2', 'v6')))
+
+
+def test_duplicate_versions():
+    """ Check that, as before, the first of any duplicate versions is used.
+    """
+
+    vmap = VersionMap(_project(['v1', 'v2', 'v1']), _ranges(('v1', 'v2')))
+
+    assert _as_tuples(vmap.as_version_ranges()) == [('', 'v2')]
+
+
+def test_no_versions():
+    """ Check a project without any versions. """
+
+    assert VersionMap(_project([]), []).as_version_ranges() == []
+
+
+@pytest.mark.parametrize('ranges, expected', [
+        ([(('', 'v2'), ), (('v2', 'v3'), )], ['%If (- v3)\n']),
+        ([(('', 'v2'), ), (('v4', ''), )], ['%If (- v2)\n', '%If (v4 -)\n']),
+        ([(('', 'v3'), ), (('v3', ''), )], []),
+        ([(('v2', 'v3'), ), ()], []),
+    ])
+def test_module_code(ranges, expected):
+    """ Check the version ranges of the %ModuleCode directive of a .sip file
+    that covers all of its functions.
+    """
+
+    project = _project()
+    project.rootmodule = 'Pkg'
+
+    sip_file = SipFile(name='functions.h')
+    module = Module(name='Mod')
+    module.content.append(sip_file)
+    project.modules.append(module)
+
+    for nr, function_ranges in enumerate(ranges):
+        sip_file.content.append(
+                Function(name=f'function{nr}', rtype='void',
+                        versions=_ranges(*function_ranges)))
+
+    directives = []
+
+    for line in get_sip_files(project)['Mod/functions.sip'].split('\n'):
+        if line == '%ModuleCode':
+            break
+
+        if line.startswith('%If ('):
+            directives.append(line + '\n')
+
+    assert directives == expected